@@ -0,0 +1,98 @@
+"""
+Attack tables built once at import time.
+
+Squares use the same index space as Board.state (0 = a8, 63 = h1). Every table comes
+in two flavours: tuples of target squares for the object based Board and integer
+masks for the BitBoard.
+
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+# Index offsets paired with their (row, column) step.
+DIRECTIONS = (
+    (-9, -1, -1),
+    (-8, -1, 0),
+    (-7, -1, 1),
+    (-1, 0, -1),
+    (1, 0, 1),
+    (7, 1, -1),
+    (8, 1, 0),
+    (9, 1, 1),
+)
+ORTHOGONAL_DIRECTIONS = (1, 3, 4, 6)
+DIAGONAL_DIRECTIONS = (0, 2, 5, 7)
+
+KNIGHT_STEPS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+PAWN_STEPS = (((-1, -1), (-1, 1)), ((1, -1), (1, 1)))
+
+
+def _step_targets(position: int, steps: tuple[tuple[int, int], ...]) -> tuple[int, ...]:
+    row, column = divmod(position, 8)
+    return tuple(
+        (row + row_step) * 8 + column + column_step
+        for row_step, column_step in steps
+        if 0 <= row + row_step < 8 and 0 <= column + column_step < 8
+    )
+
+
+def _ray(position: int, row_step: int, column_step: int) -> tuple[int, ...]:
+    row, column = divmod(position, 8)
+    squares = []
+    while 0 <= row + row_step < 8 and 0 <= column + column_step < 8:
+        row += row_step
+        column += column_step
+        squares.append(row * 8 + column)
+    return tuple(squares)
+
+
+def _to_mask(squares: tuple[int, ...]) -> int:
+    mask = 0
+    for square in squares:
+        mask |= 1 << square
+    return mask
+
+
+KNIGHT_TARGETS = [_step_targets(i, KNIGHT_STEPS) for i in range(64)]
+KING_TARGETS = [_step_targets(i, KING_STEPS) for i in range(64)]
+# Indexed by Alliance.value, then by square.
+PAWN_ATTACK_TARGETS = [[_step_targets(i, steps) for i in range(64)] for steps in PAWN_STEPS]
+
+# RAYS[square][direction] lists the squares outwards from square, nearest first.
+RAYS = [
+    tuple(_ray(i, row_step, column_step) for _, row_step, column_step in DIRECTIONS)
+    for i in range(64)
+]
+ROOK_RAYS = [tuple(RAYS[i][d] for d in ORTHOGONAL_DIRECTIONS if RAYS[i][d]) for i in range(64)]
+BISHOP_RAYS = [tuple(RAYS[i][d] for d in DIAGONAL_DIRECTIONS if RAYS[i][d]) for i in range(64)]
+QUEEN_RAYS = [ROOK_RAYS[i] + BISHOP_RAYS[i] for i in range(64)]
+
+KNIGHT_ATTACKS = [_to_mask(targets) for targets in KNIGHT_TARGETS]
+KING_ATTACKS = [_to_mask(targets) for targets in KING_TARGETS]
+PAWN_ATTACKS = [[_to_mask(targets) for targets in side] for side in PAWN_ATTACK_TARGETS]
+# RAY_MASKS[direction][square], the layout the bitboard scans expect.
+RAY_MASKS = [[_to_mask(RAYS[i][d]) for i in range(64)] for d in range(8)]
+
+
+def iterate_bits(bitboard: int) -> Iterator[int]:
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+def sliding_attacks(position: int, occupied: int, directions: tuple[int, ...]) -> int:
+    attacks = 0
+    for direction in directions:
+        ray = RAY_MASKS[direction][position]
+        blockers = ray & occupied
+        if blockers:
+            if DIRECTIONS[direction][0] > 0:
+                first_blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                first_blocker = blockers.bit_length() - 1
+            ray ^= RAY_MASKS[direction][first_blocker]
+        attacks |= ray
+    return attacks
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+from array import array
+
+from chess.engine.alliance import Alliance
+from chess.engine.attacks import (
+    DIAGONAL_DIRECTIONS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    ORTHOGONAL_DIRECTIONS,
+    PAWN_ATTACKS,
+    iterate_bits,
+    sliding_attacks,
+)
+from chess.engine.board import (
+    KING_AND_ROOK_ONLY,
+    MAX_MOVES,
+    PIECE_ABBREVIATIONS,
+    PROMOTION_ORDER,
+    UndoEntry,
+    coordinate_to_position,
+    create_move,
+    restore_game_state,
+    update_game_state,
+)
+from chess.engine.move import (
+    CAPTURE_FLAG,
+    CASTLE_FLAG,
+    EN_PASSANT_FLAG,
+    PAWN_JUMP_FLAG,
+    EnPassantAttackMove,
+    Move,
+    decode_move,
+)
+from chess.engine.pieces import Piece
+from chess.engine.zobrist import PIECE_KEYS, SIDE_KEY, compute_key
+
+PIECE_INDEX = {abbreviation: index for index, abbreviation in enumerate(PIECE_ABBREVIATIONS)}
+
+KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN = range(6)
+
+SLIDER_DIRECTIONS = (
+    (BISHOP, DIAGONAL_DIRECTIONS),
+    (ROOK, ORTHOGONAL_DIRECTIONS),
+    (QUEEN, DIAGONAL_DIRECTIONS + ORTHOGONAL_DIRECTIONS),
+)
+
+# Castling right, king target, squares that have to be empty, squares the king may not
+# be attacked on and rook square, for white; black squares are 56 lower.
+CASTLING_SQUARES = (
+    ("K", 62, (61, 62), (60, 61, 62), 63),
+    ("Q", 58, (57, 58, 59), (60, 59, 58), 56),
+)
+
+
+class BitBoard:
+    """
+    Board representation that keeps one integer bitboard per piece type and colour
+    plus occupancy masks. Bit i corresponds to the same square index as Board.state[i].
+    It plays moves through the same make_move/unmake_move, generate_moves and
+    generate_legal_moves interface as Board, so perft can run on either (see
+    perft.BOARD_TYPES).
+
+    """
+
+    def __init__(self, fen_string: str = KING_AND_ROOK_ONLY) -> None:
+        self.active_player = Alliance.WHITE
+        self.castling_availability = "KQkq"
+        self.en_passant_target_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+
+        self.bitboards: list[int] = [0] * 12
+        self.occupancy: list[int] = [0, 0]
+        self.moves: list[Move] = []
+        self.history: list[UndoEntry] = []
+        self.key_history: list[int] = []
+        self.zobrist_key = 0
+        self.move_buffer = array("I", bytes(MAX_MOVES * 4))
+
+        self.parse_fen(fen_string)
+
+    def __repr__(self) -> str:
+        return "\n".join(
+            "".join(self.get_abbreviation_at(row * 8 + column) or "." for column in range(8))
+            for row in range(8)
+        )
+
+    @property
+    def occupied(self) -> int:
+        return self.occupancy[0] | self.occupancy[1]
+
+    def parse_fen(self, fen_string: str) -> None:
+        fen_parts = fen_string.split()
+
+        self.bitboards = [0] * 12
+        self.occupancy = [0, 0]
+
+        for row_index, row in enumerate(fen_parts[0].split("/")):
+            column = 0
+            for character in row:
+                if character.isdigit():
+                    column += int(character)
+                else:
+                    self._place(row_index * 8 + column, character)
+                    column += 1
+
+        self.active_player = Alliance.WHITE if fen_parts[1] == "w" else Alliance.BLACK
+        self.castling_availability = fen_parts[2]
+        self.en_passant_target_square = fen_parts[3]
+        self.halfmove_clock = int(fen_parts[4])
+        self.fullmove_number = int(fen_parts[5])
+
+        if not (self.bitboards[PIECE_INDEX["K"]] and self.bitboards[PIECE_INDEX["k"]]):
+            raise ValueError("Invalid board state.")
+
+        self.moves = []
+        self.history = []
+        self.key_history = []
+        self.zobrist_key = compute_key(
+            self.get_squares(),
+            self.active_player,
+            self.castling_availability,
+            self.en_passant_target_square,
+        )
+
+    def to_fen(self) -> str:
+        rows = []
+        for row_index in range(8):
+            row = []
+            empty_count = 0
+            for column in range(8):
+                abbreviation = self.get_abbreviation_at(row_index * 8 + column)
+                if abbreviation is None:
+                    empty_count += 1
+                    continue
+                if empty_count:
+                    row.append(str(empty_count))
+                    empty_count = 0
+                row.append(abbreviation)
+            if empty_count:
+                row.append(str(empty_count))
+            rows.append("".join(row))
+
+        return " ".join(
+            (
+                "/".join(rows),
+                self.active_player.to_fen(),
+                self.castling_availability,
+                str(self.en_passant_target_square),
+                str(self.halfmove_clock),
+                str(self.fullmove_number),
+            )
+        )
+
+    def _place(self, position: int, abbreviation: str) -> None:
+        bit = 1 << position
+        self.bitboards[PIECE_INDEX[abbreviation]] |= bit
+        self.occupancy[abbreviation.islower()] |= bit
+
+    def _remove(self, position: int) -> None:
+        bit = 1 << position
+        if not self.occupied & bit:
+            return
+
+        for index in range(12):
+            if self.bitboards[index] & bit:
+                self.bitboards[index] ^= bit
+                self.occupancy[index < 6] ^= bit
+                return
+
+    def get_abbreviation_at(self, position: int) -> str | None:
+        bit = 1 << position
+        if not self.occupied & bit:
+            return None
+
+        for index in range(12):
+            if self.bitboards[index] & bit:
+                return PIECE_ABBREVIATIONS[index]
+        return None
+
+    def get_squares(self) -> str:
+        squares = ["."] * 64
+        for index, abbreviation in enumerate(PIECE_ABBREVIATIONS):
+            for position in iterate_bits(self.bitboards[index]):
+                squares[position] = abbreviation
+        return "".join(squares)
+
+    def get_piece_at(self, position: int) -> Piece | None:
+        abbreviation = self.get_abbreviation_at(position)
+        if abbreviation is None:
+            return None
+        return Piece.from_abbreviation(position, abbreviation)
+
+    def set_piece_at(self, position: int, piece: Piece | None) -> None:
+        previous = self.get_abbreviation_at(position)
+        if previous is not None:
+            self._remove(position)
+            self.zobrist_key ^= PIECE_KEYS[previous][position]
+
+        if piece is not None:
+            self._place(position, piece.abbreviation)
+            self.zobrist_key ^= PIECE_KEYS[piece.abbreviation][position]
+            piece.position = position
+
+    def get_pieces(self, alliance: Alliance) -> set[Piece]:
+        offset = 6 if alliance == Alliance.WHITE else 0
+        return {
+            Piece.from_abbreviation(position, PIECE_ABBREVIATIONS[offset + index])
+            for index in range(6)
+            for position in iterate_bits(self.bitboards[offset + index])
+        }
+
+    @property
+    def white_pieces(self) -> set[Piece]:
+        return self.get_pieces(Alliance.WHITE)
+
+    @property
+    def black_pieces(self) -> set[Piece]:
+        return self.get_pieces(Alliance.BLACK)
+
+    def get_king_position(self, alliance: Alliance) -> int:
+        offset = 6 if alliance == Alliance.WHITE else 0
+        return self.bitboards[offset + KING].bit_length() - 1
+
+    def is_square_attacked(self, position: int, by_alliance: Alliance) -> bool:
+        offset = 6 if by_alliance == Alliance.WHITE else 0
+        bitboards = self.bitboards
+
+        if KNIGHT_ATTACKS[position] & bitboards[offset + KNIGHT]:
+            return True
+        if KING_ATTACKS[position] & bitboards[offset + KING]:
+            return True
+        # A pawn of by_alliance attacks position if a pawn of the other side standing
+        # on position would attack that pawn's square.
+        if PAWN_ATTACKS[by_alliance.opponent().value][position] & bitboards[offset + PAWN]:
+            return True
+
+        occupied = self.occupied
+        queens = bitboards[offset + QUEEN]
+        if sliding_attacks(position, occupied, ORTHOGONAL_DIRECTIONS) & (
+            bitboards[offset + ROOK] | queens
+        ):
+            return True
+        if sliding_attacks(position, occupied, DIAGONAL_DIRECTIONS) & (
+            bitboards[offset + BISHOP] | queens
+        ):
+            return True
+
+        return False
+
+    def is_checked(self, alliance: Alliance) -> bool:
+        return self.is_square_attacked(self.get_king_position(alliance), alliance.opponent())
+
+    def next_turn(self) -> None:
+        if self.active_player == Alliance.BLACK:
+            self.fullmove_number += 1
+        self.active_player = self.active_player.opponent()
+        self.halfmove_clock += 1
+        self.zobrist_key ^= SIDE_KEY
+
+    def make_move(self, move: Move) -> None:
+        """
+        Play a move like Board.make_move does, with the same UndoEntry and game state
+        bookkeeping.
+
+        """
+        if isinstance(move, EnPassantAttackMove):
+            captured_piece = move.attacked_piece
+        else:
+            captured_piece = self.get_piece_at(move.target)
+
+        self.history.append(
+            UndoEntry(
+                move,
+                captured_piece,
+                self.castling_availability,
+                self.en_passant_target_square,
+                self.halfmove_clock,
+                self.fullmove_number,
+            )
+        )
+        self.key_history.append(self.zobrist_key)
+
+        move.execute(self)
+        self.moves.append(move)
+        update_game_state(self, move, captured_piece)
+
+    def unmake_move(self) -> Move:
+        entry = self.history.pop()
+        self.moves.pop()
+        self.key_history.pop()
+
+        entry.move.undo(self)
+        restore_game_state(self, entry)
+        return entry.move
+
+    def undo(self) -> None:
+        if not self.history:
+            return
+
+        self.unmake_move()
+
+    def get_en_passant_position(self) -> int | None:
+        if self.en_passant_target_square in (None, "-"):
+            return None
+        return coordinate_to_position(self.en_passant_target_square)
+
+    def generate_moves(self, buffer: array, start: int = 0) -> int:
+        """
+        Write every legal move for the active player as a packed integer into buffer
+        like Board.generate_moves does. Candidates come from the attack masks, and each
+        one is tried on the bitboards alone to see that it does not leave the king in
+        check.
+
+        """
+        alliance = self.active_player
+        is_white = alliance == Alliance.WHITE
+        offset = 6 if is_white else 0
+        own = self.occupancy[alliance.value]
+        enemy = self.occupancy[alliance.opponent().value]
+        occupied = own | enemy
+        bitboards = self.bitboards
+        candidates = []
+
+        for piece_type, attacks in ((KNIGHT, KNIGHT_ATTACKS), (KING, KING_ATTACKS)):
+            for origin in iterate_bits(bitboards[offset + piece_type]):
+                for target in iterate_bits(attacks[origin] & ~own):
+                    flags = CAPTURE_FLAG if enemy >> target & 1 else 0
+                    candidates.append(origin | target << 6 | flags)
+
+        for piece_type, directions in SLIDER_DIRECTIONS:
+            for origin in iterate_bits(bitboards[offset + piece_type]):
+                for target in iterate_bits(sliding_attacks(origin, occupied, directions) & ~own):
+                    flags = CAPTURE_FLAG if enemy >> target & 1 else 0
+                    candidates.append(origin | target << 6 | flags)
+
+        direction = alliance.get_direction()
+        promotion_row = 0 if is_white else 7
+        jump_row = 6 if is_white else 1
+        en_passant_position = self.get_en_passant_position()
+        for origin in iterate_bits(bitboards[offset + PAWN]):
+            targets = []
+            push = origin + 8 * direction
+            if not occupied >> push & 1:
+                targets.append((push, 0))
+                jump = push + 8 * direction
+                if origin // 8 == jump_row and not occupied >> jump & 1:
+                    targets.append((jump, PAWN_JUMP_FLAG))
+
+            attacks = PAWN_ATTACKS[alliance.value][origin]
+            for target in iterate_bits(attacks & enemy):
+                targets.append((target, CAPTURE_FLAG))
+            if en_passant_position is not None and attacks >> en_passant_position & 1:
+                targets.append((en_passant_position, CAPTURE_FLAG | EN_PASSANT_FLAG))
+
+            for target, flags in targets:
+                if target // 8 == promotion_row:
+                    for promotion in PROMOTION_ORDER:
+                        candidates.append(origin | target << 6 | promotion << 12 | flags)
+                else:
+                    candidates.append(origin | target << 6 | flags)
+
+        index = start
+        for packed_move in candidates:
+            if self._is_legal(packed_move):
+                buffer[index] = packed_move
+                index += 1
+
+        # Castling is only generated when it is legal.
+        shift = 0 if is_white else 56
+        king_position = 60 - shift
+        opponent = alliance.opponent()
+        if bitboards[offset + KING] >> king_position & 1:
+            for right, target, empty, passed, rook in CASTLING_SQUARES:
+                if (right if is_white else right.lower()) not in self.castling_availability:
+                    continue
+                if not bitboards[offset + ROOK] >> rook - shift & 1:
+                    continue
+                if any(occupied >> square - shift & 1 for square in empty):
+                    continue
+                if any(self.is_square_attacked(square - shift, opponent) for square in passed):
+                    continue
+                buffer[index] = king_position | target - shift << 6 | CASTLE_FLAG
+                index += 1
+
+        return index
+
+    def _is_legal(self, packed_move: int) -> bool:
+        # Plays the move on copies of the bitboards and looks at the own king.
+        origin, target, flags, _ = decode_move(packed_move)
+        bitboards, occupancy = self.bitboards, self.occupancy
+        self.bitboards, self.occupancy = bitboards[:], occupancy[:]
+
+        abbreviation = self.get_abbreviation_at(origin)
+        if flags & EN_PASSANT_FLAG:
+            self._remove(target - 8 * self.active_player.get_direction())
+        else:
+            self._remove(target)
+        self._remove(origin)
+        self._place(target, abbreviation)
+
+        is_legal = not self.is_checked(self.active_player)
+        self.bitboards, self.occupancy = bitboards, occupancy
+        return is_legal
+
+    def generate_legal_moves(self) -> list[Move]:
+        count = self.generate_moves(self.move_buffer)
+        return [create_move(self, packed_move) for packed_move in self.move_buffer[:count]]
+
+    def create_move(self, packed_move: int) -> Move:
+        return create_move(self, packed_move)
+
+    def make_packed_move(self, packed_move: int) -> None:
+        self.make_move(create_move(self, packed_move))
+
+    def parse_uci(self, uci: str) -> Move:
+        for move in self.generate_legal_moves():
+            if move.to_uci() == uci:
+                return move
+
+        raise ValueError(f"Illegal move: {uci}")
+
+    def get_last_move(self) -> Move | None:
+        if not self.moves:
+            return None
+        return self.moves[-1]
@@ -1,8 +1,54 @@
 from __future__ import annotations
 
+from array import array
+from typing import Iterable, Iterator, NamedTuple
+
 from chess.engine.alliance import Alliance
-from chess.engine.move import Move
-from chess.engine.pieces import King, Piece
+from chess.engine.attacks import (
+    BISHOP_RAYS,
+    DIAGONAL_DIRECTIONS,
+    KING_ATTACKS,
+    KING_TARGETS,
+    KNIGHT_ATTACKS,
+    KNIGHT_TARGETS,
+    ORTHOGONAL_DIRECTIONS,
+    PAWN_ATTACK_TARGETS,
+    PAWN_ATTACKS,
+    ROOK_RAYS,
+    sliding_attacks,
+)
+from chess.engine.move import (
+    CAPTURE_FLAG,
+    CASTLE_FLAG,
+    EN_PASSANT_FLAG,
+    PAWN_JUMP_FLAG,
+    PROMOTION_LETTERS,
+    AttackMove,
+    CastleMove,
+    EnPassantAttackMove,
+    Move,
+    PawnJumpMove,
+    PromotionMove,
+    decode_move,
+    get_promotion,
+)
+from chess.engine.pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+from chess.engine.pieces.king import HOME_POSITIONS
+from chess.engine.pst import (
+    ENDGAME_SCORES,
+    MIDDLEGAME_SCORES,
+    MIDDLEGAME_VALUES,
+    PHASES,
+    compute_scores,
+)
+from chess.engine.zobrist import (
+    PIECE_KEYS,
+    SIDE_KEY,
+    compute_hash,
+    compute_key,
+    get_castling_key,
+    get_en_passant_key,
+)
 
 DEFAULT_BOARD_STATE = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
 NO_PAWN_BOARD_STATE = "rnbqkbnr/8/8/8/8/8/8/RNBQKBNR w KQkq - 0 1"
@@ -13,9 +59,124 @@ LETTERS = "abcdefgh"
 
 COORDINATES = [f"{letter}{index}" for index in range(8, 0, -1) for letter in LETTERS]
 
+# Upper bound for the number of legal moves in a position, the largest known is 218.
+MAX_MOVES = 256
+# Promotion codes in the order they are generated, queen first.
+PROMOTION_ORDER = (4, 3, 2, 1)
+PROMOTION_PIECES = {1: Knight, 2: Bishop, 3: Rook, 4: Queen}
+# Knight targets as rays of one square, so knights can share the slider loop.
+KNIGHT_JUMPS = [tuple((target,) for target in targets) for targets in KNIGHT_TARGETS]
+
+# Digits of a FEN piece placement expanded to empty squares, and back.
+_EXPAND_EMPTY = str.maketrans({str(count): "." * count for count in range(1, 9)})
+_EMPTY_RUNS = [("." * count, str(count)) for count in range(8, 0, -1)]
+
+# Kinds of moves for generate_moves, they can be combined. Captures include en passant
+# and promotions that capture, castling counts as a quiet move.
+CAPTURES = 1
+PROMOTIONS = 2
+QUIETS = 4
+ALL_MOVES = CAPTURES | PROMOTIONS | QUIETS
+
+# Piece values for the static exchange evaluation, losing the king outweighs everything.
+SEE_VALUES = {**MIDDLEGAME_VALUES, "k": 20_000}
+
+# Castling rights that are lost once a piece leaves or arrives on the given square.
+CASTLING_RIGHTS_LOST = {60: "KQ", 63: "K", 56: "Q", 4: "kq", 7: "k", 0: "q"}
+
+
+# Attributes a Board made by copy() builds from its squares on first access.
+_LAZY_ATTRIBUTES = frozenset(
+    ("state", "moves", "history", "key_history", "white_king", "black_king", "move_buffer")
+)
+
+
+class UndoEntry(NamedTuple):
+    # None for a null move.
+    move: Move | None
+    captured_piece: Piece | None
+    castling_availability: str
+    en_passant_target_square: str
+    halfmove_clock: int
+    fullmove_number: int
+
+
+def create_move(board: Board, packed_move: int) -> Move:
+    # Shared by Board and BitBoard, the pieces come from board.get_piece_at.
+    origin, target, flags, promotion = decode_move(packed_move)
+    piece = board.get_piece_at(origin)
+
+    if promotion:
+        return PromotionMove(
+            piece,
+            target,
+            board.get_piece_at(target),
+            PROMOTION_PIECES[promotion](target, piece.alliance),
+        )
+    if flags & CASTLE_FLAG:
+        return CastleMove(piece, target, is_king_side=target > origin)
+    if flags & EN_PASSANT_FLAG:
+        captured_position = target - 8 * piece.alliance.get_direction()
+        return EnPassantAttackMove(piece, target, board.get_piece_at(captured_position))
+    if flags & CAPTURE_FLAG:
+        return AttackMove(piece, target, board.get_piece_at(target))
+    if flags & PAWN_JUMP_FLAG:
+        return PawnJumpMove(piece, target, (origin + target) // 2)
+    return Move(piece, target)
+
+
+def update_game_state(board: Board, move: Move, captured_piece: Piece | None) -> None:
+    """
+    Update castling rights, en passant square, clocks, side to move and the Zobrist
+    key of board after move was executed on it. Board and BitBoard share this.
+
+    """
+    board.zobrist_key ^= get_castling_key(board.castling_availability)
+    board.zobrist_key ^= get_en_passant_key(board.en_passant_target_square)
+
+    if board.castling_availability != "-":
+        castling_availability = board.castling_availability
+        for position in (move.origin, move.target):
+            for abbreviation in CASTLING_RIGHTS_LOST.get(position, ""):
+                castling_availability = castling_availability.replace(abbreviation, "")
+        board.castling_availability = castling_availability or "-"
+
+    if isinstance(move, PawnJumpMove):
+        board.en_passant_target_square = position_to_coordinate(move.jumped_position)
+    else:
+        board.en_passant_target_square = "-"
+
+    board.zobrist_key ^= get_castling_key(board.castling_availability)
+    board.zobrist_key ^= get_en_passant_key(board.en_passant_target_square)
+    board.zobrist_key ^= SIDE_KEY
+
+    if captured_piece is not None or isinstance(move.moving_piece, Pawn):
+        board.halfmove_clock = 0
+    else:
+        board.halfmove_clock += 1
+
+    if board.active_player == Alliance.BLACK:
+        board.fullmove_number += 1
+    board.active_player = board.active_player.opponent()
+
+
+def restore_game_state(board: Board, entry: UndoEntry) -> None:
+    # The counterpart of update_game_state, after entry.move was undone on board.
+    board.zobrist_key ^= get_castling_key(board.castling_availability)
+    board.zobrist_key ^= get_en_passant_key(board.en_passant_target_square)
+    board.zobrist_key ^= get_castling_key(entry.castling_availability)
+    board.zobrist_key ^= get_en_passant_key(entry.en_passant_target_square)
+    board.zobrist_key ^= SIDE_KEY
+
+    board.active_player = board.active_player.opponent()
+    board.castling_availability = entry.castling_availability
+    board.en_passant_target_square = entry.en_passant_target_square
+    board.halfmove_clock = entry.halfmove_clock
+    board.fullmove_number = entry.fullmove_number
+
 
 class Board:
-    def __init__(self, fen_string: str = KING_AND_ROOK_ONLY) -> None:
+    def __init__(self, fen_string: str = KING_AND_ROOK_ONLY, debug: bool = False) -> None:
         self.active_player = Alliance.WHITE
         self.castling_availability = "KQkq"
         self.en_passant_target_square = None
@@ -24,6 +185,22 @@ class Board:
 
         self.state: list[Piece | None] = []
         self.moves: list[Move] = []
+        self.history: list[UndoEntry] = []
+        # Zobrist keys of the positions before every move in history, for repetitions.
+        self.key_history: list[int] = []
+
+        # With debug set, make_move and unmake_move check the incremental Zobrist key
+        # and scores against a full recomputation.
+        self.debug = debug
+        self.zobrist_key = 0
+        # Scratch space for generate_legal_moves, which copies the moves out of it.
+        self.move_buffer = array("I", bytes(MAX_MOVES * 4))
+
+        # Running material and piece-square sums from white's point of view and the
+        # game phase, see chess.engine.pst.
+        self.middlegame_score = 0
+        self.endgame_score = 0
+        self.phase = 0
 
         self.white_king = None
         self.black_king = None
@@ -52,29 +229,25 @@ class Board:
         fen_parts = fen_string.split()
 
         self.state: list[Piece | None] = [None for _ in range(64)]
+        self.moves = []
+        self.history = []
+        self.key_history = []
 
-        piece_positions = fen_parts[0]
-        for row_index, row in enumerate(piece_positions.split("/")):
-            column = 0
-            for character in row:
-                if character.isdigit():
-                    column += int(character)
-                else:
-                    piece = Piece.from_abbreviation(row_index * 8 + column, character)
-
-                    if piece.is_white():
-                        self.white_pieces.add(piece)
-                    else:
-                        self.black_pieces.add(piece)
-
-                    if isinstance(piece, King) and piece.is_white():
-                        self.white_king = piece
+        squares = parse_placement(fen_parts[0])
+        if squares.count("K") != 1 or squares.count("k") != 1:
+            raise ValueError("Invalid board state.")
 
-                    if isinstance(piece, King) and piece.is_black():
-                        self.black_king = piece
+        for position, abbreviation in enumerate(squares):
+            if abbreviation == ".":
+                continue
 
-                    self.state[piece.position] = piece
-                    column += 1
+            piece = Piece.from_abbreviation(position, abbreviation)
+            if isinstance(piece, King):
+                if piece.is_white():
+                    self.white_king = piece
+                else:
+                    self.black_king = piece
+            self.state[position] = piece
 
         self.active_player = Alliance.WHITE if fen_parts[1] == "w" else Alliance.BLACK
         self.castling_availability = fen_parts[2]
@@ -82,11 +255,10 @@ class Board:
         self.halfmove_clock = int(fen_parts[4])
         self.fullmove_number = int(fen_parts[5])
 
-        for piece in self.all_active_pieces():
-            piece.calculate_legal_moves(self)
-
-        if self.white_king is None or self.black_king is None:
-            raise ValueError("Invalid board state.")
+        self.zobrist_key = compute_key(
+            squares, self.active_player, self.castling_availability, self.en_passant_target_square
+        )
+        self.middlegame_score, self.endgame_score, self.phase = compute_scores(squares)
 
     def to_fen(self) -> str:
         """
@@ -94,41 +266,143 @@ class Board:
         https://de.wikipedia.org/wiki/Forsyth-Edwards-Notation
 
         """
-        fen_string = ""
+        return " ".join(
+            (
+                format_placement(self.get_squares()),
+                self.active_player.to_fen(),
+                self.castling_availability,
+                str(self.en_passant_target_square),
+                str(self.halfmove_clock),
+                str(self.fullmove_number),
+            )
+        )
 
-        for row in (self.get_pieces_in_row(i) for i in range(8)):
-            empty_count = 0
+    def get_squares(self) -> str:
+        """
+        The pieces as one 64 character string in board order, "." for empty squares.
 
-            for piece in row:
-                if piece is None:
-                    empty_count += 1
-                    continue
+        """
+        return "".join(piece.abbreviation if piece is not None else "." for piece in self.state)
+
+    def get_moved_mask(self) -> int:
+        """
+        Bit i is set when the piece on square i has moved, which is what castling
+        looks at besides the castling rights.
+
+        """
+        mask = 0
+        for position, piece in enumerate(self.state):
+            if piece is not None and piece.move_count:
+                mask |= 1 << position
+        return mask
 
-                if empty_count > 0:
-                    fen_string += str(empty_count)
-                    empty_count = 0
+    def copy(self) -> Board:
+        """
+        Return an independent board with the same position. Only the compact state is
+        copied: squares, castling rights, en passant square, clocks and the hash. The
+        Piece objects are built the first time the copy's state is looked at, and the
+        copy starts without undo history.
+
+        """
+        return Board.from_squares(
+            self.get_squares(),
+            self.active_player,
+            self.castling_availability,
+            self.en_passant_target_square,
+            self.halfmove_clock,
+            self.fullmove_number,
+            self.zobrist_key,
+            self.get_moved_mask(),
+            self.debug,
+            (self.middlegame_score, self.endgame_score, self.phase),
+        )
 
-                fen_string += piece.abbreviation
+    @classmethod
+    def from_squares(
+        cls,
+        squares: str,
+        active_player: Alliance,
+        castling_availability: str,
+        en_passant_target_square: str,
+        halfmove_clock: int,
+        fullmove_number: int,
+        zobrist_key: int,
+        moved_mask: int = 0,
+        debug: bool = False,
+        scores: tuple[int, int, int] | None = None,
+    ) -> Board:
+        """
+        Create a board from 64 piece letters in board order ("." for empty squares)
+        and the remaining state fields without parsing FEN. The pieces are built on
+        first access to the board's state. scores are the middlegame score, endgame
+        score and phase, computed from squares when not given.
 
-            if empty_count > 0:
-                fen_string += str(empty_count)
+        """
+        board = cls.__new__(cls)
+        board.active_player = active_player
+        board.castling_availability = castling_availability
+        board.en_passant_target_square = en_passant_target_square
+        board.halfmove_clock = halfmove_clock
+        board.fullmove_number = fullmove_number
+        board.debug = debug
+        board.zobrist_key = zobrist_key
+        board.middlegame_score, board.endgame_score, board.phase = (
+            scores if scores is not None else compute_scores(squares)
+        )
+        board._squares = squares
+        board._moved_mask = moved_mask
+        return board
 
-            fen_string += "/"
+    def __getattr__(self, name: str):
+        # Only reached for attributes that are not set yet, which after copy() are
+        # the ones derived from the squares.
+        if name in _LAZY_ATTRIBUTES and "_squares" in self.__dict__:
+            self._build_state()
+            return getattr(self, name)
+        raise AttributeError(name)
 
-        if fen_string[-1] == "/":
-            fen_string = fen_string[:-1] + " "
+    def _build_state(self) -> None:
+        squares = self.__dict__.pop("_squares")
+        moved_mask = self.__dict__.pop("_moved_mask")
 
-        fen_string += f"{self.active_player.to_fen()} "
-        fen_string += f"{self.castling_availability} "
-        fen_string += f"{self.en_passant_target_square} "
-        fen_string += f"{self.halfmove_clock} {self.fullmove_number}"
+        self.state = [None] * 64
+        self.moves = []
+        self.history = []
+        self.key_history = []
+        self.move_buffer = array("I", bytes(MAX_MOVES * 4))
+        for position, abbreviation in enumerate(squares):
+            if abbreviation == ".":
+                continue
 
-        return fen_string
+            piece = Piece.from_abbreviation(position, abbreviation)
+            if moved_mask >> position & 1:
+                piece.move_count = 1
+            if isinstance(piece, King):
+                if piece.is_white():
+                    self.white_king = piece
+                else:
+                    self.black_king = piece
+            self.state[position] = piece
 
     def set_piece_at(self, position: int, piece: Piece | None) -> None:
+        # Every Move subclass goes through here, which keeps the Zobrist key and the
+        # scores in step with both execute and undo.
+        previous_piece = self.state[position]
+        if previous_piece is not None:
+            abbreviation = previous_piece.abbreviation
+            self.zobrist_key ^= PIECE_KEYS[abbreviation][position]
+            self.middlegame_score -= MIDDLEGAME_SCORES[abbreviation][position]
+            self.endgame_score -= ENDGAME_SCORES[abbreviation][position]
+            self.phase -= PHASES[abbreviation]
+
         self.state[position] = piece
         if piece is not None:
             piece.position = position
+            abbreviation = piece.abbreviation
+            self.zobrist_key ^= PIECE_KEYS[abbreviation][position]
+            self.middlegame_score += MIDDLEGAME_SCORES[abbreviation][position]
+            self.endgame_score += ENDGAME_SCORES[abbreviation][position]
+            self.phase += PHASES[abbreviation]
 
     def get_piece_at(self, position: int) -> Piece | None:
         return self.state[position]
@@ -162,33 +436,665 @@ class Board:
         return self.white_pieces.union(self.black_pieces)
 
     def active_player_can_move(self) -> bool:
-        for piece in self.get_active_players_pieces():
-            if piece.legal_moves:
-                return True
-
-        return False
+        return bool(self.generate_legal_moves())
 
     def next_turn(self) -> None:
-        self.active_player = (
-            Alliance.WHITE if self.active_player == Alliance.BLACK else Alliance.BLACK
+        last_move = self.get_last_move()
+        if last_move is not None and (
+            isinstance(last_move.moving_piece, Pawn)
+            or getattr(last_move, "attacked_piece", None) is not None
+        ):
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        if self.active_player == Alliance.BLACK:
+            self.fullmove_number += 1
+        self.active_player = self.active_player.opponent()
+        self.zobrist_key ^= SIDE_KEY
+
+    def make_move(self, move: Move) -> None:
+        """
+        Play a move and push an UndoEntry so that unmake_move can restore the position
+        without regenerating any moves. Move lists are only built when a piece is asked
+        for them through calculate_legal_moves.
+
+        """
+        if isinstance(move, EnPassantAttackMove):
+            captured_piece = move.attacked_piece
+        else:
+            captured_piece = self.state[move.target]
+
+        self.history.append(
+            UndoEntry(
+                move,
+                captured_piece,
+                self.castling_availability,
+                self.en_passant_target_square,
+                self.halfmove_clock,
+                self.fullmove_number,
+            )
         )
-        self.halfmove_clock += 1
-        self.fullmove_number += 0.5
+        self.key_history.append(self.zobrist_key)
 
-        for piece in self.all_active_pieces():
-            piece.calculate_legal_moves(self)
+        move.execute(self)
+        self.moves.append(move)
+        update_game_state(self, move, captured_piece)
 
-    def is_checked(self, alliance: Alliance) -> bool:
-        king = self.white_king if alliance == Alliance.WHITE else self.black_king
-        pieces = self.get_available_pieces(alliance.opponent())
+        if self.debug:
+            self.verify_hash()
+            self.verify_scores()
+
+    def unmake_move(self) -> Move:
+        entry = self.history.pop()
+        self.moves.pop()
+        self.key_history.pop()
+
+        entry.move.undo(self)
+        restore_game_state(self, entry)
+
+        if self.debug:
+            self.verify_hash()
+            self.verify_scores()
+
+        return entry.move
+
+    def make_null_move(self) -> None:
+        """
+        Pass the turn without moving, for null move pruning. The halfmove clock starts
+        over so that no repetition is counted across the null move. Undo it with
+        unmake_null_move.
+
+        """
+        self.history.append(
+            UndoEntry(
+                None,
+                None,
+                self.castling_availability,
+                self.en_passant_target_square,
+                self.halfmove_clock,
+                self.fullmove_number,
+            )
+        )
+        self.key_history.append(self.zobrist_key)
+
+        self.zobrist_key ^= get_en_passant_key(self.en_passant_target_square)
+        self.en_passant_target_square = "-"
+        self.zobrist_key ^= get_en_passant_key(self.en_passant_target_square)
+        self.zobrist_key ^= SIDE_KEY
+
+        self.halfmove_clock = 0
+        if self.active_player == Alliance.BLACK:
+            self.fullmove_number += 1
+        self.active_player = self.active_player.opponent()
+
+        if self.debug:
+            self.verify_hash()
+
+    def unmake_null_move(self) -> None:
+        entry = self.history.pop()
+        self.key_history.pop()
 
-        for piece in pieces:
-            for move in piece.legal_moves:
-                if move.target == king.position:
-                    return True
+        self.zobrist_key ^= get_en_passant_key(self.en_passant_target_square)
+        self.zobrist_key ^= get_en_passant_key(entry.en_passant_target_square)
+        self.zobrist_key ^= SIDE_KEY
 
+        self.active_player = self.active_player.opponent()
+        self.en_passant_target_square = entry.en_passant_target_square
+        self.halfmove_clock = entry.halfmove_clock
+        self.fullmove_number = entry.fullmove_number
+
+        if self.debug:
+            self.verify_hash()
+
+    def has_non_pawn_material(self, alliance: Alliance) -> bool:
+        # Without knights, bishops, rooks or queens zugzwang is common.
+        for piece in self.state:
+            if (
+                piece is not None
+                and piece.alliance == alliance
+                and piece.abbreviation.lower() in "nbrq"
+            ):
+                return True
         return False
 
+    def count_repetitions(self) -> int:
+        """
+        Count how often the current position occurred before. Only positions since
+        the last capture or pawn move can repeat, and only every second one has the
+        same side to move, so the scan covers halfmove_clock / 2 keys at most.
+
+        """
+        keys = self.key_history
+        key = self.zobrist_key
+        start = len(keys) - 2
+        stop = max(len(keys) - self.halfmove_clock, 0) - 1
+
+        count = 0
+        for index in range(start, stop, -2):
+            if keys[index] == key:
+                count += 1
+        return count
+
+    def is_threefold_repetition(self) -> bool:
+        return self.count_repetitions() >= 2
+
+    def is_fifty_move_draw(self) -> bool:
+        # A checkmate delivered with the hundredth half move still counts.
+        if self.halfmove_clock < 100:
+            return False
+        return not (self.is_checked(self.active_player) and not self.active_player_can_move())
+
+    def is_draw(self) -> bool:
+        return self.is_fifty_move_draw() or self.is_threefold_repetition()
+
+    def verify_hash(self) -> None:
+        expected = compute_hash(self)
+        if self.zobrist_key != expected:
+            raise RuntimeError(
+                f"Zobrist key out of sync: {self.zobrist_key:016x} != {expected:016x} "
+                f"after {self.get_last_move()!r} in {self.to_fen()}"
+            )
+
+    def verify_scores(self) -> None:
+        expected = compute_scores(self.get_squares())
+        actual = (self.middlegame_score, self.endgame_score, self.phase)
+        if actual != expected:
+            raise RuntimeError(
+                f"Scores out of sync: {actual} != {expected} "
+                f"after {self.get_last_move()!r} in {self.to_fen()}"
+            )
+
+    def get_en_passant_position(self) -> int | None:
+        if self.en_passant_target_square in (None, "-"):
+            return None
+        return coordinate_to_position(self.en_passant_target_square)
+
+    def is_checked(self, alliance: Alliance) -> bool:
+        return self.is_square_attacked(self.get_king(alliance).position, alliance.opponent())
+
+    def is_square_attacked(self, position: int, by_alliance: Alliance) -> bool:
+        """
+        Tell whether a piece of by_alliance attacks position. Unlike get_attackers
+        this stops at the first attacker and builds no list.
+
+        """
+        return next(self._iter_attackers(position, by_alliance), None) is not None
+
+    def get_attackers(self, position: int, by_alliance: Alliance) -> list[Piece]:
+        return list(self._iter_attackers(position, by_alliance))
+
+    def _iter_attackers(self, position: int, by_alliance: Alliance) -> Iterator[Piece]:
+        # Looks outwards from position along knight, pawn, king and ray patterns, so
+        # the cheap patterns are tried before the rays.
+        state = self.state
+        letters = "KQRBNP" if by_alliance == Alliance.WHITE else "kqrbnp"
+        king, queen, rook, bishop, knight, pawn = letters
+
+        for target in KNIGHT_TARGETS[position]:
+            piece = state[target]
+            if piece is not None and piece.abbreviation == knight:
+                yield piece
+
+        for target in PAWN_ATTACK_TARGETS[by_alliance.opponent().value][position]:
+            piece = state[target]
+            if piece is not None and piece.abbreviation == pawn:
+                yield piece
+
+        for target in KING_TARGETS[position]:
+            piece = state[target]
+            if piece is not None and piece.abbreviation == king:
+                yield piece
+
+        for rays, sliders in ((ROOK_RAYS, (rook, queen)), (BISHOP_RAYS, (bishop, queen))):
+            for ray in rays[position]:
+                for target in ray:
+                    piece = state[target]
+                    if piece is None:
+                        continue
+                    if piece.abbreviation in sliders:
+                        yield piece
+                    break
+
+    def see(self, move: Move | int) -> int:
+        """
+        Static exchange evaluation: the material the side to move wins with move once
+        both sides have made every capture on its target square that pays off, always
+        with their least valuable attacker. Sliders lined up behind an attacker join
+        in once it has captured. Negative for a move that loses material.
+
+        """
+        origin, target, flags, promotion = decode_move(
+            move if isinstance(move, int) else move.pack()
+        )
+        state = self.state
+
+        # One mask per piece letter, bit i for square i like the BitBoard uses.
+        masks = dict.fromkeys(PIECE_ABBREVIATIONS, 0)
+        occupied = 0
+        for position, piece in enumerate(state):
+            if piece is not None:
+                masks[piece.abbreviation] |= 1 << position
+                occupied |= 1 << position
+
+        moving_piece = state[origin].abbreviation
+        captured_piece = state[target]
+        if flags & EN_PASSANT_FLAG:
+            gain = SEE_VALUES["p"]
+            occupied ^= 1 << (origin - origin % 8 + target % 8)
+        else:
+            gain = SEE_VALUES[captured_piece.abbreviation.lower()] if captured_piece else 0
+
+        piece_on_target = SEE_VALUES[moving_piece.lower()]
+        if promotion:
+            piece_on_target = SEE_VALUES[PROMOTION_LETTERS[promotion]]
+            gain += piece_on_target - SEE_VALUES["p"]
+
+        # gains[i] is what the side making capture i wins if the exchange stops there.
+        gains = [gain]
+        occupied ^= 1 << origin
+        is_white = moving_piece.isupper()
+        while True:
+            is_white = not is_white
+            diagonal = sliding_attacks(target, occupied, DIAGONAL_DIRECTIONS)
+            orthogonal = sliding_attacks(target, occupied, ORTHOGONAL_DIRECTIONS)
+            reaches = (
+                PAWN_ATTACKS[Alliance.BLACK.value if is_white else Alliance.WHITE.value][target],
+                KNIGHT_ATTACKS[target],
+                diagonal,
+                orthogonal,
+                diagonal | orthogonal,
+                KING_ATTACKS[target],
+            )
+            for letter, reach in zip("PNBRQK" if is_white else "pnbrqk", reaches):
+                attackers = reach & masks[letter] & occupied
+                if attackers:
+                    break
+            else:
+                break
+
+            gains.append(piece_on_target - gains[-1])
+
+            occupied ^= attackers & -attackers
+            piece_on_target = SEE_VALUES[letter.lower()]
+
+        # Every side only makes its capture when that beats stopping before it.
+        for index in range(len(gains) - 1, 0, -1):
+            gains[index - 1] = -max(-gains[index - 1], gains[index])
+        return gains[0]
+
+    def get_checks_and_pins(
+        self, alliance: Alliance
+    ) -> tuple[list[Piece], set[int], dict[int, set[int]]]:
+        """
+        Return the pieces giving check to alliance's king, the squares a non-king move
+        has to land on to resolve a single check, and for every pinned piece the squares
+        it may still move to.
+
+        """
+        state = self.state
+        king_position = self.get_king(alliance).position
+        opponent = alliance.opponent()
+        letters = "KQRBNP" if opponent == Alliance.WHITE else "kqrbnp"
+        _, queen, rook, bishop, knight, pawn = letters
+
+        checkers = []
+        evasions = set()
+        pins = {}
+
+        for target in KNIGHT_TARGETS[king_position]:
+            piece = state[target]
+            if piece is not None and piece.abbreviation == knight:
+                checkers.append(piece)
+                evasions.add(target)
+
+        for target in PAWN_ATTACK_TARGETS[alliance.value][king_position]:
+            piece = state[target]
+            if piece is not None and piece.abbreviation == pawn:
+                checkers.append(piece)
+                evasions.add(target)
+
+        for rays, sliders in ((ROOK_RAYS, (rook, queen)), (BISHOP_RAYS, (bishop, queen))):
+            for ray in rays[king_position]:
+                pinned_piece = None
+                for index, target in enumerate(ray):
+                    piece = state[target]
+                    if piece is None:
+                        continue
+
+                    if piece.alliance == alliance:
+                        if pinned_piece is not None:
+                            break
+                        pinned_piece = piece
+                        continue
+
+                    if piece.abbreviation in sliders:
+                        if pinned_piece is None:
+                            checkers.append(piece)
+                            evasions.update(ray[: index + 1])
+                        else:
+                            pins[pinned_piece.position] = set(ray[: index + 1])
+                    break
+
+        return checkers, evasions, pins
+
+    def generate_legal_moves(self) -> list[Move]:
+        """
+        Generate every legal move for the active player as Move objects. The moves are
+        produced by generate_moves and wrapped afterwards.
+
+        """
+        buffer = self.move_buffer
+        count = self.generate_moves(buffer)
+        return [self.create_move(buffer[index]) for index in range(count)]
+
+    def generate_moves(self, buffer: array, start: int = 0, kinds: int = ALL_MOVES) -> int:
+        """
+        Write every legal move for the active player as a packed integer (see
+        move.encode_move) into buffer, beginning at start, and return the index after
+        the last move. The buffer needs room for MAX_MOVES moves from start, so one
+        preallocated array('I') can serve a whole search with one slice per ply.
+        kinds limits the moves to CAPTURES, PROMOTIONS or QUIETS, or a combination.
+
+        Checkers and pinned pieces are computed once, so no move has to be played on
+        the board to be validated, and no Move object is created.
+
+        """
+        return self._generate_moves(buffer, start, kinds)
+
+    def _generate_moves(
+        self,
+        buffer: array,
+        start: int = 0,
+        kinds: int = ALL_MOVES,
+        only_from: int | None = None,
+        checks_and_pins: tuple | None = None,
+    ) -> int:
+        # only_from limits the moves to the piece on that square; checks_and_pins can
+        # be passed in by callers that generate several kinds one after the other.
+        state = self.state
+        alliance = self.active_player
+        opponent = alliance.opponent()
+        king = self.get_king(alliance)
+        king_position = king.position
+        if checks_and_pins is None:
+            checks_and_pins = self.get_checks_and_pins(alliance)
+        checkers, evasions, pins = checks_and_pins
+        is_square_attacked = self.is_square_attacked
+        captures = kinds & CAPTURES
+        promotions = kinds & PROMOTIONS
+        quiets = kinds & QUIETS
+        index = start
+
+        if only_from is None or only_from == king_position:
+            # The king may not hide behind itself from a slider, so it is lifted off
+            # the board.
+            state[king_position] = None
+            for target in KING_TARGETS[king_position]:
+                piece = state[target]
+                if piece is None:
+                    if not quiets:
+                        continue
+                    flags = 0
+                elif piece.alliance != alliance and captures:
+                    flags = CAPTURE_FLAG
+                else:
+                    continue
+                if not is_square_attacked(target, opponent):
+                    buffer[index] = king_position | target << 6 | flags
+                    index += 1
+            state[king_position] = king
+
+            if (
+                quiets
+                and not checkers
+                and king_position == HOME_POSITIONS[alliance]
+                and not king.has_moved
+            ):
+                for side, offsets, rook_offset in (("K", (1, 2), 3), ("Q", (-1, -2, -3), -4)):
+                    if not self.can_castle(alliance, side, king_position + rook_offset):
+                        continue
+                    if any(state[king_position + offset] is not None for offset in offsets):
+                        continue
+                    # The rook passes b1/b8 on the queen side, the king does not.
+                    if any(
+                        is_square_attacked(king_position + offset, opponent)
+                        for offset in offsets[:2]
+                    ):
+                        continue
+                    buffer[index] = king_position | king_position + offsets[1] << 6 | CASTLE_FLAG
+                    index += 1
+
+        if len(checkers) > 1 or only_from == king_position:
+            return index
+
+        direction = alliance.get_direction()
+        en_passant_position = self.get_en_passant_position()
+        promotion_row = 1 if alliance == Alliance.WHITE else 6
+        jump_row = 6 if alliance == Alliance.WHITE else 1
+
+        squares = enumerate(state) if only_from is None else ((only_from, state[only_from]),)
+        for origin, piece in squares:
+            if piece is None or piece.alliance != alliance or piece is king:
+                continue
+
+            pin = pins.get(origin)
+            kind = piece.abbreviation.lower()
+
+            if kind == "p":
+                is_promotion = origin // 8 == promotion_row
+                targets = []
+                push = origin + 8 * direction
+                if (promotions if is_promotion else quiets) and state[push] is None:
+                    targets.append((push, 0))
+                    jump = push + 8 * direction
+                    if origin // 8 == jump_row and state[jump] is None:
+                        targets.append((jump, PAWN_JUMP_FLAG))
+
+                for target in PAWN_ATTACK_TARGETS[alliance.value][origin] if captures else ():
+                    if target == en_passant_position:
+                        if (pin is None or target in pin) and self.is_legal_en_passant_at(
+                            origin, target
+                        ):
+                            buffer[index] = (
+                                origin | target << 6 | CAPTURE_FLAG | EN_PASSANT_FLAG
+                            )
+                            index += 1
+                        continue
+                    other = state[target]
+                    if other is not None and other.alliance != alliance:
+                        targets.append((target, CAPTURE_FLAG))
+
+                for target, flags in targets:
+                    if pin is not None and target not in pin:
+                        continue
+                    if checkers and target not in evasions:
+                        continue
+                    if is_promotion:
+                        for promotion in PROMOTION_ORDER:
+                            buffer[index] = origin | target << 6 | promotion << 12 | flags
+                            index += 1
+                    else:
+                        buffer[index] = origin | target << 6 | flags
+                        index += 1
+                continue
+
+            if kind == "n":
+                rays = KNIGHT_JUMPS[origin]
+            elif kind == "b":
+                rays = BISHOP_RAYS[origin]
+            elif kind == "r":
+                rays = ROOK_RAYS[origin]
+            else:
+                rays = ROOK_RAYS[origin] + BISHOP_RAYS[origin]
+
+            for ray in rays:
+                for target in ray:
+                    other = state[target]
+                    if other is None:
+                        if quiets and (pin is None or target in pin) and (
+                            not checkers or target in evasions
+                        ):
+                            buffer[index] = origin | target << 6
+                            index += 1
+                        continue
+                    if (
+                        captures
+                        and other.alliance != alliance
+                        and (pin is None or target in pin)
+                        and (not checkers or target in evasions)
+                    ):
+                        buffer[index] = origin | target << 6 | CAPTURE_FLAG
+                        index += 1
+                    break
+
+        return index
+
+    def generate_staged_moves(
+        self,
+        table_move: int = 0,
+        killers: Iterable[int] = (),
+        history: list[int] | None = None,
+        buffer: array | None = None,
+        start: int = 0,
+    ) -> Iterator[Move]:
+        """
+        Yield the legal moves of the active player stage by stage: the table move,
+        captures that do not lose material by static exchange evaluation (most valuable
+        victim first), promotions that capture nothing, the killer moves (only quiet
+        ones, the others already came in their own stage), the other quiet moves by
+        their history score (indexed by origin * 64 + target), and last the losing
+        captures. A stage is only generated once the consumer asks for its
+        first move, so a cutoff early on never generates the quiet moves.
+
+        The board has to be back in the same position whenever the next move is
+        requested. As with generate_moves, a search can hand in its own buffer with
+        room for MAX_MOVES moves from start, one slice per ply; without one a buffer
+        is allocated.
+
+        """
+        if buffer is None:
+            buffer = array("I", bytes(MAX_MOVES * 4))
+        checks_and_pins = self.get_checks_and_pins(self.active_player)
+        tried = set()
+
+        if table_move and self._is_legal(table_move, buffer, start, checks_and_pins):
+            tried.add(table_move)
+            yield self.create_move(table_move)
+
+        end = self._generate_moves(buffer, start, CAPTURES, None, checks_and_pins)
+        losing_captures = []
+        for packed_move in sorted(buffer[start:end], key=self._get_capture_order, reverse=True):
+            if packed_move in tried:
+                continue
+            if self._is_losing_capture(packed_move):
+                losing_captures.append(packed_move)
+                continue
+            yield self.create_move(packed_move)
+
+        end = self._generate_moves(buffer, start, PROMOTIONS, None, checks_and_pins)
+        for packed_move in buffer[start:end]:
+            if packed_move not in tried:
+                yield self.create_move(packed_move)
+
+        for killer in killers:
+            if not killer or killer in tried or killer & CAPTURE_FLAG or get_promotion(killer):
+                continue
+            if self._is_legal(killer, buffer, start, checks_and_pins):
+                tried.add(killer)
+                yield self.create_move(killer)
+
+        end = self._generate_moves(buffer, start, QUIETS, None, checks_and_pins)
+        quiet_moves = [packed_move for packed_move in buffer[start:end] if packed_move not in tried]
+        if history is not None:
+            quiet_moves.sort(
+                key=lambda packed_move: history[(packed_move & 63) * 64 + (packed_move >> 6 & 63)],
+                reverse=True,
+            )
+        for packed_move in quiet_moves:
+            yield self.create_move(packed_move)
+
+        for packed_move in losing_captures:
+            yield self.create_move(packed_move)
+
+    def _is_legal(
+        self, packed_move: int, buffer: array, start: int, checks_and_pins: tuple
+    ) -> bool:
+        # Only the moves of the piece on the origin square are generated.
+        origin, _, flags, promotion = decode_move(packed_move)
+        if flags & CAPTURE_FLAG:
+            kinds = CAPTURES
+        else:
+            kinds = PROMOTIONS if promotion else QUIETS
+        end = self._generate_moves(buffer, start, kinds, origin, checks_and_pins)
+        return packed_move in buffer[start:end]
+
+    def _get_capture_order(self, packed_move: int) -> int:
+        # Most valuable victim first, least valuable attacker among equal victims.
+        target = packed_move >> 6 & 63
+        victim = self.state[target]
+        victim_value = SEE_VALUES[victim.abbreviation.lower()] if victim else SEE_VALUES["p"]
+        attacker = self.state[packed_move & 63].abbreviation.lower()
+        return victim_value * 64 - SEE_VALUES[attacker] // 100
+
+    def _is_losing_capture(self, packed_move: int) -> bool:
+        # Taking a piece worth at least the capturing one never loses material.
+        victim = self.state[packed_move >> 6 & 63]
+        victim_value = SEE_VALUES[victim.abbreviation.lower()] if victim else SEE_VALUES["p"]
+        attacker = self.state[packed_move & 63].abbreviation.lower()
+        if victim_value >= SEE_VALUES[attacker]:
+            return False
+        return self.see(packed_move) < 0
+
+    def can_castle(self, alliance: Alliance, side: str, rook_position: int) -> bool:
+        right = side if alliance == Alliance.WHITE else side.lower()
+        if right not in self.castling_availability:
+            return False
+
+        rook = self.state[rook_position]
+        return isinstance(rook, Rook) and rook.alliance == alliance and not rook.has_moved
+
+    def is_legal_en_passant_at(self, origin: int, target: int) -> bool:
+        # Removing two pawns from the same rank can expose the king along that rank, so
+        # the capture is tried out on the state list, leaving the hash untouched.
+        state = self.state
+        pawn = state[origin]
+        captured_position = target - 8 * pawn.alliance.get_direction()
+        captured_pawn = state[captured_position]
+
+        state[target], state[origin], state[captured_position] = pawn, None, None
+        is_legal = not self.is_checked(pawn.alliance)
+        state[origin], state[target], state[captured_position] = pawn, None, captured_pawn
+
+        return is_legal
+
+    def create_move(self, packed_move: int) -> Move:
+        """
+        Build the Move object for a packed move of the current position.
+
+        """
+        return create_move(self, packed_move)
+
+    def make_packed_move(self, packed_move: int) -> None:
+        self.make_move(self.create_move(packed_move))
+
+    def parse_uci(self, uci: str) -> Move:
+        for move in self.generate_legal_moves():
+            if move.to_uci() == uci:
+                return move
+
+        raise ValueError(f"Illegal move: {uci}")
+
+    def unpack_move(self, packed_move: int) -> Move | None:
+        for move in self.generate_legal_moves():
+            if move.pack() == packed_move:
+                return move
+
+        return None
+
+    def get_king(self, alliance: Alliance) -> King:
+        return self.white_king if alliance == Alliance.WHITE else self.black_king
+
     def get_active_players_pieces(self) -> set[Piece]:
         if self.active_player == Alliance.WHITE:
             return self.white_pieces
@@ -200,14 +1106,10 @@ class Board:
         return self.black_king
 
     def undo(self) -> None:
-        if not self.moves:
+        if not self.history:
             return
 
-        self.moves.pop(-1).undo(self)
-        self.fullmove_number -= 0.5
-        self.halfmove_clock -= 1
-
-        self.next_turn()
+        self.unmake_move()
 
     def get_last_move(self) -> Move | None:
         if not self.moves:
@@ -215,6 +1117,29 @@ class Board:
         return self.moves[-1]
 
 
+def parse_placement(placement: str) -> str:
+    """
+    Expand the piece placement field of a FEN string into 64 piece letters in board
+    order, "." for empty squares. The letters themselves are not checked.
+
+    """
+    rows = placement.split("/")
+    if len(rows) != 8:
+        raise ValueError(f"Invalid piece placement: {placement}")
+
+    rows = [row.translate(_EXPAND_EMPTY) for row in rows]
+    if any(len(row) != 8 for row in rows):
+        raise ValueError(f"Invalid piece placement: {placement}")
+    return "".join(rows)
+
+
+def format_placement(squares: str) -> str:
+    placement = "/".join([squares[index : index + 8] for index in range(0, 64, 8)])
+    for run, digit in _EMPTY_RUNS:
+        placement = placement.replace(run, digit)
+    return placement
+
+
 def is_valid_position(position: int) -> bool:
     return 0 <= position < 64
 
@@ -0,0 +1,271 @@
+"""
+Static evaluation: material, piece-square tables and mobility.
+
+Material and piece-square values come in a middlegame and an endgame version that
+are blended by the game phase, which drops from MAX_PHASE to 0 as knights, bishops,
+rooks and queens leave the board. Mobility counts the squares knights, bishops,
+rooks and queens attack that do not hold a piece of their own side.
+
+evaluate_batch scores many positions at once with NumPy. Positions are given as an
+(N, 64) int8 array of piece codes, 1 to 6 for white pawn to king and -1 to -6 for
+black, or as (N, 12, 64) one-hot planes in PLANE_ORDER; to_array builds either
+from boards, Positions or FEN strings. NumPy is only needed for these two.
+
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable
+
+from chess.engine.alliance import Alliance
+from chess.engine.attacks import (
+    BISHOP_RAYS,
+    DIAGONAL_DIRECTIONS,
+    DIRECTIONS,
+    KNIGHT_ATTACKS,
+    KNIGHT_TARGETS,
+    QUEEN_RAYS,
+    RAY_MASKS,
+    ROOK_RAYS,
+)
+from chess.engine.board import Board, parse_placement
+from chess.engine.position import Position
+from chess.engine.pst import (
+    ENDGAME_SCORES,
+    MAX_PHASE,
+    MIDDLEGAME_SCORES,
+    PHASE_WEIGHTS,
+    PIECE_TYPES,
+    compute_scores,
+    taper,
+)
+
+if TYPE_CHECKING:
+    import numpy
+
+PLANE_ORDER = "PNBRQKpnbrqk"
+
+MOBILITY_WEIGHTS = {"n": 4, "b": 5, "r": 2, "q": 1}
+
+MOBILITY_RAYS = {
+    "n": [tuple((target,) for target in targets) for targets in KNIGHT_TARGETS],
+    "b": BISHOP_RAYS,
+    "r": ROOK_RAYS,
+    "q": QUEEN_RAYS,
+}
+
+# Positions per NumPy pass in evaluate_batch, which bounds the temporary arrays.
+BATCH_SIZE = 4096
+
+
+def evaluate(board: Board, mobility: bool = True) -> int:
+    """
+    Score of the position from the point of view of the side to move. Material and
+    piece-square values come from the sums the board keeps up to date, so without
+    mobility, which scans the whole board, the score costs constant time.
+
+    """
+    score = taper(board.middlegame_score, board.endgame_score, board.phase)
+    if mobility:
+        score += get_mobility(board.get_squares())
+    return score if board.active_player == Alliance.WHITE else -score
+
+
+def evaluate_squares(squares: str) -> int:
+    """
+    Score from white's point of view of 64 piece letters in board order, "." for
+    empty squares.
+
+    """
+    return taper(*compute_scores(squares)) + get_mobility(squares)
+
+
+def get_mobility(squares: str) -> int:
+    score = 0
+    for square, abbreviation in enumerate(squares):
+        piece_type = abbreviation.lower()
+        if piece_type not in MOBILITY_WEIGHTS:
+            continue
+
+        is_white = abbreviation.isupper()
+        count = 0
+        for ray in MOBILITY_RAYS[piece_type][square]:
+            for target in ray:
+                occupant = squares[target]
+                if occupant == ".":
+                    count += 1
+                    continue
+                if occupant.isupper() != is_white:
+                    count += 1
+                break
+
+        weight = MOBILITY_WEIGHTS[piece_type] * count
+        score += weight if is_white else -weight
+
+    return score
+
+
+def _get_squares(position: Board | Position | str) -> str:
+    if isinstance(position, Board):
+        return position.get_squares()
+    if isinstance(position, Position):
+        return position.squares.decode("ascii")
+    return parse_placement(position.split()[0])
+
+
+# Piece letters to int8 codes, black codes wrap around to -1 to -6.
+_TO_CODES = bytes.maketrans(
+    b".PNBRQKpnbrqk", bytes((0, 1, 2, 3, 4, 5, 6, 255, 254, 253, 252, 251, 250))
+)
+
+
+def to_array(positions: Iterable[Board | Position | str], planes: bool = False) -> numpy.ndarray:
+    """
+    Piece codes of boards, Positions or FEN strings as an (N, 64) int8 array, or as
+    (N, 12, 64) one-hot planes with planes set.
+
+    """
+    import numpy
+
+    data = b"".join(
+        _get_squares(position).encode("ascii").translate(_TO_CODES) for position in positions
+    )
+    codes = numpy.frombuffer(data, dtype=numpy.int8).reshape(-1, 64).copy()
+    return to_planes(codes) if planes else codes
+
+
+def to_planes(codes: numpy.ndarray) -> numpy.ndarray:
+    import numpy
+
+    values = numpy.array([*range(1, 7), *range(-1, -7, -1)], dtype=numpy.int8)
+    return (codes[:, None, :] == values[None, :, None]).astype(numpy.int8)
+
+
+def from_planes(planes: numpy.ndarray) -> numpy.ndarray:
+    import numpy
+
+    values = numpy.array([*range(1, 7), *range(-1, -7, -1)], dtype=numpy.int16)
+    return numpy.einsum("nps,p->ns", planes.astype(numpy.int16), values).astype(numpy.int8)
+
+
+@lru_cache(maxsize=None)
+def _get_tables() -> dict[str, numpy.ndarray]:
+    import numpy
+
+    def by_code(scores: dict) -> numpy.ndarray:
+        # Row code + 6 holds the values of the piece with that code, row 6 is empty.
+        table = numpy.zeros((13, 64), dtype=numpy.int32)
+        for index, piece_type in enumerate(PIECE_TYPES, start=1):
+            table[6 + index] = scores[piece_type.upper()]
+            table[6 - index] = scores[piece_type]
+        return table
+
+    phases = numpy.zeros(13, dtype=numpy.int32)
+    weights = numpy.zeros(13, dtype=numpy.int32)
+    for index, piece_type in enumerate(PIECE_TYPES, start=1):
+        phases[6 + index] = phases[6 - index] = PHASE_WEIGHTS[piece_type]
+        weights[6 + index] = MOBILITY_WEIGHTS.get(piece_type, 0)
+        weights[6 - index] = -MOBILITY_WEIGHTS.get(piece_type, 0)
+
+    return {
+        "middlegame": by_code(MIDDLEGAME_SCORES),
+        "endgame": by_code(ENDGAME_SCORES),
+        "phases": phases,
+        "weights": weights,
+        "rays": numpy.array(RAY_MASKS, dtype=numpy.uint64),
+        "knights": numpy.array(KNIGHT_ATTACKS, dtype=numpy.uint64),
+        "bit_counts": numpy.array([bin(byte).count("1") for byte in range(256)], numpy.uint8),
+    }
+
+
+def evaluate_batch(positions: numpy.ndarray) -> numpy.ndarray:
+    """
+    Scores from white's point of view, as an int32 array of length N, of an (N, 64)
+    piece code array or (N, 12, 64) planes. Matches evaluate_squares exactly.
+
+    """
+    import numpy
+
+    positions = numpy.asarray(positions)
+    codes = from_planes(positions) if positions.ndim == 3 else positions.astype(numpy.int8)
+
+    scores = numpy.empty(len(codes), dtype=numpy.int32)
+    for start in range(0, len(codes), BATCH_SIZE):
+        scores[start : start + BATCH_SIZE] = _evaluate_codes(codes[start : start + BATCH_SIZE])
+    return scores
+
+
+def _evaluate_codes(codes: numpy.ndarray) -> numpy.ndarray:
+    import numpy
+
+    tables = _get_tables()
+    squares = numpy.arange(64)
+    index = codes.astype(numpy.intp) + 6
+
+    middlegame = tables["middlegame"][index, squares].sum(axis=1)
+    endgame = tables["endgame"][index, squares].sum(axis=1)
+    phase = numpy.minimum(tables["phases"][index].sum(axis=1), MAX_PHASE)
+    score = middlegame * phase + endgame * (MAX_PHASE - phase)
+    score = numpy.sign(score) * (numpy.abs(score) // MAX_PHASE)
+
+    return score + _get_mobility(codes, tables)
+
+
+def _get_mobility(codes: numpy.ndarray, tables: dict[str, numpy.ndarray]) -> numpy.ndarray:
+    import numpy
+
+    # Occupancy bitboards per position, bit i for square i like the BitBoard uses.
+    white = _to_bitboards(codes > 0)
+    black = _to_bitboards(codes < 0)
+    occupied = white | black
+
+    # Only knights, bishops, rooks and queens are looked at, one entry per piece.
+    weights = tables["weights"][codes.astype(numpy.intp) + 6]
+    rows, squares = numpy.nonzero(weights)
+    piece_types = numpy.abs(codes[rows, squares])
+    own = numpy.where(codes[rows, squares] > 0, white[rows], black[rows])
+    blocked = occupied[rows]
+
+    attacks = numpy.where(piece_types == 2, tables["knights"][squares], numpy.uint64(0))
+    one = numpy.uint64(1)
+    for direction, (offset, _, _) in enumerate(DIRECTIONS):
+        pieces = piece_types == 5
+        pieces |= piece_types == (3 if direction in DIAGONAL_DIRECTIONS else 4)
+        ray = numpy.where(pieces, tables["rays"][direction][squares], numpy.uint64(0))
+        blockers = ray & blocked
+
+        # Keep the ray up to and including its first blocker, the lowest set bit for
+        # rays towards h1 and the highest for rays towards a8.
+        if offset > 0:
+            lowest = blockers & (~blockers + one)
+            attacks |= ray & ((lowest << one) - one)
+        else:
+            highest = _get_highest_bits(blockers)
+            attacks |= numpy.where(blockers != 0, ray & ~(highest - one), ray)
+
+    moves = _count_bits(attacks & ~own, tables["bit_counts"])
+    scores = numpy.bincount(rows, weights=moves * weights[rows, squares], minlength=len(codes))
+    return scores.astype(numpy.int32)
+
+
+def _to_bitboards(mask: numpy.ndarray) -> numpy.ndarray:
+    import numpy
+
+    packed = numpy.packbits(mask, axis=1, bitorder="little")
+    return packed.view("<u8")[:, 0].astype(numpy.uint64)
+
+
+def _get_highest_bits(bitboards: numpy.ndarray) -> numpy.ndarray:
+    import numpy
+
+    smeared = bitboards.copy()
+    for shift in (1, 2, 4, 8, 16, 32):
+        smeared |= smeared >> numpy.uint64(shift)
+    return smeared ^ (smeared >> numpy.uint64(1))
+
+
+def _count_bits(bitboards: numpy.ndarray, bit_counts: numpy.ndarray) -> numpy.ndarray:
+    import numpy
+
+    bytes_ = numpy.ascontiguousarray(bitboards).view(numpy.uint8).reshape(-1, 8)
+    return bit_counts[bytes_].sum(axis=1, dtype=numpy.int32)
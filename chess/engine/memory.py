@@ -0,0 +1,133 @@
+"""
+Memory footprint of boards and moves, measured with tracemalloc, and the cost of
+Board.copy compared with copy.deepcopy.
+
+Usage:
+    python -m chess.engine.memory [--boards N] [--moves N] [--copies N] [--output memory.json]
+
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from chess.engine.board import Board
+from chess.engine.perft import FEN_EXAMPLES
+
+MOVES_PER_SAMPLE = 10_000
+
+
+def measure_allocations(create: Callable[[], object]) -> int:
+    """
+    Return the number of bytes still allocated by the object create returns.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = create()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return after - before
+
+
+def bytes_per_board(fen_strings: list[str], count: int = 1000) -> float:
+    def create() -> list[Board]:
+        return [Board(fen_strings[index % len(fen_strings)]) for index in range(count)]
+
+    return measure_allocations(create) / count
+
+
+def bytes_per_moves(fen_strings: list[str], count: int = MOVES_PER_SAMPLE) -> float:
+    """
+    Bytes needed to keep MOVES_PER_SAMPLE Move objects alive, boards not included.
+
+    """
+    boards = [Board(fen_string) for fen_string in fen_strings]
+
+    def create() -> list:
+        moves = []
+        while len(moves) < count:
+            for board in boards:
+                moves.extend(board.generate_legal_moves())
+        return moves[:count]
+
+    return measure_allocations(create) / count * MOVES_PER_SAMPLE
+
+
+def compare_copies(fen_strings: list[str], count: int = 1000) -> dict[str, float]:
+    """
+    Time and memory per copy of a board that has a few moves of history, for
+    copy.deepcopy, Board.copy and Board.copy followed by building the pieces.
+
+    """
+    boards = []
+    for fen_string in fen_strings:
+        board = Board(fen_string)
+        for _ in range(4):
+            moves = board.generate_legal_moves()
+            if not moves:
+                break
+            board.make_move(moves[0])
+        boards.append(board)
+
+    def copy_all(method: Callable[[Board], object]) -> list:
+        return [method(boards[index % len(boards)]) for index in range(count)]
+
+    def build_copy(board: Board) -> Board:
+        copied = board.copy()
+        copied.state
+        return copied
+
+    results = {}
+    methods = (("deepcopy", copy.deepcopy), ("copy", Board.copy), ("copy_and_build", build_copy))
+    for name, method in methods:
+        start = time.perf_counter()
+        copy_all(method)
+        results[f"{name}_microseconds"] = round((time.perf_counter() - start) / count * 1e6, 1)
+        results[f"{name}_bytes"] = round(measure_allocations(lambda: copy_all(method)) / count)
+
+    return results
+
+
+def run_benchmark(
+    boards: int = 1000, moves: int = MOVES_PER_SAMPLE, copies: int = 1000
+) -> dict[str, float]:
+    fen_strings = [example["fen"] for example in FEN_EXAMPLES]
+    return {
+        "bytes_per_board": round(bytes_per_board(fen_strings, boards)),
+        f"bytes_per_{MOVES_PER_SAMPLE}_moves": round(bytes_per_moves(fen_strings, moves)),
+        **compare_copies(fen_strings, copies),
+    }
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m chess.engine.memory")
+    parser.add_argument("--boards", type=int, default=1000, help="boards to create")
+    parser.add_argument("--moves", type=int, default=MOVES_PER_SAMPLE, help="moves to create")
+    parser.add_argument("--copies", type=int, default=1000, help="copies per copy method")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    options = parser.parse_args(arguments)
+
+    results = run_benchmark(options.boards, options.moves, options.copies)
+    for name, value in results.items():
+        print(f"{name}: {value}")
+
+    if options.output is not None:
+        options.output.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,67 @@ if TYPE_CHECKING:
     from chess.engine.board import Board
     from chess.engine.pieces import Piece
 
+PROMOTION_CODES = {"n": 1, "b": 2, "r": 3, "q": 4}
+PROMOTION_LETTERS = " nbrq"
+
+# Packed move layout: origin in bits 0-5, target in bits 6-11, promotion code in bits
+# 12-14 and flags from bit 15 on. Zero never describes a move.
+TARGET_SHIFT = 6
+PROMOTION_SHIFT = 12
+SQUARE_MASK = 0x3F
+PROMOTION_MASK = 0x7
+
+CAPTURE_FLAG = 1 << 15
+PAWN_JUMP_FLAG = 1 << 16
+EN_PASSANT_FLAG = 1 << 17
+CASTLE_FLAG = 1 << 18
+
+
+def encode_move(origin: int, target: int, flags: int = 0, promotion: int = 0) -> int:
+    return origin | target << TARGET_SHIFT | promotion << PROMOTION_SHIFT | flags
+
+
+def decode_move(packed_move: int) -> tuple[int, int, int, int]:
+    """
+    Split a packed move into (origin, target, flags, promotion code).
+
+    """
+    return (
+        packed_move & SQUARE_MASK,
+        packed_move >> TARGET_SHIFT & SQUARE_MASK,
+        packed_move & ~0x7FFF,
+        packed_move >> PROMOTION_SHIFT & PROMOTION_MASK,
+    )
+
+
+def get_origin(packed_move: int) -> int:
+    return packed_move & SQUARE_MASK
+
+
+def get_target(packed_move: int) -> int:
+    return packed_move >> TARGET_SHIFT & SQUARE_MASK
+
+
+def get_promotion(packed_move: int) -> int:
+    return packed_move >> PROMOTION_SHIFT & PROMOTION_MASK
+
+
+def packed_to_uci(packed_move: int) -> str:
+    from chess.engine.board import position_to_coordinate
+
+    origin, target, _, promotion = decode_move(packed_move)
+    return (
+        f"{position_to_coordinate(origin)}{position_to_coordinate(target)}"
+        f"{PROMOTION_LETTERS[promotion].strip()}"
+    )
+
 
 class Move:
+    __slots__ = ("moving_piece", "origin", "target")
+
+    # Flags of the packed form, see encode_move.
+    FLAGS = 0
+
     def __init__(self, moving_piece: Piece, target: int):
         self.moving_piece = moving_piece
 
@@ -22,6 +81,18 @@ class Move:
     def __repr__(self):
         return f"M: {self.moving_piece.abbreviation} -> {self.target}"
 
+    def to_uci(self) -> str:
+        from chess.engine.board import position_to_coordinate
+
+        return f"{position_to_coordinate(self.origin)}{position_to_coordinate(self.target)}"
+
+    def pack(self) -> int:
+        """
+        Compact integer form of the move, see encode_move.
+
+        """
+        return encode_move(self.origin, self.target, self.FLAGS)
+
     def execute(self, board: Board):
         board.set_piece_at(self.target, self.moving_piece)
         board.set_piece_at(self.origin, None)
@@ -42,6 +113,10 @@ class Move:
 
 
 class AttackMove(Move):
+    __slots__ = ("attacked_piece",)
+
+    FLAGS = CAPTURE_FLAG
+
     def __init__(self, moving_piece: Piece, target: int, attacked_piece: Piece):
         super().__init__(moving_piece, target)
 
@@ -67,6 +142,10 @@ class AttackMove(Move):
 
 
 class CastleMove(Move):
+    __slots__ = ("is_king_side",)
+
+    FLAGS = CASTLE_FLAG
+
     def __init__(self, moving_piece: Piece, target: int, is_king_side = True):
         super().__init__(moving_piece, target)
 
@@ -77,12 +156,10 @@ class CastleMove(Move):
             rook = board.get_piece_at(self.origin + 3)
             board.set_piece_at(self.target - 1, rook)
             board.set_piece_at(self.target + 1, None)
-            abbreviation = self.moving_piece.abbreviation
         else:
             rook = board.get_piece_at(self.origin - 4)
             board.set_piece_at(self.target + 1, rook)
             board.set_piece_at(self.target - 2, None)
-            abbreviation = "Q" if self.moving_piece.alliance == Alliance.WHITE else "q"
 
         board.set_piece_at(self.target, self.moving_piece)
         board.set_piece_at(self.origin, None)
@@ -90,8 +167,6 @@ class CastleMove(Move):
         self.moving_piece.move_count += 1
         rook.move_count += 1
 
-        board.castling_availability = board.castling_availability.replace(abbreviation, '')
-
     def undo(self, board: Board):
         king = board.get_piece_at(self.target)
         board.set_piece_at(self.origin, king)
@@ -101,26 +176,29 @@ class CastleMove(Move):
             rook = board.get_piece_at(self.target - 1)
             board.set_piece_at(self.target + 1, rook)
             board.set_piece_at(self.target - 1, None)
-            abbreviation = self.moving_piece.abbreviation
         else:
             rook = board.get_piece_at(self.target + 1)
             board.set_piece_at(self.target - 2, rook)
             board.set_piece_at(self.target + 1, None)
-            abbreviation = "Q" if self.moving_piece.alliance == Alliance.WHITE else "q"
 
         king.move_count -= 1
         rook.move_count -= 1
 
-        board.castling_availability += abbreviation
-        board.castling_availability = ''.join(sorted(board.castling_availability))
-
 
 class PromotionMove(Move):
-    def __init__(self, moving_piece: Piece, target: int, attacked_piece: Piece | None = None):
+    __slots__ = ("attacked_piece", "piece_to_promote")
+
+    def __init__(
+        self,
+        moving_piece: Piece,
+        target: int,
+        attacked_piece: Piece | None = None,
+        piece_to_promote: Piece | None = None,
+    ):
         super().__init__(moving_piece, target)
 
         self.attacked_piece = attacked_piece
-        self.piece_to_promote = None
+        self.piece_to_promote = piece_to_promote
 
     def __repr__(self):
         return f"{self.moving_piece.show()}, {self.piece_to_promote.show()}"
@@ -128,6 +206,29 @@ class PromotionMove(Move):
     def __str__(self):
         return f"{self.moving_piece.show()}, {self.piece_to_promote.show()}"
 
+    def __eq__(self, other: Move) -> bool:
+        return (
+            super().__eq__(other)
+            and isinstance(other, PromotionMove)
+            and type(self.piece_to_promote) is type(other.piece_to_promote)
+        )
+
+    def __hash__(self):
+        return hash((self.origin, self.target, type(self.piece_to_promote).__name__))
+
+    def pack(self) -> int:
+        if self.piece_to_promote is None:
+            promotion = PROMOTION_CODES["q"]
+        else:
+            promotion = PROMOTION_CODES[self.piece_to_promote.abbreviation.lower()]
+        flags = CAPTURE_FLAG if self.attacked_piece is not None else 0
+        return encode_move(self.origin, self.target, flags, promotion)
+
+    def to_uci(self) -> str:
+        if self.piece_to_promote is None:
+            return f"{super().to_uci()}q"
+        return f"{super().to_uci()}{self.piece_to_promote.abbreviation.lower()}"
+
     def execute(self, board):
         from chess.engine.pieces import Queen
 
@@ -162,6 +263,10 @@ class PromotionMove(Move):
 
 
 class PawnJumpMove(Move):
+    __slots__ = ("jumped_position",)
+
+    FLAGS = PAWN_JUMP_FLAG
+
     def __init__(self, moving_piece: Piece, target: int, jumped_position: int):
         super().__init__(moving_piece, target)
 
@@ -181,10 +286,14 @@ class PawnJumpMove(Move):
 
 
 class EnPassantAttackMove(Move):
-    def __init__(self, moving_piece: Piece, target: int, en_passant_move: PawnJumpMove):
+    __slots__ = ("attacked_piece", "attacking_piece_at")
+
+    FLAGS = CAPTURE_FLAG | EN_PASSANT_FLAG
+
+    def __init__(self, moving_piece: Piece, target: int, attacked_piece: Piece):
         super().__init__(moving_piece, target)
 
-        self.attacked_piece = en_passant_move.moving_piece
+        self.attacked_piece = attacked_piece
         self.attacking_piece_at = int(self.attacked_piece.position)
 
     def __repr__(self):
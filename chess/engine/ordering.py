@@ -0,0 +1,187 @@
+"""
+Move ordering for the alpha-beta search.
+
+Moves are tried in this order: the transposition table move, promotions and captures
+by MVV-LVA (most valuable victim, least valuable attacker), the two killer moves of
+the current ply, the remaining quiet moves by their history score, and last the
+captures that lose material by static exchange evaluation when a board is given.
+staged_moves hands the same information to Board.generate_staged_moves, which
+generates the moves in that order one stage at a time.
+
+"""
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Iterator
+
+from chess.engine.alliance import Alliance
+from chess.engine.move import AttackMove, EnPassantAttackMove, Move, PromotionMove
+
+if TYPE_CHECKING:
+    from chess.engine.board import Board
+
+MAX_PLY = 128
+KILLER_SLOTS = 2
+
+# Indexed by the lower case abbreviation of a piece.
+ORDERING_VALUES = {"p": 1, "n": 2, "b": 3, "r": 4, "q": 5, "k": 6}
+
+TABLE_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 24
+PROMOTION_SCORE = 1 << 24
+KILLER_SCORE = 1 << 22
+# Below every quiet move, whose history scores are never negative.
+LOSING_CAPTURE_SCORE = -CAPTURE_SCORE
+# History scores are halved when they reach this so they never overtake killers.
+HISTORY_LIMIT = 1 << 20
+
+
+def is_capture(move: Move) -> bool:
+    if isinstance(move, (AttackMove, EnPassantAttackMove)):
+        return True
+    return isinstance(move, PromotionMove) and move.attacked_piece is not None
+
+
+def is_quiet(move: Move) -> bool:
+    return not is_capture(move) and not isinstance(move, PromotionMove)
+
+
+def mvv_lva(move: Move) -> int:
+    """
+    Score a capture so that taking a queen with a pawn comes first and taking a pawn
+    with the king comes last.
+
+    """
+    victim = ORDERING_VALUES[move.attacked_piece.abbreviation.lower()]
+    attacker = ORDERING_VALUES[move.moving_piece.abbreviation.lower()]
+    return victim * 8 - attacker
+
+
+def is_losing_capture(board: Board, move: Move) -> bool:
+    """
+    Tell whether a capture loses material by static exchange evaluation. Taking a
+    piece worth at least as much as the capturing one never does, so the exchange is
+    only worked out for the other captures.
+
+    """
+    if not is_capture(move):
+        return False
+    victim = ORDERING_VALUES[move.attacked_piece.abbreviation.lower()]
+    if victim >= ORDERING_VALUES[move.moving_piece.abbreviation.lower()]:
+        return False
+    return board.see(move) < 0
+
+
+def promotion_score(move: PromotionMove) -> int:
+    # A queen promotion without a promoted piece is what the board plays by default.
+    promoted = move.piece_to_promote.abbreviation.lower() if move.piece_to_promote else "q"
+    return ORDERING_VALUES[promoted] * 64
+
+
+class MoveOrdering:
+    def __init__(self) -> None:
+        # Packed killer moves per ply, zero marks an empty slot.
+        self.killers: list[list[int]] = []
+        # history[alliance][origin * 64 + target]
+        self.history: list[list[int]] = []
+        self.clear()
+
+    def clear(self) -> None:
+        self.killers = [[0] * KILLER_SLOTS for _ in range(MAX_PLY)]
+        self.history = [[0] * 64 * 64 for _ in Alliance]
+
+    def age(self) -> None:
+        """
+        Keep the history from the previous search but give new results more weight;
+        killers only make sense for the search they were found in.
+
+        """
+        self.killers = [[0] * KILLER_SLOTS for _ in range(MAX_PLY)]
+        for table in self.history:
+            for index, score in enumerate(table):
+                if score:
+                    table[index] = score >> 1
+
+    def score_move(
+        self, move: Move, ply: int = 0, table_move: int = 0, board: Board | None = None
+    ) -> int:
+        packed_move = move.pack()
+        if table_move and packed_move == table_move:
+            return TABLE_MOVE_SCORE
+
+        score = 0
+        if isinstance(move, PromotionMove):
+            score += PROMOTION_SCORE + promotion_score(move)
+        if is_capture(move):
+            if not score and board is not None and is_losing_capture(board, move):
+                return LOSING_CAPTURE_SCORE + mvv_lva(move)
+            score += CAPTURE_SCORE + mvv_lva(move)
+        if score:
+            return score
+
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if packed_move == killers[0]:
+                return KILLER_SCORE
+            if packed_move == killers[1]:
+                return KILLER_SCORE - 1
+
+        return self.history[move.moving_piece.alliance.value][move.origin * 64 + move.target]
+
+    def order_moves(
+        self,
+        moves: list[Move],
+        ply: int = 0,
+        table_move: int = 0,
+        board: Board | None = None,
+    ) -> list[Move]:
+        moves.sort(key=lambda move: self.score_move(move, ply, table_move, board), reverse=True)
+        return moves
+
+    def staged_moves(
+        self,
+        board: Board,
+        ply: int = 0,
+        table_move: int = 0,
+        buffer: array | None = None,
+        start: int = 0,
+    ) -> Iterator[Move]:
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        history = self.history[board.active_player.value]
+        return board.generate_staged_moves(table_move, killers, history, buffer, start)
+
+    def order_captures(self, moves: list[Move]) -> list[Move]:
+        # Promotions count as captures here, they change the material balance too.
+        captures = [move for move in moves if not is_quiet(move)]
+        captures.sort(key=self.score_move, reverse=True)
+        return captures
+
+    def update(self, move: Move, depth: int, ply: int, quiets_tried: list[Move]) -> None:
+        """
+        Record a quiet move that caused a beta cutoff. The quiet moves searched before
+        it at the same node did not, so their history is lowered.
+
+        """
+        if not is_quiet(move):
+            return
+
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            packed_move = move.pack()
+            if killers[0] != packed_move:
+                killers[1] = killers[0]
+                killers[0] = packed_move
+
+        history = self.history[move.moving_piece.alliance.value]
+        bonus = depth * depth
+        index = move.origin * 64 + move.target
+        history[index] += bonus
+        for quiet in quiets_tried:
+            if quiet is not move:
+                other = quiet.origin * 64 + quiet.target
+                history[other] = max(history[other] - bonus, 0)
+
+        if history[index] >= HISTORY_LIMIT:
+            for table in self.history:
+                for other, score in enumerate(table):
+                    table[other] = score >> 1
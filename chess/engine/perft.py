@@ -0,0 +1,407 @@
+"""
+Move generation path enumeration (perft).
+
+Usage:
+    python -m chess.engine.perft perft "<fen>" <depth> [--jobs N] [--hash MB] [--board TYPE]
+    python -m chess.engine.perft divide "<fen>" <depth> [--jobs N] [--hash MB] [--board TYPE]
+    python -m chess.engine.perft bench --tier quick --output perft.json [--jobs N] [--hash MB]
+        [--board TYPE]
+
+--board picks the board representation from BOARD_TYPES, Board by default.
+
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from chess.engine.bitboard import BitBoard
+from chess.engine.board import MAX_MOVES, Board
+from chess.engine.transposition import EXACT, TranspositionTable
+
+FEN_EXAMPLES = [
+    {"depth": 1, "nodes": 8, "fen": "r6r/1b2k1bq/8/8/7B/8/8/R3K2R b KQ - 3 2"},
+    {"depth": 1, "nodes": 8, "fen": "8/8/8/2k5/2pP4/8/B7/4K3 b - d3 0 3"},
+    {
+        "depth": 1,
+        "nodes": 19,
+        "fen": "r1bqkbnr/pppppppp/n7/8/8/P7/1PPPPPPP/RNBQKBNR w KQkq - 2 2",
+    },
+    {
+        "depth": 1,
+        "nodes": 5,
+        "fen": "r3k2r/p1pp1pb1/bn2Qnp1/2qPN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQkq - 3 2",
+    },
+    {
+        "depth": 1,
+        "nodes": 44,
+        "fen": "2kr3r/p1ppqpb1/bn2Qnp1/3PN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQ - 3 2",
+    },
+    {
+        "depth": 1,
+        "nodes": 39,
+        "fen": "rnb2k1r/pp1Pbppp/2p5/q7/2B5/8/PPPQNnPP/RNB1K2R w KQ - 3 9",
+    },
+    {"depth": 1, "nodes": 9, "fen": "2r5/3pk3/8/2P5/8/2K5/8/8 w - - 5 4"},
+    {
+        "depth": 3,
+        "nodes": 62379,
+        "fen": "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    },
+    {
+        "depth": 3,
+        "nodes": 89890,
+        "fen": "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    },
+    {"depth": 6, "nodes": 1134888, "fen": "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1"},
+    {"depth": 6, "nodes": 1015133, "fen": "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1"},
+    {"depth": 6, "nodes": 1440467, "fen": "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1"},
+    {"depth": 6, "nodes": 661072, "fen": "5k2/8/8/8/8/8/8/4K2R w K - 0 1"},
+    {"depth": 6, "nodes": 803711, "fen": "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1"},
+    {"depth": 4, "nodes": 1274206, "fen": "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1"},
+    {"depth": 4, "nodes": 1720476, "fen": "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1"},
+    {"depth": 6, "nodes": 3821001, "fen": "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1"},
+    {"depth": 5, "nodes": 1004658, "fen": "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1"},
+    {"depth": 6, "nodes": 217342, "fen": "4k3/1P6/8/8/8/8/K7/8 w - - 0 1"},
+    {"depth": 6, "nodes": 92683, "fen": "8/P1k5/K7/8/8/8/8/8 w - - 0 1"},
+    {"depth": 6, "nodes": 2217, "fen": "K1k5/8/P7/8/8/8/8/8 w - - 0 1"},
+    {"depth": 7, "nodes": 567584, "fen": "8/k1P5/8/1K6/8/8/8/8 w - - 0 1"},
+    {"depth": 4, "nodes": 23527, "fen": "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1"},
+]
+
+JOBS_HELP = "number of worker processes, 0 uses every core"
+HASH_HELP = "transposition table size in megabytes per process, 0 disables it"
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+# Perft counts depend on the remaining depth, so it is mixed into the table key.
+_DEPTH_MIXER = 0x9E3779B97F4A7C15
+
+# Table of the current worker process, created by _initialise_worker.
+_worker_table: TranspositionTable | None = None
+
+# Largest node count an example may have to be part of a tier.
+# Board representations by name; names rather than classes reach the worker processes.
+BOARD_TYPES = {"board": Board, "bitboard": BitBoard}
+BOARD_HELP = "board representation"
+
+TIERS = {"quick": 10_000, "medium": 100_000, "full": None}
+
+
+def perft(board: Board, depth: int) -> int:
+    return _perft(board, depth, _create_buffer(depth), 0)
+
+
+def _create_buffer(depth: int) -> array:
+    # One slice of MAX_MOVES packed moves per ply, allocated once per perft call.
+    return array("I", bytes(max(depth, 1) * MAX_MOVES * 4))
+
+
+def _perft(board: Board, depth: int, buffer: array, start: int) -> int:
+    if depth == 0:
+        return 1
+
+    end = board.generate_moves(buffer, start)
+    if depth == 1:
+        return end - start
+
+    nodes = 0
+    for index in range(start, end):
+        board.make_packed_move(buffer[index])
+        nodes += _perft(board, depth - 1, buffer, end)
+        board.unmake_move()
+
+    return nodes
+
+
+def perft_with_table(board: Board, depth: int, table: TranspositionTable) -> int:
+    """
+    Perft that caches subtree counts, so positions reached through transpositions
+    are only expanded once.
+
+    """
+    return _perft_with_table(board, depth, table, _create_buffer(depth), 0)
+
+
+def _perft_with_table(
+    board: Board, depth: int, table: TranspositionTable, buffer: array, start: int
+) -> int:
+    if depth <= 1:
+        return _perft(board, depth, buffer, start)
+
+    key = board.zobrist_key ^ (depth * _DEPTH_MIXER & _MASK_64)
+    entry = table.probe(key)
+    if entry is not None and entry.depth == depth:
+        return entry.score
+
+    nodes = 0
+    end = board.generate_moves(buffer, start)
+    for index in range(start, end):
+        board.make_packed_move(buffer[index])
+        nodes += _perft_with_table(board, depth - 1, table, buffer, end)
+        board.unmake_move()
+
+    table.store(key, depth, EXACT, nodes)
+    return nodes
+
+
+def divide(
+    board: Board, depth: int, table: TranspositionTable | None = None
+) -> dict[str, int]:
+    """
+    Count the nodes below every root move, keyed by the move in UCI notation.
+
+    """
+    counts = {}
+    for move in board.generate_legal_moves():
+        board.make_move(move)
+        if table is None:
+            counts[move.to_uci()] = perft(board, depth - 1)
+        else:
+            counts[move.to_uci()] = perft_with_table(board, depth - 1, table)
+        board.unmake_move()
+
+    return counts
+
+
+def _create_table(hash_size: int) -> TranspositionTable | None:
+    if hash_size <= 0:
+        return None
+    return TranspositionTable(hash_size * 1024 * 1024)
+
+
+def _initialise_worker(hash_size: int) -> None:
+    global _worker_table
+    _worker_table = _create_table(hash_size)
+
+
+def _perft_after_moves(
+    fen_string: str, moves: tuple[str, ...], depth: int, board_type: str = "board"
+) -> int:
+    # Workers rebuild the position from FEN, Board objects are never pickled.
+    board = BOARD_TYPES[board_type](fen_string)
+    for uci in moves:
+        board.make_move(board.parse_uci(uci))
+
+    if _worker_table is None:
+        return perft(board, depth)
+    return perft_with_table(board, depth, _worker_table)
+
+
+def parallel_divide(
+    fen_string: str,
+    depth: int,
+    jobs: int | None = None,
+    hash_size: int = 0,
+    board_type: str = "board",
+) -> dict[str, int]:
+    """
+    Divide with the work spread over a process pool. When the root has too few moves
+    to keep every worker busy, the position is split at depth 2 instead and the
+    counts are merged back per root move.
+
+    """
+    jobs = jobs or os.cpu_count() or 1
+    board = BOARD_TYPES[board_type](fen_string)
+
+    if depth <= 1 or jobs == 1:
+        return divide(board, depth, _create_table(hash_size))
+
+    tasks = []
+    root_moves = board.generate_legal_moves()
+    split_at_depth_two = depth > 2 and len(root_moves) < 4 * jobs
+
+    for move in root_moves:
+        if not split_at_depth_two:
+            tasks.append((move.to_uci(),))
+            continue
+
+        board.make_move(move)
+        replies = board.generate_legal_moves()
+        tasks.extend((move.to_uci(), reply.to_uci()) for reply in replies)
+        board.unmake_move()
+
+        if not replies:
+            tasks.append((move.to_uci(),))
+
+    counts = {move.to_uci(): 0 for move in root_moves}
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_initialise_worker, initargs=(hash_size,)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _perft_after_moves, fen_string, moves, depth - len(moves), board_type
+            )
+            for moves in tasks
+        ]
+        for moves, future in zip(tasks, futures):
+            counts[moves[0]] += future.result()
+
+    return counts
+
+
+def parallel_perft(
+    fen_string: str,
+    depth: int,
+    jobs: int | None = None,
+    hash_size: int = 0,
+    board_type: str = "board",
+) -> int:
+    if depth == 0:
+        return 1
+    return sum(parallel_divide(fen_string, depth, jobs, hash_size, board_type).values())
+
+
+def run_perft(
+    fen_string: str, depth: int, jobs: int = 1, hash_size: int = 0, board_type: str = "board"
+) -> dict:
+    table = _create_table(hash_size) if jobs == 1 else None
+    board_class = BOARD_TYPES[board_type]
+
+    start = time.perf_counter()
+    if jobs != 1:
+        nodes = parallel_perft(fen_string, depth, jobs, hash_size, board_type)
+    elif table is not None:
+        nodes = perft_with_table(board_class(fen_string), depth, table)
+    else:
+        nodes = perft(board_class(fen_string), depth)
+    seconds = time.perf_counter() - start
+
+    result = {
+        "fen": fen_string,
+        "depth": depth,
+        "jobs": jobs,
+        "hash": hash_size,
+        "board": board_type,
+        "nodes": nodes,
+        "seconds": seconds,
+        "nps": nodes / seconds if seconds > 0 else 0.0,
+    }
+    if table is not None:
+        result["table"] = table.get_statistics()
+
+    return result
+
+
+def get_examples(tier: str) -> list[dict]:
+    limit = TIERS[tier]
+    return [
+        example for example in FEN_EXAMPLES if limit is None or example["nodes"] <= limit
+    ]
+
+
+def run_benchmark(
+    tier: str = "quick", jobs: int = 1, hash_size: int = 0, board_type: str = "board"
+) -> list[dict]:
+    results = []
+    for example in get_examples(tier):
+        result = run_perft(example["fen"], example["depth"], jobs, hash_size, board_type)
+        result["expected"] = example["nodes"]
+        result["passed"] = result["nodes"] == example["nodes"]
+        results.append(result)
+
+    return results
+
+
+def write_results(
+    results: list[dict], path: Path, tier: str, jobs: int = 1, hash_size: int = 0
+) -> None:
+    nodes = sum(result["nodes"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+
+    path.write_text(
+        json.dumps(
+            {
+                "tier": tier,
+                "jobs": jobs,
+                "hash": hash_size,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "nodes": nodes,
+                "seconds": seconds,
+                "nps": nodes / seconds if seconds > 0 else 0.0,
+                "passed": all(result["passed"] for result in results),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m chess.engine.perft")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("perft", "divide"):
+        sub_parser = commands.add_parser(command)
+        sub_parser.add_argument("fen")
+        sub_parser.add_argument("depth", type=int)
+        sub_parser.add_argument("--jobs", type=int, default=1, help=JOBS_HELP)
+        sub_parser.add_argument("--hash", type=int, default=0, help=HASH_HELP)
+        sub_parser.add_argument(
+            "--board", choices=tuple(BOARD_TYPES), default="board", help=BOARD_HELP
+        )
+
+    bench_parser = commands.add_parser("bench")
+    bench_parser.add_argument("--tier", choices=tuple(TIERS), default="quick")
+    bench_parser.add_argument("--output", type=Path)
+    bench_parser.add_argument("--jobs", type=int, default=1, help=JOBS_HELP)
+    bench_parser.add_argument("--hash", type=int, default=0, help=HASH_HELP)
+    bench_parser.add_argument(
+        "--board", choices=tuple(BOARD_TYPES), default="board", help=BOARD_HELP
+    )
+
+    options = parser.parse_args(arguments)
+
+    if options.command == "perft":
+        result = run_perft(options.fen, options.depth, options.jobs, options.hash, options.board)
+        print(f"Nodes: {result['nodes']}")
+        print(f"Time: {result['seconds']:.3f}s ({result['nps']:.0f} nodes/s)")
+        if "table" in result:
+            statistics = result["table"]
+            print(
+                f"Table: {statistics['hits']} hits, {statistics['misses']} misses, "
+                f"{statistics['collisions']} collisions ({statistics['hit_rate']:.1%} hit rate)"
+            )
+        return 0
+
+    if options.command == "divide":
+        start = time.perf_counter()
+        if options.jobs == 1:
+            board = BOARD_TYPES[options.board](options.fen)
+            counts = divide(board, options.depth, _create_table(options.hash))
+        else:
+            counts = parallel_divide(
+                options.fen, options.depth, options.jobs, options.hash, options.board
+            )
+        seconds = time.perf_counter() - start
+
+        for uci, nodes in sorted(counts.items()):
+            print(f"{uci}: {nodes}")
+        total = sum(counts.values())
+        print(f"\nMoves: {len(counts)}")
+        print(f"Nodes: {total}")
+        print(f"Time: {seconds:.3f}s ({total / seconds if seconds > 0 else 0.0:.0f} nodes/s)")
+        return 0
+
+    results = run_benchmark(options.tier, options.jobs, options.hash, options.board)
+    for result in results:
+        status = "ok" if result["passed"] else f"FAILED (expected {result['expected']})"
+        print(
+            f"{result['fen']:<75} d{result['depth']} {result['nodes']:>9} "
+            f"{result['nps']:>9.0f} n/s {status}"
+        )
+
+    if options.output is not None:
+        write_results(results, options.output, options.tier, options.jobs, options.hash)
+
+    return 0 if all(result["passed"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,89 +1,73 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from chess.engine.alliance import Alliance
-
 if TYPE_CHECKING:
     from chess.engine.board import Board
+from chess.engine.attacks import PAWN_ATTACK_TARGETS
 from chess.engine.move import Move, AttackMove, PromotionMove, PawnJumpMove, EnPassantAttackMove
+from chess.engine.pieces.bishop import Bishop
+from chess.engine.pieces.knight import Knight
 from chess.engine.pieces.piece import Piece
+from chess.engine.pieces.queen import Queen
+from chess.engine.pieces.rook import Rook
 
-SINGLE_MOVE = 8
-DOUBLE_MOVE = 16
+PROMOTION_PIECES = (Queen, Rook, Bishop, Knight)
 
 
 class Pawn(Piece):
-    OFFSETS: set[int] = {7, 8, 9, 16}
+    __slots__ = ("first_move",)
+
+    ABBREVIATIONS = ("P", "p")
 
     def __init__(self, position, alliance):
         super().__init__(position, alliance)
 
         self.first_move = True
 
-    def calculate_legal_moves(self, board: Board) -> set[Move]:
-        from chess.engine.board import is_valid_position
-
-        self.legal_moves.clear()
-
-        for offset in self.OFFSETS:
-            possible_target = self.position + (offset * self.alliance.get_direction())
-
-            if is_valid_position(possible_target):
-                piece_on_tile = board.get_piece_at(possible_target)
-
-                if offset == SINGLE_MOVE and piece_on_tile is None:
-                    if self.position // 8 == 1 and self.alliance == Alliance.WHITE:
-                        self.legal_moves.add(PromotionMove(self, possible_target))
-
-                    elif self.position // 8 == 6 and self.alliance == Alliance.BLACK:  # Promotion Black Pawn
-                        self.legal_moves.add(PromotionMove(self, possible_target))
-
-                    else:
-                        self.legal_moves.add(Move(self, possible_target))
-
-                # Pawn jump move
-                elif (
-                    offset == DOUBLE_MOVE and
-                    self.is_eligible_for_jump_move()
-                ):
-                    position_in_between = self.position + (8 * self.alliance.get_direction())
-                    if (
-                        board.get_piece_at(position_in_between) is None
-                        and piece_on_tile is None
-                    ):
-                        self.legal_moves.add(PawnJumpMove(self, possible_target, position_in_between))
-
-                # Attack and en passant moves
-                elif offset in (7, 9):
-                    if offset == 7 and (self.position % 8 == 7 and self.is_white() or
-                                        self.position % 8 == 0 and self.is_black()):
-                        continue
-
-                    if offset == 9 and (self.position % 8 == 0 and self.is_white() or
-                                        self.position % 8 == 7 and self.is_black()):
-                        continue
-
-                    piece = board.state[possible_target]
-                    last_move = board.get_last_move()
-
-                    if (
-                        isinstance(last_move, PawnJumpMove) and
-                        last_move.jumped_position == possible_target and
-                        last_move.moving_piece.alliance != self.alliance
-                    ):
-                        self.legal_moves.add(EnPassantAttackMove(self, possible_target, last_move))
-
-                    else:
-                        if piece is not None and self.alliance != piece.alliance:
-                            if self.position // 8 == 1 and self.is_white():
-                                self.legal_moves.add(PromotionMove(self, possible_target, piece))
-                            elif self.position // 8 == 6 and self.is_black():
-                                self.legal_moves.add(PromotionMove(self, possible_target, piece))
-                            else:
-                                self.legal_moves.add(AttackMove(self, possible_target, piece))
+    def calculate_legal_moves(self, board: Board) -> list[Move]:
+        self.legal_moves = []
+
+        direction = self.alliance.get_direction()
+        is_promoting = self.position // 8 == (1 if self.is_white() else 6)
+
+        possible_target = self.position + 8 * direction
+        if 0 <= possible_target < 64 and board.state[possible_target] is None:
+            if is_promoting:
+                self.add_promotion_moves(possible_target)
+            else:
+                self.legal_moves.append(Move(self, possible_target))
+
+            # Pawn jump move
+            jump_target = possible_target + 8 * direction
+            if self.is_eligible_for_jump_move() and board.state[jump_target] is None:
+                self.legal_moves.append(PawnJumpMove(self, jump_target, possible_target))
+
+        # Attack and en passant moves
+        # The en passant square only ever belongs to the side to move.
+        en_passant_position = (
+            board.get_en_passant_position() if self.alliance == board.active_player else None
+        )
+        for possible_target in PAWN_ATTACK_TARGETS[self.alliance.value][self.position]:
+            if possible_target == en_passant_position:
+                attacked_piece = board.state[possible_target - 8 * direction]
+                self.legal_moves.append(EnPassantAttackMove(self, possible_target, attacked_piece))
+                continue
+
+            piece = board.state[possible_target]
+            if piece is not None and self.alliance != piece.alliance:
+                if is_promoting:
+                    self.add_promotion_moves(possible_target, piece)
+                else:
+                    self.legal_moves.append(AttackMove(self, possible_target, piece))
 
         return self.legal_moves
 
+    def add_promotion_moves(self, target: int, attacked_piece: Piece | None = None) -> None:
+        for piece_class in PROMOTION_PIECES:
+            self.legal_moves.append(
+                PromotionMove(self, target, attacked_piece, piece_class(target, self.alliance))
+            )
+
     def is_eligible_for_jump_move(self) -> bool:
         return (
             not self.has_moved and
@@ -3,26 +3,27 @@ from typing import TYPE_CHECKING
 from abc import ABC, abstractmethod
 
 from chess.engine.alliance import Alliance
-from chess.engine.move import Move
+from chess.engine.move import AttackMove, Move
 
 if TYPE_CHECKING:
     from chess.engine.board import Board
 
 
 class Piece(ABC):
-    OFFSETS: set[int] = set()
+    __slots__ = ("position", "alliance", "abbreviation", "move_count", "is_active", "legal_moves")
+
+    # FEN letters indexed by Alliance.value, set by every subclass.
+    ABBREVIATIONS = ("", "")
 
     def __init__(self, position: int, alliance: Alliance):
         self.position = position
         self.alliance = alliance
-
-        self.abbreviation = self.__class__.__name__[0]
-        if self.alliance == Alliance.BLACK:
-            self.abbreviation = self.abbreviation.lower()
+        self.abbreviation = self.ABBREVIATIONS[alliance.value]
 
         self.move_count = 0
         self.is_active = True
-        self.legal_moves: set[Move] = set()
+        # Shared until calculate_legal_moves fills in a list of this piece's own.
+        self.legal_moves: list[Move] | tuple[()] = ()
 
     @property
     def has_moved(self) -> bool:
@@ -64,8 +65,26 @@ class Piece(ABC):
             if move.target == target:
                 return move
 
+    def calculate_sliding_moves(
+        self, board: Board, rays: tuple[tuple[int, ...], ...]
+    ) -> list[Move]:
+        self.legal_moves = []
+
+        for ray in rays:
+            for target in ray:
+                piece_on_tile = board.state[target]
+                if piece_on_tile is None:
+                    self.legal_moves.append(Move(self, target))
+                    continue
+
+                if piece_on_tile.alliance != self.alliance:
+                    self.legal_moves.append(AttackMove(self, target, piece_on_tile))
+                break
+
+        return self.legal_moves
+
     @abstractmethod
-    def calculate_legal_moves(self, board: Board) -> set[Move]:
+    def calculate_legal_moves(self, board: Board) -> list[Move]:
         ...
 
     @classmethod
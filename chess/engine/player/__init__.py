@@ -1 +1 @@
-from chess.engine.player.player import BlackPlayer, WhitePlayer, Player
+from chess.engine.player.player import EnginePlayer, Player
@@ -0,0 +1,202 @@
+"""
+Immutable position snapshots and a compact game history built from them.
+
+A Position keeps the 64 squares as bytes plus the FEN state fields and the Zobrist
+key, so it is hashable and cheap to keep around. GameHistory stores a keyframe
+Position every few plies and the packed moves in between; any ply is rebuilt from
+the keyframe before it.
+
+"""
+from __future__ import annotations
+
+from array import array
+from typing import NamedTuple
+
+from chess.engine.alliance import Alliance
+from chess.engine.board import COORDINATES, Board, format_placement, parse_placement
+from chess.engine.move import Move
+from chess.engine.zobrist import compute_key
+
+KEYFRAME_INTERVAL = 16
+
+
+class Position(NamedTuple):
+    # One ASCII piece letter per square in board order, "." for empty squares.
+    squares: bytes
+    active_player: Alliance
+    castling_availability: str
+    en_passant_target_square: str
+    halfmove_clock: int
+    fullmove_number: int
+    key: int
+
+    @classmethod
+    def from_board(cls, board: Board) -> Position:
+        return cls(
+            board.get_squares().encode("ascii"),
+            board.active_player,
+            board.castling_availability,
+            str(board.en_passant_target_square),
+            board.halfmove_clock,
+            board.fullmove_number,
+            board.zobrist_key,
+        )
+
+    @classmethod
+    def from_fen(cls, fen_string: str) -> Position:
+        fields = fen_string.split()
+        if len(fields) != 6:
+            raise ValueError(f"Invalid FEN string: {fen_string}")
+        return cls.from_fields(*fields[:4], int(fields[4]), int(fields[5]))
+
+    @classmethod
+    def from_fields(
+        cls,
+        placement: str,
+        active_player: str,
+        castling_availability: str,
+        en_passant_target_square: str,
+        halfmove_clock: int = 0,
+        fullmove_number: int = 1,
+    ) -> Position:
+        """
+        Position from the fields of a FEN or EPD string. The fields are checked, but no
+        pieces are built and no moves generated.
+
+        """
+        squares = parse_placement(placement)
+        if squares.count("K") != 1 or squares.count("k") != 1:
+            raise ValueError(f"Both sides need exactly one king: {placement}")
+        if active_player not in ("w", "b"):
+            raise ValueError(f"Invalid active player: {active_player}")
+        if castling_availability != "-" and castling_availability.strip("KQkq"):
+            raise ValueError(f"Invalid castling availability: {castling_availability}")
+        if en_passant_target_square != "-" and en_passant_target_square not in COORDINATES:
+            raise ValueError(f"Invalid en passant target square: {en_passant_target_square}")
+
+        alliance = Alliance.WHITE if active_player == "w" else Alliance.BLACK
+        try:
+            key = compute_key(squares, alliance, castling_availability, en_passant_target_square)
+        except KeyError as error:
+            raise ValueError(f"Invalid piece placement: {placement}") from error
+
+        return cls(
+            squares.encode("ascii"),
+            alliance,
+            castling_availability,
+            en_passant_target_square,
+            halfmove_clock,
+            fullmove_number,
+            key,
+        )
+
+    def to_board(self) -> Board:
+        return Board.from_squares(
+            self.squares.decode("ascii"),
+            self.active_player,
+            self.castling_availability,
+            self.en_passant_target_square,
+            self.halfmove_clock,
+            self.fullmove_number,
+            self.key,
+        )
+
+    def to_fen(self) -> str:
+        return " ".join(
+            (
+                format_placement(self.squares.decode("ascii")),
+                self.active_player.to_fen(),
+                self.castling_availability,
+                self.en_passant_target_square,
+                str(self.halfmove_clock),
+                str(self.fullmove_number),
+            )
+        )
+
+
+class GameHistory:
+    """
+    Every position of a game, stored as one keyframe Position per KEYFRAME_INTERVAL
+    plies plus the packed moves. history[ply] replays at most KEYFRAME_INTERVAL - 1
+    moves from a keyframe, and stepping through plies in order reuses the board of the
+    previous lookup, so it replays a single move.
+
+    """
+
+    def __init__(self, start: Position, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        self.keyframe_interval = keyframe_interval
+        self.keyframes: list[Position] = [start]
+        self.moves = array("I")
+
+        # Board and ply of the last lookup.
+        self._board: Board | None = None
+        self._ply = -1
+
+    @classmethod
+    def from_board(cls, board: Board, keyframe_interval: int = KEYFRAME_INTERVAL) -> GameHistory:
+        return cls(Position.from_board(board), keyframe_interval)
+
+    def __len__(self) -> int:
+        return len(self.moves) + 1
+
+    def __getitem__(self, ply: int) -> Position:
+        if ply < 0:
+            ply += len(self)
+        if not 0 <= ply < len(self):
+            raise IndexError("Ply out of range.")
+
+        if ply % self.keyframe_interval == 0:
+            return self.keyframes[ply // self.keyframe_interval]
+
+        return Position.from_board(self._get_board(ply))
+
+    def __iter__(self):
+        for ply in range(len(self)):
+            yield self[ply]
+
+    def append(self, move: Move | int) -> None:
+        """
+        Add the move played in the last position. It is replayed right away when the
+        next position is due to become a keyframe, which also checks it is legal there.
+
+        """
+        packed_move = move.pack() if isinstance(move, Move) else move
+        self.moves.append(packed_move)
+
+        ply = len(self.moves)
+        if ply % self.keyframe_interval == 0:
+            self.keyframes.append(Position.from_board(self._get_board(ply)))
+
+    def truncate(self, length: int) -> None:
+        """
+        Drop every position from index length on, e.g. when a move is played from an
+        earlier position.
+
+        """
+        length = max(length, 1)
+        del self.moves[length - 1 :]
+        del self.keyframes[(length - 1) // self.keyframe_interval + 1 :]
+        if self._ply >= length:
+            self._board, self._ply = None, -1
+
+    def get_move(self, ply: int) -> int:
+        """
+        Packed move played in position ply.
+
+        """
+        return self.moves[ply]
+
+    def _get_board(self, ply: int) -> Board:
+        # While a keyframe is being appended the one for ply does not exist yet.
+        keyframe_index = min(ply // self.keyframe_interval, len(self.keyframes) - 1)
+        keyframe_ply = keyframe_index * self.keyframe_interval
+        if self._board is None or not keyframe_ply <= self._ply <= ply:
+            self._board = self.keyframes[keyframe_index].to_board()
+            self._ply = keyframe_ply
+
+        board = self._board
+        while self._ply < ply:
+            board.make_packed_move(self.moves[self._ply])
+            self._ply += 1
+
+        return board
@@ -0,0 +1,154 @@
+"""
+Material and piece-square values for the middlegame and the endgame.
+
+MIDDLEGAME_SCORES and ENDGAME_SCORES hold the value of a piece on a square from
+white's point of view, material included, indexed by abbreviation and square like
+zobrist.PIECE_KEYS, so Board can keep running sums while pieces move. The two sums
+are blended by the game phase, the sum of PHASES over the pieces on the board.
+
+"""
+from __future__ import annotations
+
+PIECE_TYPES = "pnbrqk"
+
+MIDDLEGAME_VALUES = {"p": 100, "n": 320, "b": 330, "r": 500, "q": 900, "k": 0}
+ENDGAME_VALUES = {"p": 120, "n": 300, "b": 330, "r": 520, "q": 920, "k": 0}
+
+PHASE_WEIGHTS = {"p": 0, "n": 1, "b": 1, "r": 2, "q": 4, "k": 0}
+MAX_PHASE = 24
+
+# Bonuses for white pieces in board order, a8 first; black uses the mirrored square.
+# fmt: off
+PAWN_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+PAWN_ENDGAME_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     15,  15,  15,  15,  15,  15,  15,  15,
+      5,   5,   5,   5,   5,   5,   5,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+KNIGHT_TABLE = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+BISHOP_TABLE = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+ROOK_TABLE = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+)
+QUEEN_TABLE = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+KING_TABLE = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+)
+KING_ENDGAME_TABLE = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+# fmt: on
+
+MIDDLEGAME_TABLES = {
+    "p": PAWN_TABLE,
+    "n": KNIGHT_TABLE,
+    "b": BISHOP_TABLE,
+    "r": ROOK_TABLE,
+    "q": QUEEN_TABLE,
+    "k": KING_TABLE,
+}
+ENDGAME_TABLES = {**MIDDLEGAME_TABLES, "p": PAWN_ENDGAME_TABLE, "k": KING_ENDGAME_TABLE}
+
+
+def _build_scores(
+    values: dict[str, int], tables: dict[str, tuple[int, ...]]
+) -> dict[str, list[int]]:
+    # Material plus table bonus per abbreviation and square, negative for black.
+    scores = {}
+    for piece_type in PIECE_TYPES:
+        value, table = values[piece_type], tables[piece_type]
+        scores[piece_type.upper()] = [value + table[square] for square in range(64)]
+        scores[piece_type] = [-value - table[square ^ 56] for square in range(64)]
+    return scores
+
+
+MIDDLEGAME_SCORES = _build_scores(MIDDLEGAME_VALUES, MIDDLEGAME_TABLES)
+ENDGAME_SCORES = _build_scores(ENDGAME_VALUES, ENDGAME_TABLES)
+PHASES = {
+    **PHASE_WEIGHTS,
+    **{piece_type.upper(): weight for piece_type, weight in PHASE_WEIGHTS.items()},
+}
+
+
+def taper(middlegame: int, endgame: int, phase: int) -> int:
+    phase = min(phase, MAX_PHASE)
+    score = middlegame * phase + endgame * (MAX_PHASE - phase)
+    # Round towards zero so that colour flipped positions get opposite scores.
+    return score // MAX_PHASE if score >= 0 else -(-score // MAX_PHASE)
+
+
+def compute_scores(squares: str) -> tuple[int, int, int]:
+    """
+    Middlegame score, endgame score and phase of 64 piece letters in board order,
+    "." for empty squares.
+
+    """
+    middlegame = endgame = phase = 0
+    for square, abbreviation in enumerate(squares):
+        if abbreviation != ".":
+            middlegame += MIDDLEGAME_SCORES[abbreviation][square]
+            endgame += ENDGAME_SCORES[abbreviation][square]
+            phase += PHASES[abbreviation]
+    return middlegame, endgame, phase
@@ -0,0 +1,486 @@
+"""
+Negamax alpha-beta search with iterative deepening.
+
+Away from the principal variation the search is selective: razoring drops to the
+quiescence search when the static evaluation is far below alpha, null move pruning
+lets the opponent move twice and cuts off when that still fails high, futility
+pruning skips quiet moves near the leaves that cannot raise alpha, and late move
+reductions search quiet moves late in the ordering less deeply. SearchOptions turns
+each of them off, and Search.counters tells how often each one fired.
+
+Usage:
+    python -m chess.engine.search "<fen>" [--depth N] [--time SECONDS] [--nodes N]
+    python -m chess.engine.search --bench --depth N [--no-null-move] [--no-reductions]
+        [--no-futility] [--no-razoring]
+
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, NamedTuple
+
+from chess.engine.board import CAPTURES, MAX_MOVES, PROMOTIONS, Board
+from chess.engine.evaluation import evaluate
+from chess.engine.move import Move
+from chess.engine.ordering import MoveOrdering, is_losing_capture, is_quiet
+from chess.engine.perft import FEN_EXAMPLES
+from chess.engine.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+INFINITY = 1_000_000
+MATE_SCORE = 100_000
+# Scores beyond this are mates, counted in plies from the root.
+MATE_THRESHOLD = MATE_SCORE - 1_000
+MAX_DEPTH = 64
+
+ASPIRATION_WINDOW = 50
+ASPIRATION_MIN_DEPTH = 4
+# Time and stop requests are checked once per this many nodes.
+CHECK_INTERVAL = 1024
+
+NULL_MOVE_MIN_DEPTH = 3
+# Depth reduction of the null move search, the larger one above NULL_MOVE_DEEP_DEPTH.
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_DEEP_REDUCTION = 3
+NULL_MOVE_DEEP_DEPTH = 6
+
+LMR_MIN_DEPTH = 3
+# Moves searched at full depth before later quiet moves are reduced.
+LMR_FULL_DEPTH_MOVES = 3
+# Moves after which the reduction grows by one ply.
+LMR_DEEP_MOVES = 6
+
+# Margins in centipawns by remaining depth; the techniques apply below the length.
+FUTILITY_MARGINS = (0, 200, 400)
+RAZOR_MARGINS = (0, 300, 500, 900)
+
+COUNTER_NAMES = (
+    "null_move_searches",
+    "null_move_cutoffs",
+    "reductions",
+    "re_searches",
+    "futility_pruned",
+    "razoring_cutoffs",
+)
+
+
+class SearchStopped(Exception):
+    pass
+
+
+class SearchOptions(NamedTuple):
+    null_move: bool = True
+    late_move_reductions: bool = True
+    futility_pruning: bool = True
+    razoring: bool = True
+
+
+class SearchResult(NamedTuple):
+    best_move: Move | None
+    score: int
+    depth: int
+    principal_variation: list[Move]
+    nodes: int
+    seconds: float
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+
+def score_to_table(score: int, ply: int) -> int:
+    # Mate scores are stored relative to the node so they stay valid when the same
+    # position is reached at a different distance from the root.
+    if score > MATE_THRESHOLD:
+        return score + ply
+    if score < -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    if score > MATE_THRESHOLD:
+        return score - ply
+    if score < -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+class Search:
+    def __init__(
+        self,
+        board: Board,
+        table: TranspositionTable | None = None,
+        options: SearchOptions | None = None,
+    ) -> None:
+        self.board = board
+        self.table = table if table is not None else TranspositionTable()
+        self.ordering = MoveOrdering()
+        self.options = options if options is not None else SearchOptions()
+
+        self.nodes = 0
+        # How often each selective technique fired in the last search, by COUNTER_NAMES.
+        self.counters = dict.fromkeys(COUNTER_NAMES, 0)
+        self.node_limit: int | None = None
+        self.deadline: float | None = None
+        self.stop_event = threading.Event()
+
+        self.principal_variations: list[list[Move]] = [[] for _ in range(MAX_DEPTH + 1)]
+        # Packed moves of every node on the current path, MAX_MOVES per ply like perft.
+        self.buffer = array("I", bytes(MAX_DEPTH * MAX_MOVES * 4))
+
+    def stop(self) -> None:
+        """
+        Ask a running search to finish; it returns the result of the last completed
+        iteration. Safe to call from another thread.
+
+        """
+        self.stop_event.set()
+
+    def search(
+        self,
+        max_depth: int = MAX_DEPTH,
+        time_limit: float | None = None,
+        node_limit: int | None = None,
+        on_iteration: Callable[[SearchResult], None] | None = None,
+    ) -> SearchResult:
+        self.stop_event.clear()
+        self.nodes = 0
+        self.counters = dict.fromkeys(COUNTER_NAMES, 0)
+        self.node_limit = node_limit
+        self.ordering.age()
+        start = time.perf_counter()
+        self.deadline = start + time_limit if time_limit is not None else None
+
+        root_length = len(self.board.history)
+        result = SearchResult(None, 0, 0, [], 0, 0.0)
+
+        # Always have something to play, even if the first iteration is interrupted.
+        legal_moves = self.board.generate_legal_moves()
+        if legal_moves:
+            result = result._replace(best_move=legal_moves[0], principal_variation=legal_moves[:1])
+
+        score = 0
+        for depth in range(1, min(max_depth, MAX_DEPTH) + 1):
+            try:
+                score = self.aspiration_search(depth, score)
+            except SearchStopped:
+                while len(self.board.history) > root_length:
+                    if self.board.history[-1].move is None:
+                        self.board.unmake_null_move()
+                    else:
+                        self.board.unmake_move()
+                break
+
+            principal_variation = list(self.principal_variations[0])
+            result = SearchResult(
+                principal_variation[0] if principal_variation else result.best_move,
+                score,
+                depth,
+                principal_variation,
+                self.nodes,
+                time.perf_counter() - start,
+            )
+            if on_iteration is not None:
+                on_iteration(result)
+
+            if abs(score) > MATE_THRESHOLD or not legal_moves:
+                break
+
+        return result._replace(nodes=self.nodes, seconds=time.perf_counter() - start)
+
+    def aspiration_search(self, depth: int, previous_score: int) -> int:
+        if depth < ASPIRATION_MIN_DEPTH or abs(previous_score) > MATE_THRESHOLD:
+            return self.negamax(depth, -INFINITY, INFINITY, 0)
+
+        delta = ASPIRATION_WINDOW
+        alpha, beta = previous_score - delta, previous_score + delta
+        while True:
+            score = self.negamax(depth, alpha, beta, 0)
+            if score <= alpha:
+                alpha = max(alpha - delta, -INFINITY)
+            elif score >= beta:
+                beta = min(beta + delta, INFINITY)
+            else:
+                return score
+            delta *= 2
+
+    def check_limits(self) -> None:
+        if self.stop_event.is_set():
+            raise SearchStopped
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchStopped
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchStopped
+
+    def is_in_check(self) -> bool:
+        return self.board.is_checked(self.board.active_player)
+
+    def negamax(
+        self, depth: int, alpha: int, beta: int, ply: int, null_move_allowed: bool = True
+    ) -> int:
+        self.principal_variations[ply] = []
+        if depth <= 0 or ply >= MAX_DEPTH:
+            return self.quiescence(alpha, beta, ply)
+
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self.check_limits()
+
+        board = self.board
+        # One repetition is enough inside the tree: whatever was played from the
+        # first occurrence can be played again.
+        if ply > 0 and (board.halfmove_clock >= 100 or board.count_repetitions()):
+            return 0
+
+        key = board.zobrist_key
+        original_alpha = alpha
+        table_move = 0
+
+        entry = self.table.probe(key)
+        if entry is not None:
+            table_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                score = score_from_table(entry.score, ply)
+                if (
+                    entry.bound == EXACT
+                    or entry.bound == LOWER_BOUND and score >= beta
+                    or entry.bound == UPPER_BOUND and score <= alpha
+                ):
+                    return score
+
+        options = self.options
+        counters = self.counters
+        in_check = self.is_in_check()
+        is_futile = False
+
+        # Only null window nodes are pruned, the principal variation is searched fully.
+        if ply > 0 and not in_check and beta - alpha == 1:
+            static_score = evaluate(board, mobility=False)
+
+            if (
+                options.razoring
+                and depth < len(RAZOR_MARGINS)
+                and static_score + RAZOR_MARGINS[depth] <= alpha
+            ):
+                score = self.quiescence(alpha, beta, ply)
+                if score <= alpha:
+                    counters["razoring_cutoffs"] += 1
+                    return score
+
+            if (
+                options.null_move
+                and null_move_allowed
+                and depth >= NULL_MOVE_MIN_DEPTH
+                and static_score >= beta
+                and board.has_non_pawn_material(board.active_player)
+            ):
+                if depth > NULL_MOVE_DEEP_DEPTH:
+                    reduction = NULL_MOVE_DEEP_REDUCTION
+                else:
+                    reduction = NULL_MOVE_REDUCTION
+                counters["null_move_searches"] += 1
+                board.make_null_move()
+                score = -self.negamax(depth - 1 - reduction, -beta, -beta + 1, ply + 1, False)
+                board.unmake_null_move()
+                if score >= beta:
+                    counters["null_move_cutoffs"] += 1
+                    # A mate found after passing is not a proven mate.
+                    return beta if score > MATE_THRESHOLD else score
+
+            is_futile = (
+                options.futility_pruning
+                and depth < len(FUTILITY_MARGINS)
+                and abs(alpha) < MATE_THRESHOLD
+                and static_score + FUTILITY_MARGINS[depth] <= alpha
+            )
+
+        best_score = -INFINITY
+        best_move = None
+        quiets_tried = []
+        moves_searched = 0
+        for move in self.ordering.staged_moves(
+            board, ply, table_move, self.buffer, ply * MAX_MOVES
+        ):
+            board.make_move(move)
+            quiet = is_quiet(move)
+            gives_check = quiet and board.is_checked(board.active_player)
+
+            if is_futile and quiet and moves_searched and not gives_check:
+                board.unmake_move()
+                counters["futility_pruned"] += 1
+                continue
+
+            # Principal variation search: the first move gets the full window, the
+            # others a null window that only proves them worse, re-searched when not.
+            if not moves_searched:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            else:
+                reduction = 0
+                if (
+                    options.late_move_reductions
+                    and depth >= LMR_MIN_DEPTH
+                    and moves_searched >= LMR_FULL_DEPTH_MOVES
+                    and quiet
+                    and not in_check
+                    and not gives_check
+                ):
+                    reduction = 1
+                    if moves_searched >= LMR_DEEP_MOVES and depth > LMR_MIN_DEPTH:
+                        reduction = 2
+                    counters["reductions"] += 1
+
+                score = -self.negamax(depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+                if reduction and score > alpha:
+                    counters["re_searches"] += 1
+                    score = -self.negamax(depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            moves_searched += 1
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+
+            if score > alpha:
+                alpha = score
+                self.principal_variations[ply] = [move] + self.principal_variations[ply + 1]
+
+            if alpha >= beta:
+                self.ordering.update(move, depth, ply, quiets_tried)
+                break
+
+            if quiet:
+                quiets_tried.append(move)
+
+        if best_move is None:
+            return -MATE_SCORE + ply if in_check else 0
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.store(key, depth, bound, score_to_table(best_score, ply), best_move.pack())
+
+        return best_score
+
+    def quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self.check_limits()
+
+        stand_pat = evaluate(self.board, mobility=False)
+        if stand_pat >= beta or ply >= MAX_DEPTH:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        board = self.board
+        start = ply * MAX_MOVES
+        end = board.generate_moves(self.buffer, start, CAPTURES | PROMOTIONS)
+        moves = [board.create_move(packed_move) for packed_move in self.buffer[start:end]]
+        for move in self.ordering.order_captures(moves):
+            if is_losing_capture(board, move):
+                continue
+
+            board.make_move(move)
+            score = -self.quiescence(-beta, -alpha, ply + 1)
+            board.unmake_move()
+
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+
+        return alpha
+
+
+def run_benchmark(depth: int, options: SearchOptions | None = None) -> list[dict]:
+    """
+    Search every position of FEN_EXAMPLES to depth with a fresh table and return
+    the nodes, time and selectivity counters of each search.
+
+    """
+    results = []
+    for example in FEN_EXAMPLES:
+        search = Search(Board(example["fen"]), options=options)
+        result = search.search(depth)
+        results.append(
+            {
+                "fen": example["fen"],
+                "best_move": result.best_move.to_uci() if result.best_move else None,
+                "score": result.score,
+                "nodes": result.nodes,
+                "seconds": result.seconds,
+                **search.counters,
+            }
+        )
+    return results
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m chess.engine.search")
+    parser.add_argument("fen", nargs="?")
+    parser.add_argument("--depth", type=int, default=MAX_DEPTH)
+    parser.add_argument("--time", type=float, help="time limit in seconds")
+    parser.add_argument("--nodes", type=int, help="node limit")
+    parser.add_argument("--hash", type=int, default=16, help="table size in megabytes")
+    parser.add_argument("--bench", action="store_true", help="search the perft positions")
+    parser.add_argument("--no-null-move", action="store_true")
+    parser.add_argument("--no-reductions", action="store_true")
+    parser.add_argument("--no-futility", action="store_true")
+    parser.add_argument("--no-razoring", action="store_true")
+    options = parser.parse_args(arguments)
+
+    search_options = SearchOptions(
+        null_move=not options.no_null_move,
+        late_move_reductions=not options.no_reductions,
+        futility_pruning=not options.no_futility,
+        razoring=not options.no_razoring,
+    )
+
+    if options.bench:
+        if options.depth == MAX_DEPTH:
+            parser.error("--bench needs --depth")
+        results = run_benchmark(options.depth, search_options)
+        for result in results:
+            print(
+                f"{result['nodes']:>9} {result['seconds']:7.2f}s {result['best_move']} "
+                f"{result['fen']}"
+            )
+        print(f"Nodes: {sum(result['nodes'] for result in results)}")
+        print(f"Time: {sum(result['seconds'] for result in results):.2f}s")
+        for name in COUNTER_NAMES:
+            print(f"{name}: {sum(result[name] for result in results)}")
+        return 0
+
+    if options.fen is None:
+        parser.error("give a FEN or --bench")
+    if options.depth == MAX_DEPTH and options.time is None and options.nodes is None:
+        parser.error("give at least one of --depth, --time or --nodes")
+
+    def report(result: SearchResult) -> None:
+        print(
+            f"depth {result.depth} score {result.score} nodes {result.nodes} "
+            f"nps {result.nps:.0f} pv {' '.join(move.to_uci() for move in result.principal_variation)}"
+        )
+
+    search = Search(
+        Board(options.fen), TranspositionTable(options.hash * 1024 * 1024), search_options
+    )
+    result = search.search(options.depth, options.time, options.nodes, report)
+    print(f"bestmove {result.best_move.to_uci() if result.best_move else '(none)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
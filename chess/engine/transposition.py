@@ -0,0 +1,141 @@
+"""
+Transposition table with a fixed memory budget.
+
+Entries live in parallel typed arrays instead of a dict of objects. The table is split
+into buckets of two slots: the first slot keeps the deepest result seen for its
+bucket, the second slot is always overwritten.
+
+"""
+from __future__ import annotations
+
+from array import array
+from typing import NamedTuple
+
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+SLOTS_PER_BUCKET = 2
+DEFAULT_SIZE = 16 * 1024 * 1024
+
+_MOVE_SHIFT = 10
+_DEPTH_SHIFT = 2
+_BOUND_MASK = 0b11
+_DEPTH_MASK = 0xFF
+
+
+class TranspositionEntry(NamedTuple):
+    key: int
+    depth: int
+    bound: int
+    score: int
+    move: int
+
+
+class TranspositionTable:
+    def __init__(self, size_in_bytes: int = DEFAULT_SIZE) -> None:
+        self.size_in_bytes = size_in_bytes
+
+        self.keys = array("Q")
+        self.scores = array("q")
+        # bound (2 bits) | depth (8 bits) | packed move (22 bits), zero marks an empty slot.
+        self.info = array("I")
+        self.bucket_mask = 0
+
+        self.probes = self.hits = self.misses = self.collisions = 0
+        self.stores = self.overwrites = 0
+
+        self.resize(size_in_bytes)
+
+    @classmethod
+    def entry_size(cls) -> int:
+        return array("Q").itemsize + array("q").itemsize + array("I").itemsize
+
+    def resize(self, size_in_bytes: int) -> None:
+        bucket_size = self.entry_size() * SLOTS_PER_BUCKET
+        bucket_count = 1
+        # A power of two bucket count turns the index computation into a mask.
+        while bucket_count * 2 * bucket_size <= size_in_bytes:
+            bucket_count *= 2
+
+        slots = bucket_count * SLOTS_PER_BUCKET
+        self.size_in_bytes = size_in_bytes
+        self.bucket_mask = bucket_count - 1
+        self.keys = array("Q", bytes(slots * self.keys.itemsize))
+        self.scores = array("q", bytes(slots * self.scores.itemsize))
+        self.info = array("I", bytes(slots * self.info.itemsize))
+        self.reset_statistics()
+
+    def clear(self) -> None:
+        self.resize(self.size_in_bytes)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def probe(self, key: int) -> TranspositionEntry | None:
+        self.probes += 1
+        slot = (key & self.bucket_mask) * SLOTS_PER_BUCKET
+        occupied = False
+
+        for index in (slot, slot + 1):
+            info = self.info[index]
+            if not info:
+                continue
+            if self.keys[index] == key:
+                self.hits += 1
+                return TranspositionEntry(
+                    key,
+                    info >> _DEPTH_SHIFT & _DEPTH_MASK,
+                    info & _BOUND_MASK,
+                    self.scores[index],
+                    info >> _MOVE_SHIFT,
+                )
+            occupied = True
+
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int = 0) -> None:
+        slot = (key & self.bucket_mask) * SLOTS_PER_BUCKET
+        info = self.info[slot]
+
+        # Depth preferred slot: take it when it is free, holds the same position or is
+        # not deeper than the new result; otherwise fall back to the always slot.
+        if info and self.keys[slot] != key and (info >> _DEPTH_SHIFT & _DEPTH_MASK) > depth:
+            slot += 1
+            info = self.info[slot]
+
+        if info and self.keys[slot] != key:
+            self.overwrites += 1
+        elif info and not move:
+            # Keep the best move of an earlier search of the same position.
+            move = info >> _MOVE_SHIFT
+
+        self.stores += 1
+        self.keys[slot] = key
+        self.scores[slot] = score
+        self.info[slot] = bound | min(depth, _DEPTH_MASK) << _DEPTH_SHIFT | move << _MOVE_SHIFT
+
+    def reset_statistics(self) -> None:
+        self.probes = self.hits = self.misses = self.collisions = 0
+        self.stores = self.overwrites = 0
+
+    def get_statistics(self) -> dict[str, int | float]:
+        return {
+            "size_in_bytes": len(self) * self.entry_size(),
+            "entries": len(self),
+            "probes": self.probes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "fill": self.get_fill(),
+        }
+
+    def get_fill(self, sample_size: int = 1000) -> float:
+        sample = self.info[:sample_size]
+        return sum(1 for info in sample if info) / len(sample)
@@ -0,0 +1,74 @@
+"""
+64 bit Zobrist keys for board positions.
+
+A position's key is the XOR of one random number per (piece, square), one for black
+to move, one per castling right and one per en passant file. Board keeps its key up
+to date incrementally, compute_hash rebuilds it from scratch.
+
+"""
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from chess.engine.alliance import Alliance
+
+if TYPE_CHECKING:
+    from chess.engine.board import Board
+
+# A fixed seed keeps keys stable between runs, so stored hashes stay comparable.
+_random = random.Random(0x5A0B1157)
+
+PIECE_KEYS: dict[str, list[int]] = {
+    abbreviation: [_random.getrandbits(64) for _ in range(64)]
+    for abbreviation in "kqrbnpKQRBNP"
+}
+SIDE_KEY = _random.getrandbits(64)
+CASTLING_KEYS: dict[str, int] = {right: _random.getrandbits(64) for right in "KQkq"}
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+
+
+def get_castling_key(castling_availability: str) -> int:
+    key = 0
+    for right in castling_availability:
+        key ^= CASTLING_KEYS.get(right, 0)
+    return key
+
+
+def get_en_passant_key(en_passant_target_square: str | None) -> int:
+    if en_passant_target_square in (None, "-"):
+        return 0
+    return EN_PASSANT_KEYS[ord(en_passant_target_square[0]) - ord("a")]
+
+
+def compute_hash(board: Board) -> int:
+    return compute_key(
+        board.get_squares(),
+        board.active_player,
+        board.castling_availability,
+        board.en_passant_target_square,
+    )
+
+
+def compute_key(
+    squares: str,
+    active_player: Alliance,
+    castling_availability: str,
+    en_passant_target_square: str | None,
+) -> int:
+    """
+    Key of a position given as 64 piece letters in board order, "." for empty squares.
+
+    """
+    key = 0
+    for position, abbreviation in enumerate(squares):
+        if abbreviation != ".":
+            key ^= PIECE_KEYS[abbreviation][position]
+
+    if active_player == Alliance.BLACK:
+        key ^= SIDE_KEY
+
+    key ^= get_castling_key(castling_availability)
+    key ^= get_en_passant_key(en_passant_target_square)
+
+    return key
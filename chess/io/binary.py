@@ -0,0 +1,188 @@
+"""
+Fixed-size binary encoding of positions and a packed file format for large sets.
+
+Every position takes RECORD.size (32) bytes, little endian:
+
+    occupancy        8  bit i is set when square i (0 = a8, 63 = h1) holds a piece
+    pieces          16  one nibble per occupied square in square order, low nibble
+                        first, PIECE_CODES gives the piece of each code
+    flags            1  bit 0 black to move, bits 1-4 castling rights K, Q, k, q
+    en_passant       1  en passant target square, NO_SQUARE when there is none
+    halfmove_clock   2
+    fullmove_number  2
+    reserved         2
+
+A position file is a FILE_HEADER followed by the records back to back, so NumPy can
+map it as a structured array of POSITION_FIELDS without copying; NumPy is only needed
+for load_positions.
+
+"""
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from chess.engine.alliance import Alliance
+from chess.engine.board import COORDINATES, Board
+from chess.engine.position import Position
+from chess.engine.zobrist import compute_key
+
+if TYPE_CHECKING:
+    import numpy
+
+PIECE_CODES = "PNBRQKpnbrqk"
+CASTLING_RIGHTS = "KQkq"
+NO_SQUARE = 0xFF
+MAX_PIECES = 32
+
+RECORD = struct.Struct("<Q16sBBHH2x")
+MAGIC = b"CHESSPOS"
+VERSION = 1
+# magic, version, record size
+FILE_HEADER = struct.Struct("<8sII")
+
+POSITION_FIELDS = [
+    ("occupancy", "<u8"),
+    ("pieces", "u1", (16,)),
+    ("flags", "u1"),
+    ("en_passant", "u1"),
+    ("halfmove_clock", "<u2"),
+    ("fullmove_number", "<u2"),
+    ("reserved", "u1", (2,)),
+]
+
+_CODES = {abbreviation: code for code, abbreviation in enumerate(PIECE_CODES)}
+
+
+def encode_position(position: Position) -> bytes:
+    """
+    RECORD.size bytes for a position. Raises ValueError for more than MAX_PIECES
+    pieces; the halfmove clock and fullmove number have to fit in 16 bits.
+
+    """
+    occupancy = 0
+    nibbles = 0
+    count = 0
+    for square, abbreviation in enumerate(position.squares.decode("ascii")):
+        if abbreviation == ".":
+            continue
+        occupancy |= 1 << square
+        nibbles |= _CODES[abbreviation] << 4 * count
+        count += 1
+
+    if count > MAX_PIECES:
+        raise ValueError(f"A position can have at most {MAX_PIECES} pieces.")
+
+    flags = 1 if position.active_player == Alliance.BLACK else 0
+    for bit, right in enumerate(CASTLING_RIGHTS):
+        if right in position.castling_availability:
+            flags |= 2 << bit
+
+    en_passant = position.en_passant_target_square
+    return RECORD.pack(
+        occupancy,
+        nibbles.to_bytes(16, "little"),
+        flags,
+        NO_SQUARE if en_passant == "-" else COORDINATES.index(en_passant),
+        position.halfmove_clock,
+        position.fullmove_number,
+    )
+
+
+def decode_position(data: bytes, offset: int = 0) -> Position:
+    occupancy, pieces, flags, en_passant, halfmove_clock, fullmove_number = RECORD.unpack_from(
+        data, offset
+    )
+
+    squares = ["."] * 64
+    nibbles = int.from_bytes(pieces, "little")
+    while occupancy:
+        square = (occupancy & -occupancy).bit_length() - 1
+        squares[square] = PIECE_CODES[nibbles & 0xF]
+        nibbles >>= 4
+        occupancy &= occupancy - 1
+    squares = "".join(squares)
+
+    active_player = Alliance.BLACK if flags & 1 else Alliance.WHITE
+    castling_availability = "".join(
+        right for bit, right in enumerate(CASTLING_RIGHTS) if flags & 2 << bit
+    ) or "-"
+    en_passant_target_square = "-" if en_passant == NO_SQUARE else COORDINATES[en_passant]
+
+    return Position(
+        squares.encode("ascii"),
+        active_player,
+        castling_availability,
+        en_passant_target_square,
+        halfmove_clock,
+        fullmove_number,
+        compute_key(squares, active_player, castling_availability, en_passant_target_square),
+    )
+
+
+def encode_board(board: Board) -> bytes:
+    return encode_position(Position.from_board(board))
+
+
+def decode_board(data: bytes, offset: int = 0) -> Board:
+    return decode_position(data, offset).to_board()
+
+
+def write_positions(path: str | Path, positions: Iterable[Position | Board]) -> int:
+    """
+    Write a position file and return the number of positions in it.
+
+    """
+    count = 0
+    with open(path, "wb") as stream:
+        stream.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD.size))
+        for position in positions:
+            if isinstance(position, Board):
+                position = Position.from_board(position)
+            stream.write(encode_position(position))
+            count += 1
+    return count
+
+
+def _read_header(stream) -> None:
+    header = stream.read(FILE_HEADER.size)
+    if len(header) != FILE_HEADER.size or FILE_HEADER.unpack(header) != (
+        MAGIC,
+        VERSION,
+        RECORD.size,
+    ):
+        raise ValueError(f"Not a position file: {stream.name}")
+
+
+def read_positions(path: str | Path) -> Iterator[Position]:
+    with open(path, "rb") as stream:
+        _read_header(stream)
+        while record := stream.read(RECORD.size):
+            if len(record) != RECORD.size:
+                raise ValueError(f"Truncated position file: {path}")
+            yield decode_position(record)
+
+
+def load_positions(path: str | Path, mode: str = "r") -> numpy.memmap:
+    """
+    Map a position file as a NumPy structured array of POSITION_FIELDS. Nothing is
+    copied; rows decode with decode_position(array[index].tobytes()).
+
+    """
+    import numpy
+
+    with open(path, "rb") as stream:
+        _read_header(stream)
+        if not stream.read(1):
+            # An empty map is not allowed.
+            return numpy.zeros(0, dtype=get_position_dtype())
+    return numpy.memmap(path, dtype=get_position_dtype(), mode=mode, offset=FILE_HEADER.size)
+
+
+def get_position_dtype() -> numpy.dtype:
+    import numpy
+
+    dtype = numpy.dtype(POSITION_FIELDS)
+    assert dtype.itemsize == RECORD.size
+    return dtype
@@ -0,0 +1,137 @@
+"""
+Fast FEN and EPD (Extended Position Description) parsing and formatting.
+
+Everything here works on Position snapshots, so no Piece objects are built and no
+moves are generated; Position.to_board turns a result into a playable board when
+one is needed. The batch functions take any iterable of lines, such as an open
+file, and skip blank lines.
+
+An EPD line has the first four FEN fields followed by operations, each an opcode,
+its operands and a semicolon:
+
+    r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - bm Bb5 Bc4; id "test.1";
+
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+from chess.engine.position import Position
+
+# Opcodes whose operands are strings, always written in quotes.
+STRING_OPCODES = ("id", *(f"c{digit}" for digit in range(10)))
+
+OPERATION_PATTERN = re.compile(r'\s*([A-Za-z]\w*)((?:\s+(?:"[^"]*"|[^\s;"]+))*)\s*;')
+OPERAND_PATTERN = re.compile(r'"([^"]*)"|([^\s;"]+)')
+
+
+class EpdRecord(NamedTuple):
+    position: Position
+    # Operands by opcode in the order they appear, string operands without quotes.
+    operations: dict[str, tuple[str, ...]]
+
+    @property
+    def best_moves(self) -> tuple[str, ...]:
+        return self.operations.get("bm", ())
+
+    @property
+    def avoid_moves(self) -> tuple[str, ...]:
+        return self.operations.get("am", ())
+
+    @property
+    def id(self) -> str | None:
+        return self.operations.get("id", (None,))[0]
+
+    @property
+    def comment(self) -> str | None:
+        return self.operations.get("c0", (None,))[0]
+
+
+def parse_fen(fen_string: str) -> Position:
+    return Position.from_fen(fen_string)
+
+
+def format_fen(position: Position) -> str:
+    return position.to_fen()
+
+
+def parse_epd(line: str) -> EpdRecord:
+    """
+    Parse an EPD line. Missing clocks default to 0 and 1 unless the hmvc and fmvn
+    opcodes give them. Raises ValueError for invalid fields or operations.
+
+    """
+    fields = line.split(maxsplit=4)
+    if len(fields) < 4:
+        raise ValueError(f"Invalid EPD line: {line}")
+
+    operations = parse_operations(fields[4] if len(fields) == 5 else "")
+    try:
+        halfmove_clock = int(operations.get("hmvc", ("0",))[0])
+        fullmove_number = int(operations.get("fmvn", ("1",))[0])
+    except ValueError as error:
+        raise ValueError(f"Invalid clock operand: {line}") from error
+
+    position = Position.from_fields(*fields[:4], halfmove_clock, fullmove_number)
+    return EpdRecord(position, operations)
+
+
+def parse_operations(text: str) -> dict[str, tuple[str, ...]]:
+    operations = {}
+    end = 0
+    for match in OPERATION_PATTERN.finditer(text):
+        if match.start() != end:
+            break
+        operands = OPERAND_PATTERN.findall(match.group(2))
+        operations[match.group(1)] = tuple(quoted or bare for quoted, bare in operands)
+        end = match.end()
+
+    if text[end:].strip():
+        raise ValueError(f"Invalid EPD operations: {text}")
+    return operations
+
+
+def format_epd(record: EpdRecord) -> str:
+    """
+    EPD line of a record. Clocks are written as hmvc and fmvn operations only when
+    the record has them, so parse_epd(format_epd(record)) == record.
+
+    """
+    position = record.position
+    fields = position.to_fen().split()[:4]
+
+    for opcode, operands in record.operations.items():
+        formatted = [
+            f'"{operand}"' if opcode in STRING_OPCODES or _needs_quotes(operand) else operand
+            for operand in operands
+        ]
+        fields.append(" ".join((opcode, *formatted)) + ";")
+
+    return " ".join(fields)
+
+
+def _needs_quotes(operand: str) -> bool:
+    return not operand or any(character in operand for character in ' ;"')
+
+
+def parse_fens(lines: Iterable[str]) -> Iterator[Position]:
+    for line in lines:
+        if line.strip():
+            yield Position.from_fen(line)
+
+
+def format_fens(positions: Iterable[Position]) -> Iterator[str]:
+    for position in positions:
+        yield position.to_fen()
+
+
+def parse_epds(lines: Iterable[str]) -> Iterator[EpdRecord]:
+    for line in lines:
+        if line.strip():
+            yield parse_epd(line)
+
+
+def format_epds(records: Iterable[EpdRecord]) -> Iterator[str]:
+    for record in records:
+        yield format_epd(record)
@@ -0,0 +1,328 @@
+"""
+Reading and writing games in PGN (Portable Game Notation).
+
+read_games streams games out of a file one at a time, so memory use is bounded by
+the largest single game, not the file size. With headers_only the movetext is
+skipped without being tokenized. parse_san and to_san convert between SAN and the
+engine's Move types.
+
+"""
+from __future__ import annotations
+
+import re
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, TextIO
+
+from chess.engine.alliance import Alliance
+from chess.engine.board import DEFAULT_BOARD_STATE, MAX_MOVES, Board, position_to_coordinate
+from chess.engine.move import (
+    CAPTURE_FLAG,
+    CASTLE_FLAG,
+    PROMOTION_CODES,
+    CastleMove,
+    Move,
+    PromotionMove,
+    decode_move,
+)
+
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+LINE_LENGTH = 80
+
+HEADER_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+ESCAPE_PATTERN = re.compile(r'\\([\\"])')
+TOKEN_PATTERN = re.compile(
+    r"""
+    \{[^}]*\}?              # comment, may be cut off at the end of the movetext
+    | ;[^\n]*               # rest of line comment
+    | \$\d+                 # numeric annotation glyph
+    | [()]                  # variation
+    | (?:1-0|0-1|1/2-1/2|\*)(?![\w-])
+    | \d+\.+                # move number
+    | [^\s{}();$]+          # move
+    """,
+    re.VERBOSE,
+)
+SAN_PATTERN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQnbrq]))?$")
+
+
+class Game(NamedTuple):
+    headers: dict[str, str]
+    # Moves of the main line in SAN, variations and comments are dropped.
+    moves: list[str]
+    result: str
+
+    def get_board(self) -> Board:
+        return Board(self.headers.get("FEN", DEFAULT_BOARD_STATE))
+
+    def replay(self, board: Board | None = None) -> Iterator[tuple[Board, Move]]:
+        """
+        Yield every move together with the board it is played on, then play it.
+        Raises ValueError for a move that is illegal or ambiguous.
+
+        """
+        board = board if board is not None else self.get_board()
+        for san in self.moves:
+            move = parse_san(board, san)
+            yield board, move
+            board.make_move(move)
+
+
+def read_games(source: TextIO | str | Path, headers_only: bool = False) -> Iterator[Game]:
+    """
+    Yield the games of a PGN file or stream one at a time. With headers_only the
+    movetext is not tokenized and every game comes with an empty move list.
+
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8", errors="replace") as stream:
+            yield from read_games(stream, headers_only)
+        return
+
+    headers: dict[str, str] = {}
+    movetext: list[str] = []
+    has_movetext = False
+    in_comment = False
+
+    for line in source:
+        if not in_comment and line.startswith("["):
+            if has_movetext:
+                yield _create_game(headers, movetext, headers_only)
+                headers, movetext, has_movetext = {}, [], False
+
+            match = HEADER_PATTERN.match(line)
+            if match is not None:
+                headers[match.group(1)] = ESCAPE_PATTERN.sub(r"\1", match.group(2))
+            continue
+
+        if line.startswith("%") or not in_comment and not line.strip():
+            continue
+
+        has_movetext = True
+        if not headers_only:
+            movetext.append(line)
+        # A brace comment is the only way a movetext line can start with "[".
+        if "{" in line or "}" in line:
+            in_comment = is_inside_comment(line, in_comment)
+
+    if headers or has_movetext:
+        yield _create_game(headers, movetext, headers_only)
+
+
+def read_headers(source: TextIO | str | Path) -> Iterator[dict[str, str]]:
+    for game in read_games(source, headers_only=True):
+        yield game.headers
+
+
+def is_inside_comment(line: str, in_comment: bool) -> bool:
+    """
+    Tell whether a brace comment is still open after line, given whether one was
+    open before it. Shared with the PGN index, which splits games the same way.
+
+    """
+    for character in line:
+        if character == "{":
+            in_comment = True
+        elif character == "}":
+            in_comment = False
+        elif character == ";" and not in_comment:
+            break
+    return in_comment
+
+
+def _create_game(headers: dict[str, str], movetext: list[str], headers_only: bool) -> Game:
+    result = headers.get("Result", "*")
+    if headers_only:
+        return Game(headers, [], result)
+
+    moves = []
+    depth = 0
+    for token in TOKEN_PATTERN.findall("".join(movetext)):
+        first = token[0]
+        if first == "(":
+            depth += 1
+        elif first == ")":
+            depth = max(depth - 1, 0)
+        elif depth or first in "{;$" or first.isdigit() and token.endswith("."):
+            continue
+        elif token in RESULTS:
+            result = token
+        else:
+            moves.append(token)
+
+    return Game(headers, moves, result)
+
+
+def parse_san(board: Board, san: str) -> Move:
+    """
+    Find the legal move of the side to move that san describes. Check, mate and
+    annotation marks are ignored; "0-0" is accepted for "O-O".
+
+    """
+    text = san.rstrip("+#!?")
+    buffer = array("I", bytes(MAX_MOVES * 4))
+    count = board.generate_moves(buffer)
+    state = board.state
+
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        is_king_side = len(text) == 3
+        for index in range(count):
+            origin, target, flags, _ = decode_move(buffer[index])
+            if flags & CASTLE_FLAG and (target > origin) == is_king_side:
+                return board.create_move(buffer[index])
+        raise ValueError(f"Illegal move: {san}")
+
+    match = SAN_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid move: {san}")
+
+    piece, from_file, from_rank, target_square, promotion = match.groups()
+    piece = (piece or "P").lower()
+    from_column = "abcdefgh".index(from_file) if from_file else None
+    from_row = 8 - int(from_rank) if from_rank else None
+    target = (8 - int(target_square[1])) * 8 + "abcdefgh".index(target_square[0])
+    promotion_code = PROMOTION_CODES[promotion.lower()] if promotion else 0
+
+    candidates = []
+    for index in range(count):
+        origin, move_target, flags, move_promotion = decode_move(buffer[index])
+        if move_target != target or flags & CASTLE_FLAG:
+            continue
+        if state[origin].abbreviation.lower() != piece:
+            continue
+        if from_column is not None and origin % 8 != from_column:
+            continue
+        if from_row is not None and origin // 8 != from_row:
+            continue
+        if move_promotion and move_promotion != (promotion_code or PROMOTION_CODES["q"]):
+            continue
+        candidates.append(buffer[index])
+
+    if len(candidates) != 1:
+        problem = "Ambiguous" if candidates else "Illegal"
+        raise ValueError(f"{problem} move: {san}")
+
+    return board.create_move(candidates[0])
+
+
+def to_san(board: Board, move: Move | int) -> str:
+    """
+    SAN of a legal move of the side to move, including the check or mate mark.
+
+    """
+    move = board.create_move(move if isinstance(move, int) else move.pack())
+    origin, target, flags, _ = decode_move(move.pack())
+
+    if isinstance(move, CastleMove):
+        san = "O-O" if move.is_king_side else "O-O-O"
+    else:
+        piece = move.moving_piece.abbreviation.upper()
+        is_capture = bool(flags & CAPTURE_FLAG)
+        parts = []
+
+        if piece == "P":
+            if is_capture:
+                parts.append(position_to_coordinate(origin)[0])
+        else:
+            parts.append(piece)
+            parts.append(_disambiguate(board, move))
+
+        if is_capture:
+            parts.append("x")
+        parts.append(position_to_coordinate(target))
+
+        if isinstance(move, PromotionMove):
+            promoted = move.piece_to_promote.abbreviation.upper() if move.piece_to_promote else "Q"
+            parts.append(f"={promoted}")
+        san = "".join(parts)
+
+    board.make_move(move)
+    if board.is_checked(board.active_player):
+        san += "+" if board.active_player_can_move() else "#"
+    board.unmake_move()
+
+    return san
+
+
+def _disambiguate(board: Board, move: Move) -> str:
+    buffer = array("I", bytes(MAX_MOVES * 4))
+    count = board.generate_moves(buffer)
+    abbreviation = move.moving_piece.abbreviation
+
+    others = []
+    for index in range(count):
+        origin, target, _, _ = decode_move(buffer[index])
+        if target == move.target and origin != move.origin:
+            if board.state[origin].abbreviation == abbreviation:
+                others.append(origin)
+
+    if not others:
+        return ""
+
+    coordinate = position_to_coordinate(move.origin)
+    if all(origin % 8 != move.origin % 8 for origin in others):
+        return coordinate[0]
+    if all(origin // 8 != move.origin // 8 for origin in others):
+        return coordinate[1]
+    return coordinate
+
+
+def format_game(
+    headers: dict[str, str], moves: Iterable[Move | int], board: Board | None = None
+) -> str:
+    """
+    PGN text of a game. The moves may be Move objects or packed moves and are
+    replayed from board, or from the FEN header or the standard start position.
+
+    """
+    if board is None:
+        board = Board(headers.get("FEN", DEFAULT_BOARD_STATE))
+    else:
+        board = board.copy()
+
+    result = headers.get("Result", "*")
+    roster = {**{tag: "?" for tag in SEVEN_TAG_ROSTER}, **headers, "Result": result}
+    lines = [_format_header(tag, roster[tag]) for tag in SEVEN_TAG_ROSTER]
+    lines.extend(
+        _format_header(tag, value) for tag, value in headers.items() if tag not in SEVEN_TAG_ROSTER
+    )
+    lines.append("")
+
+    tokens = []
+    for index, move in enumerate(moves):
+        packed_move = move if isinstance(move, int) else move.pack()
+        if board.active_player == Alliance.WHITE:
+            tokens.append(f"{board.fullmove_number}.")
+        elif index == 0:
+            tokens.append(f"{board.fullmove_number}...")
+
+        tokens.append(to_san(board, packed_move))
+        board.make_packed_move(packed_move)
+    tokens.append(result)
+
+    line = []
+    length = 0
+    for token in tokens:
+        if line and length + 1 + len(token) > LINE_LENGTH:
+            lines.append(" ".join(line))
+            line, length = [], 0
+        length += len(token) + (1 if line else 0)
+        line.append(token)
+    lines.append(" ".join(line))
+
+    return "\n".join(lines) + "\n\n"
+
+
+def _format_header(tag: str, value: str) -> str:
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'[{tag} "{value}"]'
+
+
+def write_game(
+    stream: TextIO,
+    headers: dict[str, str],
+    moves: Iterable[Move | int],
+    board: Board | None = None,
+) -> None:
+    stream.write(format_game(headers, moves, board))
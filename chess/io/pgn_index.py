@@ -0,0 +1,242 @@
+"""
+On-disk index of a PGN file for random access to its games.
+
+build_index scans the PGN file once through mmap and writes the byte offset of
+every game plus a few header fields into fixed-width columns:
+
+    header   magic, version, game count, size of the indexed PGN file
+    offsets  game count + 1 unsigned 64 bit integers, the last one is the file size
+    columns  one per entry of INDEX_FIELDS, width bytes per game, NUL padded UTF-8
+
+PgnIndex maps the index file and reads single games straight from the mapped PGN
+file, so neither file is parsed again after indexing.
+
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+from chess.io.pgn import Game, is_inside_comment, read_games
+
+MAGIC = b"PGNINDEX"
+VERSION = 2
+# magic, version, reserved, game count, PGN file size
+HEADER = struct.Struct("<8sIIQQ")
+
+# Header tag and the number of bytes kept of its value.
+INDEX_FIELDS = (("White", 32), ("Black", 32), ("Result", 7), ("Date", 10), ("ECO", 3))
+
+HEADER_PATTERN = re.compile(rb'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+ESCAPE_PATTERN = re.compile(rb'\\([\\"])')
+_INDEXED_TAGS = {tag.encode(): tag for tag, _ in INDEX_FIELDS}
+
+
+def get_index_path(pgn_path: str | Path) -> Path:
+    pgn_path = Path(pgn_path)
+    return pgn_path.with_name(pgn_path.name + ".idx")
+
+
+def scan_games(data: bytes | mmap.mmap) -> Iterator[tuple[int, dict[str, bytes]]]:
+    """
+    Yield the byte offset and the indexed header values of every game in data. Games
+    are split the same way read_games splits them: a header line that follows
+    movetext starts a new game.
+
+    """
+    size = len(data)
+    position = 0
+    game_start = None
+    headers: dict[str, bytes] = {}
+    has_movetext = False
+    in_comment = False
+
+    while position < size:
+        end = data.find(b"\n", position)
+        if end < 0:
+            end = size
+        line = data[position:end]
+
+        if not in_comment and line[:1] == b"[":
+            if has_movetext:
+                yield game_start, headers
+                game_start, headers, has_movetext = None, {}, False
+            if game_start is None:
+                game_start = position
+
+            match = HEADER_PATTERN.match(line)
+            if match is not None and match.group(1) in _INDEXED_TAGS:
+                # Unescaped like read_games does, so the columns hold the same values.
+                value = ESCAPE_PATTERN.sub(rb"\1", match.group(2))
+                headers[_INDEXED_TAGS[match.group(1)]] = value
+
+        elif line.strip() and line[:1] != b"%":
+            if game_start is None:
+                game_start = position
+            has_movetext = True
+            if b"{" in line or b"}" in line:
+                in_comment = is_inside_comment(line.decode("latin-1"), in_comment)
+
+        position = end + 1
+
+    if game_start is not None:
+        yield game_start, headers
+
+
+def _fit(value: bytes, width: int) -> bytes:
+    value = value[:width]
+    # Do not leave half of a multi-byte character behind.
+    value = value.decode("utf-8", errors="ignore").encode("utf-8")
+    return value.ljust(width, b"\0")
+
+
+def build_index(pgn_path: str | Path, index_path: str | Path | None = None) -> PgnIndex:
+    pgn_path = Path(pgn_path)
+    index_path = Path(index_path) if index_path is not None else get_index_path(pgn_path)
+
+    offsets = array("Q")
+    columns = [bytearray() for _ in INDEX_FIELDS]
+
+    size = pgn_path.stat().st_size
+    if size:
+        with open(pgn_path, "rb") as stream, mmap.mmap(
+            stream.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            for offset, headers in scan_games(data):
+                offsets.append(offset)
+                for column, (tag, width) in zip(columns, INDEX_FIELDS):
+                    column += _fit(headers.get(tag, b""), width)
+
+    count = len(offsets)
+    offsets.append(size)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+
+    with open(index_path, "wb") as stream:
+        stream.write(HEADER.pack(MAGIC, VERSION, 0, count, size))
+        stream.write(offsets.tobytes())
+        for column in columns:
+            stream.write(column)
+
+    return PgnIndex(pgn_path, index_path)
+
+
+def open_index(pgn_path: str | Path, index_path: str | Path | None = None) -> PgnIndex:
+    """
+    Open the index of a PGN file, building it first when it is missing or was built
+    for a file of a different size.
+
+    """
+    index_path = Path(index_path) if index_path is not None else get_index_path(pgn_path)
+    if index_path.exists():
+        with open(index_path, "rb") as stream:
+            header = stream.read(HEADER.size)
+        if len(header) == HEADER.size:
+            magic, version, _, _, size = HEADER.unpack(header)
+            if (magic, version, size) == (MAGIC, VERSION, Path(pgn_path).stat().st_size):
+                return PgnIndex(pgn_path, index_path)
+
+    return build_index(pgn_path, index_path)
+
+
+class PgnIndex:
+    def __init__(self, pgn_path: str | Path, index_path: str | Path | None = None) -> None:
+        self.pgn_path = Path(pgn_path)
+        self.index_path = Path(index_path) if index_path is not None else get_index_path(pgn_path)
+        self._pgn_file = None
+        self._pgn = None
+
+        self._index_file = open(self.index_path, "rb")
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, self.pgn_size = HEADER.unpack_from(self._index)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a PGN index: {self.index_path}")
+
+        offsets_end = HEADER.size + (self.count + 1) * 8
+        self.offsets = array("Q", self._index[HEADER.size : offsets_end])
+        if sys.byteorder == "big":
+            self.offsets.byteswap()
+
+        # Start of every column in the index file.
+        self.columns: dict[str, tuple[int, int]] = {}
+        start = offsets_end
+        for tag, width in INDEX_FIELDS:
+            self.columns[tag] = (start, width)
+            start += width * self.count
+
+        if self.pgn_size:
+            self._pgn_file = open(self.pgn_path, "rb")
+            self._pgn = mmap.mmap(self._pgn_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> PgnIndex:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for resource in (self._pgn, self._pgn_file, self._index, self._index_file):
+            if resource is not None:
+                resource.close()
+        self._pgn = self._pgn_file = self._index = self._index_file = None
+
+    def _check_number(self, number: int) -> int:
+        if number < 0:
+            number += self.count
+        if not 0 <= number < self.count:
+            raise IndexError("Game number out of range.")
+        return number
+
+    def get_field(self, number: int, tag: str) -> str:
+        number = self._check_number(number)
+        start, width = self.columns[tag]
+        value = self._index[start + number * width : start + (number + 1) * width]
+        return value.rstrip(b"\0").decode("utf-8", errors="replace")
+
+    def get_headers(self, number: int) -> dict[str, str]:
+        """
+        The indexed header fields of a game, values longer than their column are cut.
+
+        """
+        return {tag: self.get_field(number, tag) for tag, _ in INDEX_FIELDS}
+
+    def get_text(self, number: int) -> str:
+        number = self._check_number(number)
+        data = self._pgn[self.offsets[number] : self.offsets[number + 1]]
+        return data.decode("utf-8", errors="replace")
+
+    def read_game(self, number: int, headers_only: bool = False) -> Game:
+        return next(read_games(io.StringIO(self.get_text(number)), headers_only))
+
+    def filter(self, **fields: str) -> list[int]:
+        """
+        Numbers of the games whose indexed fields start with the given values, e.g.
+        filter(White="Morphy", Date="1858") or filter(ECO="C4", Result="1-0").
+
+        """
+        numbers = range(self.count)
+        for tag, value in fields.items():
+            if tag not in self.columns:
+                raise KeyError(f"{tag} is not indexed.")
+
+            start, width = self.columns[tag]
+            prefix = _fit(value.encode("utf-8"), width).rstrip(b"\0")
+            index = self._index
+            numbers = [
+                number
+                for number in numbers
+                if index.find(prefix, start + number * width, start + (number + 1) * width)
+                == start + number * width
+            ]
+
+        return list(numbers)
@@ -1,4 +1,3 @@
-import copy
 from threading import Thread
 
 from PySide6.QtCore import QPoint, QRect, QSize, Qt
@@ -38,6 +37,7 @@ from chess.engine.pieces.knight import Knight
 
 from chess.engine.pieces import Queen
 from chess.engine.pieces.rook import Rook
+from chess.engine.position import GameHistory
 from gui.io import load_piece_graphics
 
 # COLOR_LIGHT = "#F2F0D8"
@@ -152,15 +152,14 @@ class BoardView(QWidget):
 
         self.selected_piece = None
         self.stale_mate = self.check_mate = False
+        # Threefold repetition or the fifty-move rule, which leave no winner.
+        self.draw = False
         self.promotion_move = None
         self.promoting = False
         self.board = Board()
 
-        for piece in self.board.all_active_pieces():
-            piece.calculate_legal_moves(self.board)
-
         self.move_index = self.board.fullmove_number
-        self.board_states = []
+        self.history = GameHistory.from_board(self.board)
         self.winner = None
 
         self.dialog = PromotionDialog()
@@ -226,14 +225,16 @@ class BoardView(QWidget):
         if self.promotion_move is None:
             return
 
+        alliance = self.promotion_move.moving_piece.alliance
         self.promotion_move.piece_to_promote = {
-            "Queen": Queen(self.promotion_move.target, self.selected_piece.alliance),
-            "Knight": Knight(self.promotion_move.target, self.selected_piece.alliance),
-            "Bishop": Bishop(self.promotion_move.target, self.selected_piece.alliance),
-            "Rook": Rook(self.promotion_move.target, self.selected_piece.alliance),
+            "Queen": Queen(self.promotion_move.target, alliance),
+            "Knight": Knight(self.promotion_move.target, alliance),
+            "Bishop": Bishop(self.promotion_move.target, alliance),
+            "Rook": Rook(self.promotion_move.target, alliance),
         }[piece_name]
 
-        self.promotion_move.execute(self.board)
+        self.board.make_move(self.promotion_move)
+        self.history.append(self.promotion_move)
         self.promotion_move = None
 
     def draw_tiles(self, painter: QPainter) -> None:
@@ -372,7 +373,7 @@ class BoardView(QWidget):
         self.draw_coordinates(painter)
         self.draw_selected_piece(painter)
 
-        if self.check_mate or self.stale_mate:
+        if self.check_mate or self.stale_mate or self.draw:
             self.draw_current_move(painter)
 
         self.draw_pieces(painter)
@@ -383,20 +384,19 @@ class BoardView(QWidget):
         painter.setPen(QPen(Qt.GlobalColor.white))
         painter.setFont(QFont("Raleway", 16))
 
-        if self.winner is not None:
-            if self.check_mate:
-                painter.drawText(
-                    QRect(self.OFFSET, 0, self.TILE_SIZE * 8, self.OFFSET),
-                    Qt.AlignmentFlag.AlignCenter,
-                    "Checkmate " + self.winner.__str__() + " wins!",
-                )
+        if self.check_mate and self.winner is not None:
+            painter.drawText(
+                QRect(self.OFFSET, 0, self.TILE_SIZE * 8, self.OFFSET),
+                Qt.AlignmentFlag.AlignCenter,
+                "Checkmate " + self.winner.__str__() + " wins!",
+            )
 
-            if self.stale_mate:
-                painter.drawText(
-                    QRect(self.OFFSET, 0, self.TILE_SIZE * 8, self.OFFSET),
-                    Qt.AlignmentFlag.AlignCenter,
-                    "Tie!",
-                )
+        if self.stale_mate or self.draw:
+            painter.drawText(
+                QRect(self.OFFSET, 0, self.TILE_SIZE * 8, self.OFFSET),
+                Qt.AlignmentFlag.AlignCenter,
+                "Tie!",
+            )
 
     def get_ring_path(self, move):
         path = QPainterPath()
@@ -425,11 +425,14 @@ class BoardView(QWidget):
 
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() != Qt.MouseButton.LeftButton:
-            self.board.undo()
+            # A board loaded from the history has no moves of its own to take back.
+            if self.board.moves:
+                self.board.undo()
+                self.history.truncate(len(self.board.moves) + 1)
             self.update()
             return super().mousePressEvent(event)
 
-        if self.check_mate or self.stale_mate:
+        if self.check_mate or self.stale_mate or self.draw:
             return super().mousePressEvent(event)
 
         position = self.get_board_position_from_mouse(event.pos())
@@ -458,10 +461,8 @@ class BoardView(QWidget):
             if isinstance(move, PromotionMove):
                 self.promotion_move = move
                 self.dialog.promote(position_to_coordinate(move.target))
-                self.board.moves.append(move)
 
                 self.selected_piece = None
-                self.board.next_turn()
 
                 self.update()
                 return super().mousePressEvent(event)
@@ -470,23 +471,22 @@ class BoardView(QWidget):
                 move is not None
                 and self.board.active_player == self.selected_piece.alliance
             ):
-                self.board_states.append(copy.deepcopy(self.board))
-                self.board.moves.append(move)
-                move.execute(self.board)
+                self.board.make_move(move)
+                self.history.append(move)
 
                 self.selected_piece = None
-                self.board.next_turn()
 
                 is_checked = self.board.is_checked(self.board.active_player)
                 can_move = self.board.active_player_can_move()
 
                 self.check_mate = is_checked and not can_move
                 self.stale_mate = not (is_checked or can_move)
+                self.draw = not (self.check_mate or self.stale_mate) and self.board.is_draw()
 
-                if self.check_mate or self.stale_mate:
-                    self.move_index = len(self.move_buttons)
+                if self.check_mate:
                     self.winner = self.board.active_player.opponent()
-                    self.board_states.append(copy.deepcopy(self.board))
+                if self.check_mate or self.stale_mate or self.draw:
+                    self.move_index = len(self.move_buttons)
                     self.add_move_button()
                     self.restart_button.show()
 
@@ -517,7 +517,7 @@ class BoardView(QWidget):
             self.promotion_move.piece_to_promote = piece
             self.board.moves_done.append(self.promotion_move)
             self.board.current_player.moves_done.append(self.promotion_move)
-            self.board_states.append(copy.deepcopy(self.board))
+            self.history.append(self.promotion_move)
 
             self.add_move_button(self.promotion_move)
 
@@ -542,7 +542,6 @@ class BoardView(QWidget):
                 self.selected_piece = self.board.current_player.active_pieces(
                     self.board
                 )[0]
-                self.board_states.append(copy.deepcopy(self.board))
                 self.add_move_button()
                 self.restart_button.show()
 
@@ -551,26 +550,12 @@ class BoardView(QWidget):
     def update_legal_moves(self) -> None:
         if self.selected_piece.alliance != self.board.active_player:
             return
-        
 
-        updated_legal_moves = set()
-        copied_board = copy.deepcopy(self.board)
-
-        for move in self.selected_piece.legal_moves:
-            move.execute(copied_board)
-            print(copied_board, copied_board.is_checked(copied_board.active_player.opponent()))
-            if not copied_board.is_checked(copied_board.active_player):
-                updated_legal_moves.add(move)
-            move.undo(copied_board)
-
-        # if isinstance(self.selected_piece, King):
-        #     for move in updated_legal_moves:
-        #         if isinstance(
-        #             move, CastleMove
-        #         ) and self.board.active_player.is_check(self.board):
-        #             updated_legal_moves.discard(move)
-
-        self.selected_piece.legal_moves = updated_legal_moves
+        self.selected_piece.legal_moves = [
+            move
+            for move in self.board.generate_legal_moves()
+            if move.moving_piece is self.selected_piece
+        ]
 
     def resizeEvent(self, event: QResizeEvent):
         self.TILE_SIZE = self.height() // 9
@@ -621,9 +606,9 @@ class BoardView(QWidget):
         self.selected_piece = None
 
     def set_board_state(self):
-        if self.stale_mate or self.check_mate:
+        if self.stale_mate or self.check_mate or self.draw:
             index = self.sender().index - 1
-            self.board.pieces = self.board_states[index].pieces
+            self.board = self.history[index].to_board()
             self.move_index = index
             self.update()
             for b in self.move_buttons:
@@ -637,12 +622,12 @@ class BoardView(QWidget):
 
     def restart(self):
         self.selected_piece = None
-        self.stale_mate = self.check_mate = False
+        self.stale_mate = self.check_mate = self.draw = False
         self.promotion_move = None
         self.promoting = False
         self.board = Board()
         self.move_index = len(self.board.moves_done)
-        self.board_states = []
+        self.history = GameHistory.from_board(self.board)
         self.winner = None
 
         for b in self.move_buttons:
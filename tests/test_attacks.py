@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from chess.engine.attacks import (
+    BISHOP_RAYS,
+    KING_TARGETS,
+    KNIGHT_ATTACKS,
+    KNIGHT_TARGETS,
+    PAWN_ATTACK_TARGETS,
+    QUEEN_RAYS,
+    ROOK_RAYS,
+)
+from chess.engine.board import coordinate_to_position
+
+
+class TestAttacks(TestCase):
+    def test_knight_targets(self) -> None:
+        self.assertEqual(len(KNIGHT_TARGETS[coordinate_to_position("a8")]), 2)
+        self.assertEqual(len(KNIGHT_TARGETS[coordinate_to_position("b1")]), 3)
+        self.assertEqual(len(KNIGHT_TARGETS[coordinate_to_position("d4")]), 8)
+        self.assertEqual(
+            KNIGHT_ATTACKS[0], 1 << coordinate_to_position("b6") | 1 << coordinate_to_position("c7")
+        )
+
+    def test_king_targets(self) -> None:
+        self.assertEqual(len(KING_TARGETS[coordinate_to_position("h1")]), 3)
+        self.assertEqual(len(KING_TARGETS[coordinate_to_position("e1")]), 5)
+        self.assertEqual(len(KING_TARGETS[coordinate_to_position("e4")]), 8)
+
+    def test_pawn_attack_targets(self) -> None:
+        e4 = coordinate_to_position("e4")
+        self.assertEqual(
+            set(PAWN_ATTACK_TARGETS[0][e4]),
+            {coordinate_to_position("d5"), coordinate_to_position("f5")},
+        )
+        self.assertEqual(
+            set(PAWN_ATTACK_TARGETS[1][e4]),
+            {coordinate_to_position("d3"), coordinate_to_position("f3")},
+        )
+        self.assertEqual(PAWN_ATTACK_TARGETS[0][coordinate_to_position("a2")], (coordinate_to_position("b3"),))
+
+    def test_rays_do_not_wrap(self) -> None:
+        for position in range(64):
+            for rays in (ROOK_RAYS, BISHOP_RAYS):
+                for ray in rays[position]:
+                    previous = position
+                    for square in ray:
+                        self.assertLessEqual(abs(square % 8 - previous % 8), 1)
+                        previous = square
+
+        self.assertEqual(sum(len(ray) for ray in ROOK_RAYS[0]), 14)
+        self.assertEqual(sum(len(ray) for ray in BISHOP_RAYS[0]), 7)
+        self.assertEqual(sum(len(ray) for ray in QUEEN_RAYS[coordinate_to_position("d4")]), 27)
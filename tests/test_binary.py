@@ -0,0 +1,74 @@
+import importlib.util
+import tempfile
+from pathlib import Path
+from unittest import TestCase, skipUnless
+
+from chess.engine.board import Board
+from chess.engine.perft import FEN_EXAMPLES
+from chess.engine.position import Position
+from chess.io.binary import (
+    RECORD,
+    decode_board,
+    decode_position,
+    encode_board,
+    encode_position,
+    load_positions,
+    read_positions,
+    write_positions,
+)
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class TestBinary(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "positions.bin"
+        self.fen_strings = [example["fen"] for example in FEN_EXAMPLES]
+        self.fen_strings.append("4k3/8/8/3pP3/8/8/8/4K3 w - d6 37 120")
+
+    def test_round_trip(self) -> None:
+        for fen_string in self.fen_strings:
+            position = Position.from_fen(fen_string)
+            data = encode_position(position)
+            self.assertEqual(RECORD.size, len(data))
+            self.assertEqual(position, decode_position(data))
+
+    def test_board_round_trip(self) -> None:
+        board = Board(self.fen_strings[0])
+        board.make_move(board.generate_legal_moves()[0])
+        copied = decode_board(encode_board(board))
+        self.assertEqual(board.to_fen(), copied.to_fen())
+        self.assertEqual(board.zobrist_key, copied.zobrist_key)
+        self.assertEqual(len(board.generate_legal_moves()), len(copied.generate_legal_moves()))
+
+    def test_too_many_pieces(self) -> None:
+        position = Position.from_fen("qqqqkqqq/qqqqqqqq/qqqqqqqq/qqqqqqqq/8/8/8/4K3 w - - 0 1")
+        with self.assertRaises(ValueError):
+            encode_position(position)
+
+    def test_file(self) -> None:
+        boards = [Board(fen_string) for fen_string in self.fen_strings]
+        self.assertEqual(len(boards), write_positions(self.path, boards))
+        positions = list(read_positions(self.path))
+        self.assertEqual(self.fen_strings, [position.to_fen() for position in positions])
+
+        self.path.write_bytes(b"not a position file")
+        with self.assertRaises(ValueError):
+            list(read_positions(self.path))
+
+    @skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_load_positions(self) -> None:
+        positions = [Position.from_fen(fen_string) for fen_string in self.fen_strings]
+        write_positions(self.path, positions)
+
+        array = load_positions(self.path)
+        self.assertEqual(len(positions), len(array))
+        self.assertEqual(positions[1], decode_position(array[1].tobytes()))
+        self.assertEqual(120, array["fullmove_number"][-1])
+        pieces = 64 - positions[0].squares.count(b".")
+        self.assertEqual(pieces, bin(int(array["occupancy"][0])).count("1"))
+
+        write_positions(self.path, [])
+        self.assertEqual(0, len(load_positions(self.path)))
@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+from chess.engine.alliance import Alliance
+from chess.engine.bitboard import BitBoard, iterate_bits
+from chess.engine.board import Board, DEFAULT_BOARD_STATE
+from chess.engine.move import CastleMove, Move, PawnJumpMove
+from chess.engine.perft import FEN_EXAMPLES, perft, run_perft
+from chess.engine.zobrist import compute_hash
+
+FEN_STRINGS = [
+    DEFAULT_BOARD_STATE,
+    "r6r/1b2k1bq/8/8/7B/8/8/R3K2R b KQ - 3 2",
+    "8/8/8/2k5/2pP4/8/B7/4K3 b - d3 0 3",
+    "r3k2r/p1pp1pb1/bn2Qnp1/2qPN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQkq - 3 2",
+    "rnb2k1r/pp1Pbppp/2p5/q7/2B5/8/PPPQNnPP/RNB1K2R w KQ - 3 9",
+    "4k3/8/8/8/b7/8/8/3KQ3 b KQkq - 0 1",
+]
+
+
+class TestBitBoard(TestCase):
+    def test_parse_fen_string(self) -> None:
+        for fen_string in FEN_STRINGS:
+            self.assertEqual(fen_string, BitBoard(fen_string).to_fen())
+
+    def test_get_piece_at_matches_board(self) -> None:
+        for fen_string in FEN_STRINGS:
+            bitboard = BitBoard(fen_string)
+            board = Board(fen_string)
+            for position in range(64):
+                self.assertEqual(
+                    str(board.get_piece_at(position)), str(bitboard.get_piece_at(position))
+                )
+
+    def test_is_checked(self) -> None:
+        bitboard = BitBoard("4k3/8/8/8/b7/8/8/3KQ3 b KQkq - 0 1")
+        self.assertTrue(bitboard.is_checked(Alliance.WHITE))
+        self.assertTrue(bitboard.is_checked(Alliance.BLACK))
+
+        bitboard = BitBoard("4k3/8/8/8/b7/8/2P5/3KQ3 b - - 0 1")
+        self.assertFalse(bitboard.is_checked(Alliance.WHITE))
+
+        bitboard = BitBoard("4k3/3P4/8/8/8/8/8/4K3 b - - 0 1")
+        self.assertTrue(bitboard.is_checked(Alliance.BLACK))
+
+    def test_execute_and_undo(self) -> None:
+        bitboard = BitBoard(DEFAULT_BOARD_STATE)
+        knight = bitboard.get_piece_at(62)
+
+        bitboard.make_move(Move(knight, 45))
+        self.assertEqual(
+            "rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1", bitboard.to_fen()
+        )
+
+        bitboard.undo()
+        self.assertEqual(DEFAULT_BOARD_STATE, bitboard.to_fen())
+
+    def test_make_move_updates_game_state(self) -> None:
+        fen_string = "r3k2r/pppppppp/8/8/8/8/PPPPPPPP/R3K2R w KQkq - 4 1"
+        bitboard = BitBoard(fen_string)
+
+        bitboard.make_move(CastleMove(bitboard.get_piece_at(60), 62, is_king_side=True))
+        self.assertEqual(
+            "r3k2r/pppppppp/8/8/8/8/PPPPPPPP/R4RK1 b kq - 5 1", bitboard.to_fen()
+        )
+        bitboard.make_move(PawnJumpMove(bitboard.get_piece_at(11), 27, 19))
+        self.assertEqual(
+            "r3k2r/ppp1pppp/8/3p4/8/8/PPPPPPPP/R4RK1 w kq d6 0 2", bitboard.to_fen()
+        )
+        self.assertEqual(compute_hash(bitboard), bitboard.zobrist_key)
+
+        bitboard.unmake_move()
+        bitboard.unmake_move()
+        self.assertEqual(fen_string, bitboard.to_fen())
+        self.assertEqual(compute_hash(bitboard), bitboard.zobrist_key)
+
+    def test_generate_legal_moves(self) -> None:
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            bitboard = BitBoard(example["fen"])
+            self.assertEqual(
+                sorted(move.pack() for move in board.generate_legal_moves()),
+                sorted(move.pack() for move in bitboard.generate_legal_moves()),
+            )
+
+    def test_perft(self) -> None:
+        for example in FEN_EXAMPLES:
+            if example["nodes"] > 10_000:
+                continue
+            bitboard = BitBoard(example["fen"])
+            self.assertEqual(example["nodes"], perft(bitboard, example["depth"]))
+            self.assertEqual(example["fen"], bitboard.to_fen())
+
+        result = run_perft(DEFAULT_BOARD_STATE, 2, board_type="bitboard")
+        self.assertEqual(400, result["nodes"])
+
+    def test_iterate_bits(self) -> None:
+        self.assertEqual([0, 5, 63], list(iterate_bits(1 | 1 << 5 | 1 << 63)))
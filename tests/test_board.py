@@ -1,62 +1,20 @@
+from array import array
 from unittest import TestCase
 
 from chess.engine.alliance import Alliance
 from chess.engine.board import (
+    ALL_MOVES,
+    CAPTURES,
+    MAX_MOVES,
+    PROMOTIONS,
+    QUIETS,
     Board,
     is_valid_position,
     coordinate_to_position,
     position_to_coordinate,
 )
-
-FEN_EXAMPLES = [
-    {"depth": 1, "nodes": 8, "fen": "r6r/1b2k1bq/8/8/7B/8/8/R3K2R b KQ - 3 2"},
-    {"depth": 1, "nodes": 8, "fen": "8/8/8/2k5/2pP4/8/B7/4K3 b - d3 0 3"},
-    {
-        "depth": 1,
-        "nodes": 19,
-        "fen": "r1bqkbnr/pppppppp/n7/8/8/P7/1PPPPPPP/RNBQKBNR w KQkq - 2 2",
-    },
-    {
-        "depth": 1,
-        "nodes": 5,
-        "fen": "r3k2r/p1pp1pb1/bn2Qnp1/2qPN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQkq - 3 2",
-    },
-    {
-        "depth": 1,
-        "nodes": 44,
-        "fen": "2kr3r/p1ppqpb1/bn2Qnp1/3PN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQ - 3 2",
-    },
-    {
-        "depth": 1,
-        "nodes": 39,
-        "fen": "rnb2k1r/pp1Pbppp/2p5/q7/2B5/8/PPPQNnPP/RNB1K2R w KQ - 3 9",
-    },
-    {"depth": 1, "nodes": 9, "fen": "2r5/3pk3/8/2P5/8/2K5/8/8 w - - 5 4"},
-    {
-        "depth": 3,
-        "nodes": 62379,
-        "fen": "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
-    },
-    {
-        "depth": 3,
-        "nodes": 89890,
-        "fen": "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
-    },
-    {"depth": 6, "nodes": 1134888, "fen": "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1"},
-    {"depth": 6, "nodes": 1015133, "fen": "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1"},
-    {"depth": 6, "nodes": 1440467, "fen": "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1"},
-    {"depth": 6, "nodes": 661072, "fen": "5k2/8/8/8/8/8/8/4K2R w K - 0 1"},
-    {"depth": 6, "nodes": 803711, "fen": "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1"},
-    {"depth": 4, "nodes": 1274206, "fen": "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1"},
-    {"depth": 4, "nodes": 1720476, "fen": "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1"},
-    {"depth": 6, "nodes": 3821001, "fen": "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1"},
-    {"depth": 5, "nodes": 1004658, "fen": "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1"},
-    {"depth": 6, "nodes": 217342, "fen": "4k3/1P6/8/8/8/8/K7/8 w - - 0 1"},
-    {"depth": 6, "nodes": 92683, "fen": "8/P1k5/K7/8/8/8/8/8 w - - 0 1"},
-    {"depth": 6, "nodes": 2217, "fen": "K1k5/8/P7/8/8/8/8/8 w - - 0 1"},
-    {"depth": 7, "nodes": 567584, "fen": "8/k1P5/8/1K6/8/8/8/8 w - - 0 1"},
-    {"depth": 4, "nodes": 23527, "fen": "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1"},
-]
+from chess.engine.move import CAPTURE_FLAG, CastleMove, EnPassantAttackMove, encode_move
+from chess.engine.perft import FEN_EXAMPLES
 
 
 class TestBoard(TestCase):
@@ -84,12 +42,331 @@ class TestBoard(TestCase):
         self.assertEqual(coordinate_to_position("f4"), 37)
 
     def test_is_in_check(self) -> None:
-        # board = Board("4k3/8/8/8/8/8/8/3KQ3 w KQkq - 0 1")
-        # self.assertEqual(True, board.is_checked(Alliance.BLACK))
+        board = Board("4k3/8/8/8/8/8/8/3KQ3 w KQkq - 0 1")
+        self.assertEqual(True, board.is_checked(Alliance.BLACK))
         board = Board("4k3/8/8/8/b7/8/8/3KQ3 b KQkq - 0 1")
         print(board)
         self.assertEqual(True, board.is_checked(Alliance.WHITE))
 
+    def test_is_square_attacked(self) -> None:
+        from chess.engine.bitboard import BitBoard
+
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            bitboard = BitBoard(example["fen"])
+            for alliance in Alliance:
+                for position in range(64):
+                    self.assertEqual(
+                        bitboard.is_square_attacked(position, alliance),
+                        board.is_square_attacked(position, alliance),
+                    )
+                    self.assertEqual(
+                        bool(board.get_attackers(position, alliance)),
+                        board.is_square_attacked(position, alliance),
+                    )
+
+    def test_castling_through_attacked_square(self) -> None:
+        board = Board("4k3/8/8/8/8/8/5r2/R3K2R w KQ - 0 1")
+        king = board.get_king(Alliance.WHITE)
+
+        self.assertFalse(king.tiles_for_castling_are_save_and_clear(board, is_king_side=True))
+        self.assertTrue(king.tiles_for_castling_are_save_and_clear(board, is_king_side=False))
+
+        castles = [move.to_uci() for move in king.calculate_legal_moves(board) if isinstance(move, CastleMove)]
+        self.assertEqual(["e1c1"], castles)
+
+    def test_copy(self) -> None:
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            for move in board.generate_legal_moves()[:3]:
+                board.make_move(move)
+                copied = board.copy()
+
+                self.assertEqual(board.to_fen(), copied.to_fen())
+                self.assertEqual(board.zobrist_key, copied.zobrist_key)
+                self.assertEqual(
+                    [move.to_uci() for move in board.generate_legal_moves()],
+                    [move.to_uci() for move in copied.generate_legal_moves()],
+                )
+                self.assertEqual([], copied.history)
+                board.unmake_move()
+
+    def test_copy_is_independent(self) -> None:
+        board = Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        board.make_move(board.parse_uci("a1a2"))
+        board.make_move(board.parse_uci("a8a7"))
+        board.make_move(board.parse_uci("a2a1"))
+        copied = board.copy()
+
+        self.assertTrue(copied.state[56].has_moved)
+        self.assertFalse(copied.state[63].has_moved)
+        self.assertIsNot(board.state[56], copied.state[56])
+
+        copied.make_move(copied.parse_uci("e8g8"))
+        self.assertEqual("5rk1/r7/8/8/8/8/8/R3K2R w K - 4 3", copied.to_fen())
+        self.assertEqual("4k2r/r7/8/8/8/8/8/R3K2R b Kk - 3 2", board.to_fen())
+
+    def test_threefold_repetition(self) -> None:
+        board = Board("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        shuffle = ("g1f3", "g8f6", "f3g1", "f6g8")
+
+        for uci in shuffle:
+            self.assertFalse(board.is_threefold_repetition())
+            board.make_move(board.parse_uci(uci))
+        self.assertEqual(1, board.count_repetitions())
+
+        for uci in shuffle[:3]:
+            board.make_move(board.parse_uci(uci))
+        self.assertFalse(board.is_threefold_repetition())
+        board.make_move(board.parse_uci(shuffle[3]))
+        self.assertEqual(2, board.count_repetitions())
+        self.assertTrue(board.is_threefold_repetition())
+        self.assertTrue(board.is_draw())
+
+        board.unmake_move()
+        self.assertFalse(board.is_draw())
+
+    def test_repetition_stops_at_irreversible_move(self) -> None:
+        board = Board("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+        for uci in ("e1d1", "e8d8", "d1e1", "d8e8", "e2e3"):
+            board.make_move(board.parse_uci(uci))
+        self.assertEqual(0, board.halfmove_clock)
+
+        board.make_move(board.parse_uci("e8d8"))
+        board.make_move(board.parse_uci("e1d1"))
+        # The kings stood like this before, but with the pawn on e2.
+        self.assertEqual(0, board.count_repetitions())
+
+        board.make_move(board.parse_uci("d8e8"))
+        board.make_move(board.parse_uci("d1e1"))
+        self.assertEqual(1, board.count_repetitions())
+        self.assertEqual(4, board.halfmove_clock)
+
+    def test_fifty_move_rule(self) -> None:
+        board = Board("4k3/8/8/8/8/8/8/R3K3 w - - 99 80")
+        self.assertFalse(board.is_fifty_move_draw())
+
+        board.make_move(board.parse_uci("a1a2"))
+        self.assertEqual(100, board.halfmove_clock)
+        self.assertTrue(board.is_fifty_move_draw())
+        self.assertTrue(board.is_draw())
+
+        board.unmake_move()
+        self.assertFalse(board.is_draw())
+
+        # Mate on the hundredth half move is still mate.
+        board = Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 99 80")
+        board.make_move(board.parse_uci("a1a8"))
+        self.assertFalse(board.is_fifty_move_draw())
+
+    def test_next_turn_halfmove_clock(self) -> None:
+        board = Board("4k3/8/8/8/8/8/4P3/R3K3 w - - 7 1")
+        move = board.parse_uci("a1a2")
+        move.execute(board)
+        board.moves.append(move)
+        board.next_turn()
+        self.assertEqual(8, board.halfmove_clock)
+
+        move = board.parse_uci("e8d8")
+        move.execute(board)
+        board.moves.append(move)
+        board.next_turn()
+        move = board.parse_uci("e2e4")
+        move.execute(board)
+        board.moves.append(move)
+        board.next_turn()
+        self.assertEqual(0, board.halfmove_clock)
+
+    def test_see(self) -> None:
+        cases = (
+            # Pawn takes an undefended pawn, then a defended one.
+            ("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", 100),
+            ("4k3/8/2p5/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", 0),
+            ("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1", "d1d5", -800),
+            ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),
+            # The queen on h8 backs up the bishop and the one on e1 the rook.
+            ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -220),
+            ("4k3/8/4p3/3r4/8/8/3Q4/3RK3 w - - 0 1", "d2d5", -300),
+            # The king can not take back on a square the queen covers through the rook.
+            ("4k3/4p3/8/8/8/8/4R3/4QK2 w - - 0 1", "e2e7", 100),
+            ("4k3/4p3/8/8/8/8/4R3/5K2 w - - 0 1", "e2e7", -400),
+            ("4k3/2p5/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 0),
+            # The new queen wins the rook but the king takes her.
+            ("3rk3/2P5/8/8/8/8/8/4K3 w - - 0 1", "c7d8q", 400),
+            ("3rk3/2P5/8/8/8/8/8/4K3 w - - 0 1", "c7c8q", -100),
+        )
+        for fen_string, uci, expected in cases:
+            board = Board(fen_string)
+            move = board.parse_uci(uci)
+            self.assertEqual(expected, board.see(move), uci)
+            self.assertEqual(expected, board.see(move.pack()), uci)
+            self.assertEqual(fen_string, board.to_fen())
+
+    def test_make_and_unmake_move(self) -> None:
+        fen_string = "r3k2r/p1pp1pb1/bn2Qnp1/2qPN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQkq - 3 2"
+        board = Board(fen_string)
+
+        for piece in list(board.get_active_players_pieces()):
+            for move in list(piece.calculate_legal_moves(board)):
+                board.make_move(move)
+                board.unmake_move()
+                self.assertEqual(fen_string, board.to_fen())
+
+    def test_make_move_updates_state(self) -> None:
+        board = Board("r3k2r/8/8/8/8/8/4P3/R3K2R w KQkq - 3 1")
+
+        pawn = board.get_piece_at(coordinate_to_position("e2"))
+        pawn.calculate_legal_moves(board)
+        board.make_move(pawn.get_move(coordinate_to_position("e4")))
+        self.assertEqual("r3k2r/8/8/8/4P3/8/8/R3K2R b KQkq e3 0 1", board.to_fen())
+
+        rook = board.get_piece_at(coordinate_to_position("h8"))
+        rook.calculate_legal_moves(board)
+        board.make_move(rook.get_move(coordinate_to_position("h1")))
+        self.assertEqual("r3k3/8/8/8/4P3/8/8/R3K2r w Qq - 0 2", board.to_fen())
+
+        king = board.get_piece_at(coordinate_to_position("e1"))
+        king.calculate_legal_moves(board)
+        board.make_move(king.get_move(coordinate_to_position("d2")))
+        self.assertEqual("r3k3/8/8/8/4P3/8/3K4/R6r b q - 1 2", board.to_fen())
+
+        board.undo()
+        board.undo()
+        board.undo()
+        self.assertEqual("r3k2r/8/8/8/8/8/4P3/R3K2R w KQkq - 3 1", board.to_fen())
+
+    def test_generate_legal_moves(self) -> None:
+        for example in FEN_EXAMPLES:
+            if example["depth"] != 1:
+                continue
+
+            board = Board(example["fen"])
+            self.assertEqual(example["nodes"], len(board.generate_legal_moves()))
+            self.assertEqual(example["fen"], board.to_fen())
+
+    def test_generate_legal_moves_pins_and_checks(self) -> None:
+        # The e-pawn is pinned by the rook along the file, so it can still push.
+        board = Board("4r1k1/8/8/8/8/8/4P3/4K3 w - - 0 1")
+        pawn = board.get_piece_at(coordinate_to_position("e2"))
+        pawn_moves = [
+            move for move in board.generate_legal_moves() if move.moving_piece is pawn
+        ]
+        self.assertEqual(2, len(pawn_moves))
+
+        # Double check by knight and rook leaves only king moves.
+        board = Board("4r1k1/8/8/8/8/3n4/8/4K2R w K - 0 1")
+        moves = board.generate_legal_moves()
+        self.assertTrue(moves)
+        self.assertTrue(all(move.moving_piece is board.white_king for move in moves))
+
+        # Capturing en passant would expose the king along the fourth rank.
+        board = Board("8/8/8/8/k2pP2R/8/8/4K3 b - e3 0 1")
+        self.assertFalse(
+            any(isinstance(move, EnPassantAttackMove) for move in board.generate_legal_moves())
+        )
+
+        # The king may not castle through f1, which the bishop attacks.
+        board = Board("4k3/8/8/8/8/8/6b1/4K2R w K - 0 1")
+        self.assertFalse(
+            any(isinstance(move, CastleMove) for move in board.generate_legal_moves())
+        )
+
+    def test_generate_moves_by_kind(self) -> None:
+        buffer = array("I", bytes(MAX_MOVES * 4))
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            count = board.generate_moves(buffer)
+            all_moves = sorted(buffer[:count])
+
+            moves = []
+            for kinds in (CAPTURES, PROMOTIONS, QUIETS):
+                count = board.generate_moves(buffer, 0, kinds)
+                moves.extend(buffer[:count])
+            self.assertEqual(all_moves, sorted(moves))
+
+            count = board.generate_moves(buffer, 0, ALL_MOVES)
+            self.assertEqual(all_moves, sorted(buffer[:count]))
+
+    def test_generate_staged_moves(self) -> None:
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            expected = sorted(move.pack() for move in board.generate_legal_moves())
+            moves = [move.pack() for move in board.generate_staged_moves()]
+            self.assertEqual(len(moves), len(set(moves)))
+            self.assertEqual(expected, sorted(moves))
+
+        # Table move first, then the winning capture, the killer, the quiet moves by
+        # history and the losing capture of the defended pawn last.
+        board = Board("7k/8/4p3/r2p4/8/8/3Q4/4K3 w - - 0 1")
+        table_move = board.parse_uci("e1f1").pack()
+        killer = board.parse_uci("d2d4").pack()
+        history = [0] * 64 * 64
+        history[51 * 64 + 43] = 10
+        moves = [
+            move.pack()
+            for move in board.generate_staged_moves(table_move, (killer, 0), history)
+        ]
+        self.assertEqual(table_move, moves[0])
+        self.assertEqual(board.parse_uci("d2a5").pack(), moves[1])
+        self.assertEqual(killer, moves[2])
+        self.assertEqual(board.parse_uci("d2d3").pack(), moves[3])
+        self.assertEqual(board.parse_uci("d2d5").pack(), moves[-1])
+        self.assertFalse(any(move & CAPTURE_FLAG for move in moves[2:-1]))
+
+        # Illegal table and killer moves are skipped.
+        moves = list(board.generate_staged_moves(encode_move(60, 44), (encode_move(51, 36),)))
+        self.assertEqual(len(board.generate_legal_moves()), len(moves))
+
+    def test_generate_staged_moves_ignores_noisy_killers(self) -> None:
+        for fen, killers in (
+            ("7k/8/4p3/r2p4/8/8/3Q4/4K3 w - - 0 1", ("d2a5", "d2d5")),
+            ("7k/1P6/8/8/8/8/8/4K3 w - - 0 1", ("b7b8q", "b7b8n")),
+        ):
+            board = Board(fen)
+            killers = [board.parse_uci(killer).pack() for killer in killers]
+            moves = [move.pack() for move in board.generate_staged_moves(0, killers)]
+            self.assertEqual(len(moves), len(set(moves)))
+            self.assertEqual(len(board.generate_legal_moves()), len(moves))
+
+    def test_generate_staged_moves_is_lazy(self) -> None:
+        board = Board("7k/8/4p3/r2p4/8/8/3Q4/4K3 w - - 0 1")
+        kinds = []
+        generate_moves = board._generate_moves
+
+        def record(buffer, start=0, kinds_=ALL_MOVES, only_from=None, checks_and_pins=None):
+            if only_from is None:
+                kinds.append(kinds_)
+            return generate_moves(buffer, start, kinds_, only_from, checks_and_pins)
+
+        board._generate_moves = record
+        moves = board.generate_staged_moves()
+        next(moves)
+        self.assertEqual([CAPTURES], kinds)
+        list(moves)
+        self.assertEqual([CAPTURES, PROMOTIONS, QUIETS], kinds)
+
+    def test_null_move(self) -> None:
+        board = Board("4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1", debug=True)
+        key = board.zobrist_key
+
+        board.make_null_move()
+        self.assertEqual(Alliance.WHITE, board.active_player)
+        self.assertEqual("4k3/8/8/8/3pP3/8/8/4K3 w - - 0 2", board.to_fen())
+        board.make_null_move()
+        # Repetitions are not counted across a null move.
+        self.assertEqual(0, board.count_repetitions())
+
+        board.unmake_null_move()
+        board.unmake_null_move()
+        self.assertEqual("4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1", board.to_fen())
+        self.assertEqual(key, board.zobrist_key)
+        self.assertEqual([], board.history)
+
+    def test_has_non_pawn_material(self) -> None:
+        board = Board("4k3/4p3/8/8/8/8/3PN3/4K3 w - - 0 1")
+        self.assertTrue(board.has_non_pawn_material(Alliance.WHITE))
+        self.assertFalse(board.has_non_pawn_material(Alliance.BLACK))
+
 
 def main() -> None:
     test = TestBoard()
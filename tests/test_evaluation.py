@@ -0,0 +1,136 @@
+import importlib.util
+from unittest import TestCase, skipUnless
+
+from chess.engine.alliance import Alliance
+from chess.engine.board import DEFAULT_BOARD_STATE, Board
+from chess.engine.evaluation import (
+    MAX_PHASE,
+    evaluate,
+    evaluate_batch,
+    evaluate_squares,
+    get_mobility,
+    taper,
+    to_array,
+    to_planes,
+)
+from chess.engine.perft import FEN_EXAMPLES, perft
+from chess.engine.position import Position
+from chess.engine.pst import compute_scores
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def mirror(fen_string: str) -> str:
+    placement, active_player, castling, _, halfmove, fullmove = fen_string.split()
+    placement = "/".join(reversed(placement.split("/"))).swapcase()
+    active_player = "b" if active_player == "w" else "w"
+    castling = "".join(sorted(castling.swapcase())) if castling != "-" else "-"
+    return " ".join((placement, active_player, castling, "-", halfmove, fullmove))
+
+
+class TestEvaluation(TestCase):
+    def setUp(self) -> None:
+        self.fen_strings = [example["fen"] for example in FEN_EXAMPLES]
+
+    def test_start_position_is_equal(self) -> None:
+        self.assertEqual(0, evaluate(Board(DEFAULT_BOARD_STATE)))
+
+    def test_mirrored_positions_score_the_same(self) -> None:
+        for fen_string in self.fen_strings:
+            self.assertEqual(evaluate(Board(fen_string)), evaluate(Board(mirror(fen_string))))
+
+    def test_evaluate_without_mobility(self) -> None:
+        for fen_string in self.fen_strings:
+            board = Board(fen_string)
+            squares = board.get_squares()
+            score = evaluate(board) - evaluate(board, mobility=False)
+            if board.active_player == Alliance.BLACK:
+                score = -score
+            self.assertEqual(get_mobility(squares), score)
+
+    def test_taper(self) -> None:
+        self.assertEqual(100, taper(100, 200, MAX_PHASE))
+        self.assertEqual(200, taper(100, 200, 0))
+        self.assertEqual(150, taper(100, 200, MAX_PHASE // 2))
+        self.assertEqual(100, taper(100, 200, MAX_PHASE + 8))
+        self.assertEqual(-taper(7, 0, 1), taper(-7, 0, 1))
+
+    def test_king_centralisation_in_the_endgame(self) -> None:
+        centre = evaluate(Board("4k3/8/8/8/3K4/8/8/8 w - - 0 1"))
+        corner = evaluate(Board("4k3/8/8/8/8/8/8/K7 w - - 0 1"))
+        self.assertGreater(centre, corner)
+
+    def test_mobility(self) -> None:
+        # The white rook reaches a2 to a4 and takes on a5 but not its own king on b1;
+        # the black rook reaches a6 to a8, b5 to h5 and a4 to a2 and takes on a1.
+        squares = Board("4k3/8/8/r7/8/8/8/RK6 w - - 0 1").get_squares()
+        white_rook = 4 * 2
+        black_rook = (3 + 7 + 3 + 1) * 2
+        self.assertEqual(white_rook - black_rook, get_mobility(squares))
+
+    def test_incremental_scores_match_full_scores(self) -> None:
+        for fen_string in self.fen_strings[:9]:
+            board = Board(fen_string, debug=True)
+            perft(board, 2)
+            expected = compute_scores(board.get_squares())
+            self.assertEqual(expected, (board.middlegame_score, board.endgame_score, board.phase))
+
+    def test_promotion_and_en_passant_update_scores(self) -> None:
+        board = Board("4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1", debug=True)
+        start = (board.middlegame_score, board.endgame_score, board.phase)
+
+        board.make_move(board.parse_uci("e5d6"))
+        # White took a pawn, so both sums gain at least most of a pawn.
+        self.assertGreater(board.middlegame_score, start[0] + 50)
+        self.assertGreater(board.endgame_score, start[1] + 50)
+        board.make_move(board.parse_uci("e8f7"))
+        board.make_move(board.parse_uci("b7b8q"))
+        self.assertEqual(start[2] + 4, board.phase)
+        self.assertEqual(evaluate_squares(board.get_squares()), -evaluate(board))
+
+        for _ in range(3):
+            board.unmake_move()
+        self.assertEqual(start, (board.middlegame_score, board.endgame_score, board.phase))
+
+    def test_copy_keeps_scores(self) -> None:
+        board = Board(self.fen_strings[1])
+        board.make_move(board.generate_legal_moves()[0])
+        copied = board.copy()
+        scores = (board.middlegame_score, board.endgame_score, board.phase)
+        self.assertEqual(scores, (copied.middlegame_score, copied.endgame_score, copied.phase))
+        copied.verify_scores()
+
+    def test_debug_detects_score_desync(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE, debug=True)
+        board.middlegame_score += 1
+
+        with self.assertRaises(RuntimeError):
+            board.make_move(board.parse_uci("e2e4"))
+
+    @skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_batch_matches_evaluate_squares(self) -> None:
+        boards = [Board(fen_string) for fen_string in self.fen_strings]
+        for board in boards[:3]:
+            for move in board.generate_legal_moves()[:5]:
+                board.make_move(move)
+                boards.append(board.copy())
+                board.unmake_move()
+
+        expected = [evaluate_squares(board.get_squares()) for board in boards]
+        codes = to_array(boards)
+        self.assertEqual((len(boards), 64), codes.shape)
+        self.assertEqual(expected, evaluate_batch(codes).tolist())
+
+        planes = to_array(boards, planes=True)
+        self.assertEqual((len(boards), 12, 64), planes.shape)
+        self.assertEqual(expected, evaluate_batch(planes).tolist())
+        self.assertTrue((to_planes(codes) == planes).all())
+
+    @skipUnless(HAS_NUMPY, "NumPy is not installed")
+    def test_to_array_inputs(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        from_fen = to_array([DEFAULT_BOARD_STATE])
+        self.assertTrue((from_fen == to_array([board])).all())
+        self.assertTrue((from_fen == to_array([Position.from_board(board)])).all())
+        self.assertEqual([-4, -2, -3, -5, -6, -3, -2, -4], from_fen[0, :8].tolist())
+        self.assertEqual([4, 2, 3, 5, 6, 3, 2, 4], from_fen[0, 56:].tolist())
@@ -0,0 +1,100 @@
+import io
+from unittest import TestCase
+
+from chess.engine.alliance import Alliance
+from chess.engine.board import DEFAULT_BOARD_STATE, Board, format_placement, parse_placement
+from chess.engine.perft import FEN_EXAMPLES
+from chess.engine.position import Position
+from chess.io.fen import (
+    EpdRecord,
+    format_epd,
+    format_epds,
+    format_fens,
+    parse_epd,
+    parse_epds,
+    parse_fen,
+    parse_fens,
+)
+
+EPD_LINE = (
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - "
+    'bm Bb5 Bc4; am Ng5; id "test.1"; c0 "develop; then castle";'
+)
+
+
+class TestFen(TestCase):
+    def test_placement_round_trip(self) -> None:
+        for example in FEN_EXAMPLES:
+            placement = example["fen"].split()[0]
+            squares = parse_placement(placement)
+            self.assertEqual(64, len(squares))
+            self.assertEqual(placement, format_placement(squares))
+
+    def test_parse_fen_matches_board(self) -> None:
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            position = parse_fen(example["fen"])
+            self.assertEqual(Position.from_board(board), position)
+            self.assertEqual(example["fen"], position.to_fen())
+            self.assertEqual(example["fen"], board.to_fen())
+
+    def test_invalid_fen(self) -> None:
+        invalid = (
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQQBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQxq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e9 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -",
+        )
+        for fen_string in invalid:
+            with self.assertRaises(ValueError, msg=fen_string):
+                parse_fen(fen_string)
+
+        with self.assertRaises(ValueError):
+            Board("8/8/8/8/8/8/8/4K3 w - - 0 1")
+
+    def test_parse_epd(self) -> None:
+        record = parse_epd(EPD_LINE)
+        self.assertEqual(("Bb5", "Bc4"), record.best_moves)
+        self.assertEqual(("Ng5",), record.avoid_moves)
+        self.assertEqual("test.1", record.id)
+        self.assertEqual("develop; then castle", record.comment)
+        self.assertEqual(Alliance.WHITE, record.position.active_player)
+        self.assertEqual((0, 1), (record.position.halfmove_clock, record.position.fullmove_number))
+
+        self.assertEqual(EPD_LINE, format_epd(record))
+        self.assertEqual(record, parse_epd(format_epd(record)))
+
+    def test_epd_clocks_and_empty_operations(self) -> None:
+        record = parse_epd("4k3/8/8/8/8/8/8/4K3 b - - hmvc 12; fmvn 40;")
+        self.assertEqual((12, 40), (record.position.halfmove_clock, record.position.fullmove_number))
+        self.assertEqual("4k3/8/8/8/8/8/8/4K3 b - - 12 40", record.position.to_fen())
+        self.assertEqual((), record.best_moves)
+        self.assertIsNone(record.id)
+
+        record = parse_epd("4k3/8/8/8/8/8/8/4K3 w - -")
+        self.assertEqual({}, record.operations)
+        self.assertEqual("4k3/8/8/8/8/8/8/4K3 w - -", format_epd(record))
+
+        for line in ("4k3/8/8/8/8/8/8/4K3 w - - bm Kd2", '4k3/8/8/8/8/8/8/4K3 w - - id "x', "4k3/8 w"):
+            with self.assertRaises(ValueError, msg=line):
+                parse_epd(line)
+
+    def test_batches(self) -> None:
+        fen_strings = [example["fen"] for example in FEN_EXAMPLES]
+        stream = io.StringIO("\n".join(fen_strings) + "\n\n")
+        positions = list(parse_fens(stream))
+        self.assertEqual(len(fen_strings), len(positions))
+        self.assertEqual(fen_strings, list(format_fens(positions)))
+
+        records = list(parse_epds([EPD_LINE, "", "4k3/8/8/8/8/8/8/4K3 w - - id \"end\";"]))
+        self.assertTrue(all(isinstance(record, EpdRecord) for record in records))
+        self.assertEqual(["test.1", "end"], [record.id for record in records])
+        self.assertEqual(EPD_LINE, next(format_epds(records)))
+
+    def test_position_to_board(self) -> None:
+        board = parse_fen(DEFAULT_BOARD_STATE).to_board()
+        self.assertEqual(20, len(board.generate_legal_moves()))
@@ -0,0 +1,43 @@
+import copy
+from unittest import TestCase
+
+from chess.engine.board import DEFAULT_BOARD_STATE, Board
+from chess.engine.memory import MOVES_PER_SAMPLE, run_benchmark
+from chess.engine.move import AttackMove, CastleMove, EnPassantAttackMove, Move, PawnJumpMove, PromotionMove
+from chess.engine.pieces import Bishop, King, Knight, Pawn, Piece, Queen, Rook
+
+
+class TestMemory(TestCase):
+    def test_pieces_and_moves_have_no_dict(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        for piece in board.state:
+            if piece is not None:
+                self.assertFalse(hasattr(piece, "__dict__"))
+        for move in board.generate_legal_moves():
+            self.assertFalse(hasattr(move, "__dict__"))
+
+        for move_class in (Move, AttackMove, CastleMove, PromotionMove, PawnJumpMove, EnPassantAttackMove):
+            self.assertIn("__slots__", move_class.__dict__)
+
+    def test_abbreviations(self) -> None:
+        for piece_class, letter in ((King, "K"), (Queen, "Q"), (Rook, "R"), (Bishop, "B"), (Knight, "N"), (Pawn, "P")):
+            for abbreviation in (letter, letter.lower()):
+                piece = Piece.from_abbreviation(0, abbreviation)
+                self.assertIsInstance(piece, piece_class)
+                self.assertEqual(abbreviation, piece.abbreviation)
+
+    def test_deepcopy(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        board.make_move(board.parse_uci("e2e4"))
+        copied = copy.deepcopy(board)
+
+        self.assertEqual(board.to_fen(), copied.to_fen())
+        self.assertIsNot(board.state[36], copied.state[36])
+        self.assertEqual(1, copied.state[36].move_count)
+
+    def test_benchmark(self) -> None:
+        results = run_benchmark(boards=50, moves=1000, copies=20)
+
+        self.assertGreater(results["bytes_per_board"], 0)
+        self.assertGreater(results[f"bytes_per_{MOVES_PER_SAMPLE}_moves"], 0)
+        self.assertLess(results["copy_bytes"], results["deepcopy_bytes"])
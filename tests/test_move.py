@@ -0,0 +1,61 @@
+from array import array
+from unittest import TestCase
+
+from chess.engine.board import MAX_MOVES, Board
+from chess.engine.move import (
+    CAPTURE_FLAG,
+    CASTLE_FLAG,
+    EN_PASSANT_FLAG,
+    PAWN_JUMP_FLAG,
+    AttackMove,
+    CastleMove,
+    EnPassantAttackMove,
+    PawnJumpMove,
+    PromotionMove,
+    decode_move,
+    encode_move,
+    packed_to_uci,
+)
+from chess.engine.perft import FEN_EXAMPLES
+
+
+class TestPackedMove(TestCase):
+    def test_encode_and_decode(self) -> None:
+        packed = encode_move(12, 4, CAPTURE_FLAG, 3)
+
+        self.assertEqual((12, 4, CAPTURE_FLAG, 3), decode_move(packed))
+        self.assertEqual("e7e8r", packed_to_uci(packed))
+        self.assertEqual("e2e4", packed_to_uci(encode_move(52, 36, PAWN_JUMP_FLAG)))
+        self.assertNotEqual(0, encode_move(0, 0, CASTLE_FLAG))
+        self.assertLess(encode_move(63, 63, sum((CAPTURE_FLAG, EN_PASSANT_FLAG, CASTLE_FLAG)), 7), 1 << 22)
+
+    def test_generate_moves_matches_move_objects(self) -> None:
+        buffer = array("I", bytes(2 * MAX_MOVES * 4))
+        for example in FEN_EXAMPLES:
+            board = Board(example["fen"])
+            end = board.generate_moves(buffer, MAX_MOVES)
+            packed_moves = list(buffer[MAX_MOVES:end])
+            moves = board.generate_legal_moves()
+
+            self.assertEqual(packed_moves, [move.pack() for move in moves])
+            self.assertEqual(
+                [packed_to_uci(packed) for packed in packed_moves],
+                [move.to_uci() for move in moves],
+            )
+            self.assertEqual(example["fen"], board.to_fen())
+
+    def test_create_move(self) -> None:
+        board = Board("r3k2r/1P6/8/2pP4/8/8/4P3/R3K2R w KQkq c6 0 1")
+        moves = {move.to_uci(): move for move in board.generate_legal_moves()}
+
+        self.assertIsInstance(moves["e1g1"], CastleMove)
+        self.assertFalse(moves["e1c1"].is_king_side)
+        self.assertIsInstance(moves["d5c6"], EnPassantAttackMove)
+        self.assertEqual(26, moves["d5c6"].attacked_piece.position)
+        self.assertIsInstance(moves["e2e4"], PawnJumpMove)
+        self.assertIsInstance(moves["b7a8n"], PromotionMove)
+        self.assertEqual("r", moves["b7a8n"].attacked_piece.abbreviation)
+        self.assertIsInstance(moves["a1a8"], AttackMove)
+
+        board.make_packed_move(moves["b7b8q"].pack())
+        self.assertEqual("rQ2k2r/8/8/2pP4/8/8/4P3/R3K2R b KQkq - 0 1", board.to_fen())
@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+from chess.engine.board import Board
+from chess.engine.move import PromotionMove
+from chess.engine.ordering import (
+    KILLER_SCORE,
+    MoveOrdering,
+    is_capture,
+    is_losing_capture,
+    is_quiet,
+)
+
+
+class TestMoveOrdering(TestCase):
+    def test_mvv_lva(self) -> None:
+        # The queen on d5 can be taken by the pawn, the knight and the rook.
+        board = Board("4k3/8/8/3q4/4P3/2N5/3R4/4K3 w - - 0 1")
+        moves = MoveOrdering().order_moves(board.generate_legal_moves())
+
+        self.assertEqual(["e4d5", "c3d5", "d2d5"], [move.to_uci() for move in moves[:3]])
+        self.assertTrue(all(is_quiet(move) for move in moves[3:]))
+
+    def test_losing_captures_come_last(self) -> None:
+        # Taking the pawn on d5 with the queen loses her to the pawn on c6.
+        board = Board("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+        losing_capture = board.parse_uci("d1d5")
+        self.assertTrue(is_losing_capture(board, losing_capture))
+
+        moves = MoveOrdering().order_moves(board.generate_legal_moves(), board=board)
+        self.assertEqual("d1d5", moves[-1].to_uci())
+        moves = MoveOrdering().order_moves(board.generate_legal_moves())
+        self.assertEqual("d1d5", moves[0].to_uci())
+
+        board = Board("4k3/8/8/3q4/4P3/2N5/3R4/4K3 w - - 0 1")
+        self.assertFalse(is_losing_capture(board, board.parse_uci("d2d5")))
+        self.assertFalse(is_losing_capture(board, board.parse_uci("e1f1")))
+
+    def test_promotions_by_type(self) -> None:
+        board = Board("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+        moves = MoveOrdering().order_moves(board.generate_legal_moves())
+
+        self.assertEqual(["b7b8q", "b7b8r", "b7b8b", "b7b8n"], [move.to_uci() for move in moves[:4]])
+        self.assertTrue(all(isinstance(move, PromotionMove) for move in moves[:4]))
+
+    def test_table_move_first(self) -> None:
+        board = Board("4k3/8/8/3q4/4P3/2N5/3R4/4K3 w - - 0 1")
+        quiet_move = board.parse_uci("e1f1")
+        moves = MoveOrdering().order_moves(board.generate_legal_moves(), 0, quiet_move.pack())
+
+        self.assertEqual("e1f1", moves[0].to_uci())
+
+    def test_killers_and_history(self) -> None:
+        board = Board("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+        ordering = MoveOrdering()
+        moves = board.generate_legal_moves()
+        killer = board.parse_uci("a1a7")
+        tried = [move for move in moves if move.to_uci() in ("a1a2", "a1a3")]
+
+        ordering.update(killer, 3, 2, tried + [killer])
+
+        self.assertEqual(KILLER_SCORE, ordering.score_move(killer, 2))
+        self.assertEqual(9, ordering.score_move(killer, 3))
+        self.assertEqual("a1a7", ordering.order_moves(moves, 2)[0].to_uci())
+
+        # A second killer shifts the first into the other slot.
+        second = board.parse_uci("a1a8")
+        ordering.update(second, 3, 2, [])
+        self.assertEqual(KILLER_SCORE, ordering.score_move(second, 2))
+        self.assertEqual(KILLER_SCORE - 1, ordering.score_move(killer, 2))
+
+    def test_captures_do_not_become_killers(self) -> None:
+        board = Board("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        ordering = MoveOrdering()
+        capture = board.parse_uci("d2d5")
+
+        self.assertTrue(is_capture(capture))
+        ordering.update(capture, 4, 0, [])
+        self.assertEqual([0, 0], ordering.killers[0])
+
+    def test_order_captures(self) -> None:
+        board = Board("4k3/8/8/3q4/4P3/2N5/3R4/4K3 w - - 0 1")
+        captures = MoveOrdering().order_captures(board.generate_legal_moves())
+
+        self.assertEqual(["e4d5", "c3d5", "d2d5"], [move.to_uci() for move in captures])
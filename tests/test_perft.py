@@ -0,0 +1,62 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from chess.engine.board import Board, DEFAULT_BOARD_STATE
+from chess.engine.perft import (
+    divide,
+    get_examples,
+    main,
+    parallel_divide,
+    parallel_perft,
+    perft,
+    run_benchmark,
+)
+
+
+class TestPerft(TestCase):
+    def test_initial_position(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        self.assertEqual([1, 20, 400, 8902], [perft(board, depth) for depth in range(4)])
+        self.assertEqual(DEFAULT_BOARD_STATE, board.to_fen())
+
+    def test_divide(self) -> None:
+        board = Board("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        counts = divide(board, 2)
+
+        self.assertEqual(26, len(counts))
+        self.assertEqual(perft(board, 2), sum(counts.values()))
+        self.assertIn("e1g1", counts)
+        self.assertIn("e1c1", counts)
+
+    def test_quick_tier(self) -> None:
+        results = run_benchmark("quick")
+
+        self.assertEqual(len(get_examples("quick")), len(results))
+        for result in results:
+            self.assertTrue(result["passed"], result["fen"])
+
+    def test_tiers_are_nested(self) -> None:
+        quick, medium, full = (len(get_examples(tier)) for tier in ("quick", "medium", "full"))
+        self.assertLess(quick, medium)
+        self.assertLess(medium, full)
+
+    def test_bench_writes_json(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "perft.json"
+            self.assertEqual(0, main(["bench", "--tier", "quick", "--output", str(path)]))
+
+            data = json.loads(path.read_text())
+            self.assertTrue(data["passed"])
+            self.assertEqual("quick", data["tier"])
+            self.assertEqual(len(get_examples("quick")), len(data["results"]))
+
+    def test_parallel_divide(self) -> None:
+        fen_string = "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1"
+        expected = divide(Board(fen_string), 3)
+
+        self.assertEqual(expected, parallel_divide(fen_string, 3, jobs=2))
+        # Few root moves per worker forces the split to happen at depth 2.
+        self.assertEqual(expected, parallel_divide(fen_string, 3, jobs=8))
+        self.assertEqual(sum(expected.values()), parallel_perft(fen_string, 3, jobs=2))
@@ -0,0 +1,132 @@
+import io
+import random
+from unittest import TestCase
+
+from chess.engine.board import DEFAULT_BOARD_STATE, Board
+from chess.io.pgn import format_game, parse_san, read_games, read_headers, to_san
+
+OPERA_GAME = """[Event "Paris"]
+[Site "Paris FRA"]
+[Date "1858.??.??"]
+[Round "?"]
+[White "Paul Morphy"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+[ECO "C41"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move
+[already].} 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5 $2
+10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 (13... Nxd7 14. Qb3 ;line
+) 14. Rd1 Qe6 15. Bxd7+ Nxd7 16. Qb8+ Nxb8 17. Rd8# 1-0
+
+[Event "Second"]
+[Result "*"]
+[FEN "4k3/1P6/8/8/8/8/8/4K3 w - - 0 1"]
+
+1. b8=Q+ Kd7 *
+"""
+
+
+class TestPgn(TestCase):
+    def test_read_games(self) -> None:
+        games = list(read_games(io.StringIO(OPERA_GAME)))
+
+        self.assertEqual(2, len(games))
+        opera, second = games
+        self.assertEqual("Paul Morphy", opera.headers["White"])
+        self.assertEqual("C41", opera.headers["ECO"])
+        self.assertEqual("1-0", opera.result)
+        self.assertEqual(33, len(opera.moves))
+        self.assertEqual(["e4", "e5", "Nf3"], opera.moves[:3])
+        self.assertEqual(["Rxd7", "Rxd7", "Rd1"], opera.moves[24:27])
+        self.assertEqual("Rd8#", opera.moves[-1])
+
+        self.assertEqual(["b8=Q+", "Kd7"], second.moves)
+        self.assertEqual("*", second.result)
+
+    def test_replay(self) -> None:
+        opera = next(read_games(io.StringIO(OPERA_GAME)))
+        board = opera.get_board()
+        for _ in opera.replay(board):
+            pass
+
+        self.assertEqual("1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k - 1 17", board.to_fen())
+        self.assertTrue(board.is_checked(board.active_player))
+        self.assertFalse(board.active_player_can_move())
+
+    def test_read_headers_only(self) -> None:
+        headers = list(read_headers(io.StringIO(OPERA_GAME)))
+
+        self.assertEqual(["Paris", "Second"], [header["Event"] for header in headers])
+        games = list(read_games(io.StringIO(OPERA_GAME), headers_only=True))
+        self.assertEqual([[], []], [game.moves for game in games])
+        self.assertEqual(["1-0", "*"], [game.result for game in games])
+
+    def test_parse_san(self) -> None:
+        board = Board("r3k2r/1P6/8/8/8/2N3N1/8/R3K2R w KQkq - 0 1")
+
+        self.assertEqual("e1g1", parse_san(board, "O-O").to_uci())
+        self.assertEqual("e1c1", parse_san(board, "0-0-0").to_uci())
+        self.assertEqual("b7a8n", parse_san(board, "bxa8=N").to_uci())
+        self.assertEqual("b7b8q", parse_san(board, "b8Q+").to_uci())
+        self.assertEqual("c3e4", parse_san(board, "Nce4!?").to_uci())
+        with self.assertRaises(ValueError):
+            parse_san(board, "Ne4")
+        with self.assertRaises(ValueError):
+            parse_san(board, "Ke3e4")
+        with self.assertRaises(ValueError):
+            parse_san(board, "Qd1")
+
+    def test_san_round_trip(self) -> None:
+        generator = random.Random(3)
+        board = Board(DEFAULT_BOARD_STATE)
+        for _ in range(200):
+            moves = board.generate_legal_moves()
+            if not moves or board.is_draw():
+                break
+            for move in moves:
+                san = to_san(board, move)
+                self.assertEqual(move.pack(), parse_san(board, san).pack(), san)
+            board.make_move(generator.choice(moves))
+
+    def test_disambiguation(self) -> None:
+        board = Board("4k3/8/8/8/R6R/8/8/R3K3 w - - 0 1")
+        sans = {to_san(board, move) for move in board.generate_legal_moves()}
+
+        self.assertIn("Rae4+", sans)
+        self.assertIn("Rhe4+", sans)
+        self.assertIn("R4a2", sans)
+        self.assertIn("R1a2", sans)
+        self.assertIn("Ra8+", sans)
+
+    def test_write_and_read_back(self) -> None:
+        opera = next(read_games(io.StringIO(OPERA_GAME)))
+        moves = [move.pack() for _, move in opera.replay()]
+        text = format_game(opera.headers, moves)
+
+        self.assertTrue(text.startswith('[Event "Paris"]\n[Site "Paris FRA"]'))
+        self.assertIn('[ECO "C41"]', text)
+        self.assertTrue(all(len(line) <= 80 for line in text.splitlines()))
+        self.assertTrue(text.rstrip().endswith("17. Rd8# 1-0"))
+
+        again = next(read_games(io.StringIO(text)))
+        self.assertEqual(opera.moves, again.moves)
+        self.assertEqual(opera.headers, again.headers)
+
+    def test_escaped_header_round_trip(self) -> None:
+        headers = {"Event": 'Club "Open"', "Site": "C:\\Games\\", "Result": "*"}
+        text = format_game(headers, [])
+
+        self.assertIn('[Event "Club \\"Open\\""]', text)
+        self.assertIn('[Site "C:\\\\Games\\\\"]', text)
+        game = next(read_games(io.StringIO(text)))
+        self.assertEqual('Club "Open"', game.headers["Event"])
+        self.assertEqual("C:\\Games\\", game.headers["Site"])
+
+    def test_write_from_position(self) -> None:
+        board = Board("4k3/8/8/8/8/8/8/R3K3 b - - 0 1")
+        moves = [parse_san(board, "Kd7")]
+        text = format_game({"Result": "*", "FEN": board.to_fen(), "SetUp": "1"}, moves, board)
+
+        self.assertIn("1... Kd7 *", text)
+        self.assertIn('[White "?"]', text)
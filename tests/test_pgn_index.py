@@ -0,0 +1,108 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from chess.io.pgn import read_games
+from chess.io.pgn_index import PgnIndex, build_index, get_index_path, open_index
+
+GAMES = """[Event "First"]
+[White "Morphy, Paul"]
+[Black "Duke Karl"]
+[Result "1-0"]
+[Date "1858.11.02"]
+[ECO "C41"]
+
+1. e4 e5 2. Nf3 d6 {a comment
+[on two lines]} 3. d4 1-0
+
+[Event "Second"]
+[White "Anderssen, Adolf"]
+[Black "Kieseritzky, Lionel"]
+[Result "1-0"]
+[Date "1851.06.21"]
+[ECO "C33"]
+
+1. e4 e5 2. f4 exf4 1-0
+
+[Event "Third"]
+[White "A very long player name that does not fit"]
+[Black "Morphy, Paul"]
+[Result "1/2-1/2"]
+
+1. d4 d5 1/2-1/2
+"""
+
+ESCAPED_GAME = r"""[White "O'Kelly \"The Count\""]
+[Black "C:\\Games"]
+
+1. e4 *
+"""
+
+
+class TestPgnIndex(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.pgn_path = Path(directory.name) / "games.pgn"
+        self.pgn_path.write_text(GAMES, encoding="utf-8")
+
+    def test_build_and_read(self) -> None:
+        with build_index(self.pgn_path) as index:
+            self.assertTrue(get_index_path(self.pgn_path).exists())
+            self.assertEqual(3, len(index))
+
+            games = list(read_games(self.pgn_path))
+            for number, game in enumerate(games):
+                self.assertEqual(game, index.read_game(number))
+            self.assertEqual("Third", index.read_game(-1).headers["Event"])
+
+            self.assertEqual(
+                {"White": "Morphy, Paul", "Black": "Duke Karl", "Result": "1-0", "Date": "1858.11.02", "ECO": "C41"},
+                index.get_headers(0),
+            )
+            self.assertEqual("", index.get_field(2, "ECO"))
+            self.assertEqual(32, len(index.get_field(2, "White")))
+            with self.assertRaises(IndexError):
+                index.read_game(3)
+
+    def test_filter(self) -> None:
+        with open_index(self.pgn_path) as index:
+            self.assertEqual([0, 1], index.filter(Result="1-0"))
+            self.assertEqual([0], index.filter(White="Morphy"))
+            self.assertEqual([2], index.filter(Black="Morphy, Paul"))
+            self.assertEqual([1], index.filter(Date="1851", ECO="C3"))
+            self.assertEqual([2], index.filter(White="A very long player name that does not fit at all"))
+            self.assertEqual([], index.filter(ECO="B"))
+            with self.assertRaises(KeyError):
+                index.filter(Event="First")
+
+    def test_escaped_header_values(self) -> None:
+        self.pgn_path.write_text(ESCAPED_GAME, encoding="utf-8")
+        with build_index(self.pgn_path) as index:
+            headers = index.read_game(0).headers
+            self.assertEqual(headers["White"], index.get_field(0, "White"))
+            self.assertEqual(headers["Black"], index.get_field(0, "Black"))
+            self.assertEqual("O'Kelly \"The Count\"", index.get_field(0, "White"))
+            self.assertEqual([0], index.filter(White="O'Kelly \"The", Black="C:\\Games"))
+
+    def test_open_index_rebuilds_stale_index(self) -> None:
+        build_index(self.pgn_path).close()
+        with open(self.pgn_path, "a", encoding="utf-8") as stream:
+            stream.write('\n[Event "Fourth"]\n[Result "0-1"]\n\n1. f3 e5 2. g4 Qh4# 0-1\n')
+
+        with open_index(self.pgn_path) as index:
+            self.assertEqual(4, len(index))
+            self.assertEqual(["f3", "e5", "g4", "Qh4#"], index.read_game(3).moves)
+
+    def test_empty_file(self) -> None:
+        self.pgn_path.write_text("")
+        with build_index(self.pgn_path) as index:
+            self.assertEqual(0, len(index))
+            self.assertEqual([], index.filter(Result="1-0"))
+
+    def test_not_an_index(self) -> None:
+        index_path = get_index_path(self.pgn_path)
+        index_path.write_bytes(os.urandom(64))
+        with self.assertRaises(ValueError):
+            PgnIndex(self.pgn_path, index_path)
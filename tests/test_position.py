@@ -0,0 +1,118 @@
+import random
+from unittest import TestCase
+
+from chess.engine.board import DEFAULT_BOARD_STATE, Board
+from chess.engine.perft import FEN_EXAMPLES
+from chess.engine.position import GameHistory, Position
+
+
+def play_random_game(board: Board, plies: int, seed: int = 1) -> list[Position]:
+    generator = random.Random(seed)
+    positions = [Position.from_board(board)]
+    for _ in range(plies):
+        moves = board.generate_legal_moves()
+        if not moves:
+            break
+        board.make_move(generator.choice(moves))
+        positions.append(Position.from_board(board))
+    return positions
+
+
+class TestPosition(TestCase):
+    def test_fen_round_trip(self) -> None:
+        for example in FEN_EXAMPLES:
+            position = Position.from_fen(example["fen"])
+
+            self.assertEqual(example["fen"], position.to_fen())
+            self.assertEqual(position, Position.from_board(Board(example["fen"])))
+            self.assertEqual(Board(example["fen"]).zobrist_key, position.key)
+            self.assertEqual(example["fen"], position.to_board().to_fen())
+
+    def test_hashable_and_immutable(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        first = Position.from_board(board)
+        board.make_move(board.parse_uci("g1f3"))
+        board.make_move(board.parse_uci("g8f6"))
+        board.make_move(board.parse_uci("f3g1"))
+        board.make_move(board.parse_uci("f6g8"))
+
+        again = Position.from_board(board)
+        self.assertEqual(first.key, again.key)
+        self.assertEqual(first.squares, again.squares)
+        self.assertEqual(2, len({first, again}))
+        self.assertEqual(1, len({first.key, again.key}))
+        with self.assertRaises(AttributeError):
+            first.halfmove_clock = 3
+
+    def test_to_board_plays_on(self) -> None:
+        position = Position.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        board = position.to_board()
+        board.make_move(board.parse_uci("e1g1"))
+
+        self.assertEqual("r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 1", board.to_fen())
+        self.assertEqual("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", position.to_fen())
+
+
+class TestGameHistory(TestCase):
+    def test_random_access(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        history = GameHistory.from_board(board, keyframe_interval=4)
+        generator = random.Random(7)
+        positions = [Position.from_board(board)]
+        for _ in range(50):
+            move = generator.choice(board.generate_legal_moves())
+            history.append(move)
+            board.make_move(move)
+            positions.append(Position.from_board(board))
+
+        self.assertEqual(len(positions), len(history))
+        self.assertEqual(13, len(history.keyframes))
+        for ply in generator.sample(range(len(positions)), len(positions)):
+            self.assertEqual(positions[ply], history[ply])
+        self.assertEqual(positions, list(history))
+        self.assertEqual(positions[-1], history[-1])
+        with self.assertRaises(IndexError):
+            history[len(positions)]
+
+    def test_truncate(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        history = GameHistory.from_board(board, keyframe_interval=4)
+        positions = [Position.from_board(board)]
+        for uci in ("e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5a4"):
+            move = board.parse_uci(uci)
+            history.append(move)
+            board.make_move(move)
+            positions.append(Position.from_board(board))
+
+        history[7]
+        history.truncate(5)
+        self.assertEqual(5, len(history))
+        self.assertEqual(2, len(history.keyframes))
+        self.assertEqual(positions[4], history[4])
+
+        board = history[4].to_board()
+        move = board.parse_uci("f1c4")
+        history.append(move)
+        board.make_move(move)
+        self.assertEqual(Position.from_board(board), history[5])
+
+    def test_undo_then_play_another_move(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        history = GameHistory.from_board(board, keyframe_interval=4)
+        move = board.parse_uci("e2e4")
+        board.make_move(move)
+        history.append(move)
+
+        board.undo()
+        history.truncate(len(board.moves) + 1)
+        self.assertEqual(1, len(history))
+
+        generator = random.Random(3)
+        positions = [Position.from_board(board)]
+        for _ in range(20):
+            move = generator.choice(board.generate_legal_moves())
+            board.make_move(move)
+            history.append(move)
+            positions.append(Position.from_board(board))
+
+        self.assertEqual(positions, list(history))
@@ -0,0 +1,79 @@
+import threading
+from unittest import TestCase
+
+from chess.engine.alliance import Alliance
+from chess.engine.board import Board, DEFAULT_BOARD_STATE
+from chess.engine.player import EnginePlayer
+from chess.engine.search import MATE_THRESHOLD, Search, SearchOptions, evaluate
+
+
+class TestSearch(TestCase):
+    def test_evaluate_is_relative_to_side_to_move(self) -> None:
+        self.assertEqual(0, evaluate(Board(DEFAULT_BOARD_STATE)))
+        score = evaluate(Board("4k3/8/8/8/8/8/8/3QK3 w - - 0 1"))
+        self.assertGreater(score, 900)
+        self.assertEqual(-score, evaluate(Board("4k3/8/8/8/8/8/8/3QK3 b - - 0 1")))
+
+    def test_finds_mate_in_one(self) -> None:
+        board = Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = Search(board).search(max_depth=3)
+
+        self.assertEqual("a1a8", result.best_move.to_uci())
+        self.assertGreater(result.score, MATE_THRESHOLD)
+        self.assertEqual("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", board.to_fen())
+
+    def test_wins_hanging_queen(self) -> None:
+        board = Board("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = Search(board).search(max_depth=2)
+
+        self.assertEqual("d2d5", result.best_move.to_uci())
+        self.assertEqual(result.best_move, result.principal_variation[0])
+        self.assertGreater(result.nodes, 0)
+
+    def test_node_limit_stops_cleanly(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        result = Search(board).search(node_limit=2000)
+
+        self.assertIsNotNone(result.best_move)
+        self.assertLess(result.nodes, 2000 + 1024)
+        self.assertEqual(DEFAULT_BOARD_STATE, board.to_fen())
+        self.assertEqual([], board.history)
+
+    def test_stop_from_another_thread(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        search = Search(board)
+        timer = threading.Timer(0.2, search.stop)
+        timer.start()
+
+        result = search.search()
+        timer.join()
+
+        self.assertIsNotNone(result.best_move)
+        self.assertEqual(DEFAULT_BOARD_STATE, board.to_fen())
+
+    def test_engine_player(self) -> None:
+        board = Board("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        player = EnginePlayer(Alliance.WHITE, max_depth=2)
+
+        self.assertEqual("d2d5", player.choose_move(board).to_uci())
+
+    def test_selective_search_switches(self) -> None:
+        fen = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+        search = Search(Board(fen))
+        result = search.search(max_depth=4)
+        self.assertGreater(search.counters["null_move_searches"], 0)
+        self.assertGreater(search.counters["reductions"], 0)
+
+        options = SearchOptions(False, False, False, False)
+        plain = Search(Board(fen), options=options)
+        plain_result = plain.search(max_depth=4)
+        self.assertTrue(all(count == 0 for count in plain.counters.values()))
+        self.assertLess(result.nodes, plain_result.nodes)
+
+    def test_no_null_move_in_pawn_endings(self) -> None:
+        board = Board("8/5k2/3p4/1p1Pp2p/pP2Pp1P/P4P1K/8/8 b - - 0 1")
+        search = Search(board)
+        search.search(max_depth=5)
+
+        self.assertEqual(0, search.counters["null_move_searches"])
+        self.assertEqual("8/5k2/3p4/1p1Pp2p/pP2Pp1P/P4P1K/8/8 b - - 0 1", board.to_fen())
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from chess.engine.board import Board, DEFAULT_BOARD_STATE
+from chess.engine.perft import FEN_EXAMPLES, perft, perft_with_table
+from chess.engine.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+
+class TestTranspositionTable(TestCase):
+    def test_size_stays_within_budget(self) -> None:
+        table = TranspositionTable(1024 * 1024)
+        self.assertLessEqual(len(table) * table.entry_size(), 1024 * 1024)
+        self.assertGreater(len(table) * table.entry_size(), 512 * 1024)
+
+    def test_store_and_probe(self) -> None:
+        table = TranspositionTable(64 * 1024)
+        table.store(12345, 4, LOWER_BOUND, -37, 0x1234)
+
+        entry = table.probe(12345)
+        self.assertEqual((12345, 4, LOWER_BOUND, -37, 0x1234), tuple(entry))
+        self.assertIsNone(table.probe(54321))
+        self.assertEqual(1, table.hits)
+        self.assertEqual(1, table.misses)
+
+    def test_replacement_scheme(self) -> None:
+        table = TranspositionTable(64 * 1024)
+        buckets = table.bucket_mask + 1
+        deep, shallow, newest = 7, 7 + buckets, 7 + 2 * buckets
+
+        table.store(deep, 8, EXACT, 1)
+        table.store(shallow, 2, UPPER_BOUND, 2)
+        # The deep entry keeps its slot, the always-replace slot takes the newest.
+        table.store(newest, 1, EXACT, 3)
+
+        self.assertIsNotNone(table.probe(deep))
+        self.assertIsNone(table.probe(shallow))
+        self.assertEqual(3, table.probe(newest).score)
+        self.assertEqual(1, table.collisions)
+        self.assertEqual(1, table.overwrites)
+
+    def test_best_move_is_kept(self) -> None:
+        table = TranspositionTable(64 * 1024)
+        table.store(99, 3, EXACT, 10, 0x0ABC)
+        table.store(99, 4, UPPER_BOUND, 5)
+
+        self.assertEqual(0x0ABC, table.probe(99).move)
+
+    def test_perft_with_table(self) -> None:
+        table = TranspositionTable(1024 * 1024)
+        self.assertEqual(8902, perft_with_table(Board(DEFAULT_BOARD_STATE), 3, table))
+
+        for example in FEN_EXAMPLES[7:9]:
+            board = Board(example["fen"])
+            self.assertEqual(example["nodes"], perft_with_table(board, example["depth"], table))
+            self.assertEqual(perft(board, 2), perft_with_table(board, 2, table))
+
+        hits = table.hits
+        self.assertEqual(8902, perft_with_table(Board(DEFAULT_BOARD_STATE), 3, table))
+        self.assertEqual(hits + 1, table.hits)
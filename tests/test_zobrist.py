@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from chess.engine.board import Board, DEFAULT_BOARD_STATE
+from chess.engine.perft import FEN_EXAMPLES, perft
+from chess.engine.zobrist import compute_hash
+
+
+class TestZobrist(TestCase):
+    def test_incremental_hash_matches_full_hash(self) -> None:
+        for example in FEN_EXAMPLES[:9]:
+            board = Board(example["fen"], debug=True)
+            perft(board, 2)
+            self.assertEqual(compute_hash(board), board.zobrist_key)
+
+    def test_transposition_has_same_key(self) -> None:
+        first = Board(DEFAULT_BOARD_STATE)
+        for uci in ("g1f3", "g8f6", "b1c3", "b8c6"):
+            first.make_move(first.parse_uci(uci))
+
+        second = Board(DEFAULT_BOARD_STATE)
+        for uci in ("b1c3", "b8c6", "g1f3", "g8f6"):
+            second.make_move(second.parse_uci(uci))
+
+        self.assertEqual(first.zobrist_key, second.zobrist_key)
+
+    def test_state_changes_key(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE)
+        key = board.zobrist_key
+
+        self.assertNotEqual(key, Board(DEFAULT_BOARD_STATE.replace(" w ", " b ")).zobrist_key)
+        self.assertNotEqual(key, Board(DEFAULT_BOARD_STATE.replace("KQkq", "KQk")).zobrist_key)
+
+        board.make_move(board.parse_uci("e2e4"))
+        self.assertNotEqual(key, board.zobrist_key)
+        board.unmake_move()
+        self.assertEqual(key, board.zobrist_key)
+
+    def test_debug_detects_desync(self) -> None:
+        board = Board(DEFAULT_BOARD_STATE, debug=True)
+        board.zobrist_key ^= 1
+
+        with self.assertRaises(RuntimeError):
+            board.make_move(board.parse_uci("e2e4"))